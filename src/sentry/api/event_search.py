@@ -1710,6 +1710,28 @@ default_config = SearchConfig(
 )
 
 
+# Longer queries are parsed every time, so that a few of them can't take up an unbounded amount of
+# memory in the cache.
+MAX_CACHED_QUERY_LENGTH = 4096
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_cached_query_tree(query: str) -> Node:
+    return event_search_grammar.parse(query)
+
+
+def _parse_query_tree(query: str) -> Node:
+    """
+    Run the grammar over the query. This is the most expensive part of parsing a query, and the
+    resulting tree only depends on the query string and is never modified by `SearchVisitor`, so
+    trees are shared between calls. Visiting is still done on every call since the resulting
+    tokens depend on the config, the params and the current time (for relative dates).
+    """
+    if len(query) > MAX_CACHED_QUERY_LENGTH:
+        return event_search_grammar.parse(query)
+    return _parse_cached_query_tree(query)
+
+
 @overload
 def parse_search_query(
     query: str,
@@ -1744,7 +1766,7 @@ def parse_search_query(
         config = default_config
 
     try:
-        tree = event_search_grammar.parse(query)
+        tree = _parse_query_tree(query)
     except IncompleteParseError as e:
         idx = e.column()
         prefix = query[max(0, idx - 5) : idx]
@@ -14,6 +14,7 @@ from sentry import audit_log
 from sentry.api.base import audit_logger
 from sentry.deletions.defaults.group import GROUP_CHUNK_SIZE
 from sentry.deletions.tasks.groups import delete_groups_for_project
+from sentry.grouping.ingest.grouphash_cache import invalidate_grouphash_cache
 from sentry.issues.grouptype import GroupCategory
 from sentry.models.group import Group, GroupStatus
 from sentry.models.grouphash import GroupHash
@@ -94,6 +95,7 @@ def delete_group_list(
     # Removing GroupHash rows prevents new events from associating to the groups
     # we just deleted.
     GroupHash.objects.filter(project_id=project.id, group__id__in=group_ids).delete()
+    invalidate_grouphash_cache(project.id)
 
     # We remove `GroupInbox` rows here so that they don't end up influencing queries for
     # `Group` instances that are pending deletion
@@ -13,13 +13,14 @@ from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
 from django.db.models import Min, prefetch_related_objects
 
-from sentry import features, tagstore
+from sentry import features, options, tagstore
 from sentry.api.serializers import Serializer, register, serialize
 from sentry.api.serializers.models.actor import ActorSerializer
 from sentry.api.serializers.models.plugin import is_plugin_deprecated
 from sentry.constants import LOG_LEVELS
 from sentry.integrations.mixins.issues import IssueBasicIntegration
 from sentry.integrations.services.integration import integration_service
+from sentry.issues.group_attrs_cache import cache_group_attrs, get_cached_group_attrs
 from sentry.issues.grouptype import GroupCategory
 from sentry.models.commit import Commit
 from sentry.models.environment import Environment
@@ -57,8 +58,15 @@ from sentry.users.services.user.model import RpcUser
 from sentry.users.services.user.serial import serialize_generic_user
 from sentry.users.services.user.service import user_service
 from sentry.utils.cache import cache
+from sentry.utils.hashlib import hash_values
 from sentry.utils.safe import safe_execute
-from sentry.utils.snuba import aliased_query, raw_query
+from sentry.utils.snuba import (
+    SnubaQueryParams,
+    aliased_query,
+    aliased_query_params,
+    bulk_raw_query,
+    raw_query,
+)
 
 # TODO(jess): remove when snuba is primary backend
 snuba_tsdb = SnubaTSDB(**settings.SENTRY_TSDB_OPTIONS)
@@ -1022,6 +1030,10 @@ class GroupSerializerSnuba(GroupSerializerBase):
                         conditions.append(new_condition)
         self.conditions = conditions
 
+        # Results of the seen stats queries fetched up front by `_prefetch_seen_stats`, keyed by
+        # `_seen_stats_query_key`.
+        self._prefetched_seen_stats: dict[tuple[Any, ...], Mapping[str, Any]] = {}
+
     def _seen_stats_error(
         self, error_issue_list: Sequence[Group], user
     ) -> Mapping[Group, SeenStats]:
@@ -1054,10 +1066,135 @@ class GroupSerializerSnuba(GroupSerializerBase):
             self.environment_ids,
         )
 
+    def _seen_stats_variants(
+        self,
+    ) -> list[tuple[datetime | None, datetime | None, list[Any] | None]]:
+        """
+        The start, end and conditions of every seen stats query run by `_seen_stats_error` and
+        `_seen_stats_generic`, which are prefetched together.
+        """
+        return [(self.start, self.end, self.conditions)]
+
+    def _get_seen_stats(self, item_list: Sequence[Group], user) -> Mapping[Group, SeenStats] | None:
+        if (
+            self._collapse("stats")
+            or not item_list
+            or not options.get("issues.group-serializer.prefetch-seen-stats")
+        ):
+            return super()._get_seen_stats(item_list, user)
+
+        self._prefetched_seen_stats = self._prefetch_seen_stats(item_list)
+        try:
+            return super()._get_seen_stats(item_list, user)
+        finally:
+            self._prefetched_seen_stats = {}
+
+    def _prefetch_seen_stats(
+        self, item_list: Sequence[Group]
+    ) -> dict[tuple[Any, ...], Mapping[str, Any]]:
+        """
+        Runs the seen stats queries of both error and generic issues as a single bulk Snuba
+        request, instead of one request after the other. Rows which are in the group attrs cache
+        aren't queried again.
+        """
+        error_issues = [group for group in item_list if GroupCategory.ERROR == group.issue_category]
+        generic_issues = [
+            group for group in item_list if group.issue_category != GroupCategory.ERROR
+        ]
+
+        queries = {}
+        for dataset, groups in (
+            (Dataset.Events, error_issues),
+            (Dataset.IssuePlatform, generic_issues),
+        ):
+            if not groups:
+                continue
+            for start, end, conditions in self._seen_stats_variants():
+                key = self._seen_stats_query_key(
+                    dataset, groups, start, end, conditions, self.environment_ids
+                )
+                queries[key] = (dataset, groups, start, end, conditions)
+
+        use_cache = options.get("issues.group-attrs-cache.ttl-seconds") > 0
+
+        rows_by_query: dict[tuple[Any, ...], list[Mapping[str, Any]]] = {}
+        pending = []
+        for key, (dataset, groups, start, end, conditions) in queries.items():
+            query_hash = self._seen_stats_cache_hash(
+                dataset, start, end, conditions, self.environment_ids
+            )
+            cached = (
+                get_cached_group_attrs("seen-stats", query_hash, [group.id for group in groups])
+                if use_cache
+                else {}
+            )
+            # Groups without any events in the queried range are cached as an empty row
+            rows_by_query[key] = [row for row in cached.values() if row]
+
+            missing = [group for group in groups if group.id not in cached]
+            if missing:
+                pending.append(
+                    (
+                        key,
+                        query_hash,
+                        missing,
+                        SnubaQueryParams(
+                            **aliased_query_params(
+                                **self._seen_stats_query_kwargs(
+                                    dataset, missing, start, end, conditions, self.environment_ids
+                                )
+                            )
+                        ),
+                    )
+                )
+
+        if pending:
+            results = bulk_raw_query(
+                [params for _, _, _, params in pending],
+                referrer="serializers.GroupSerializerSnuba._prefetch_seen_stats",
+            )
+            for (key, query_hash, missing, _), result in zip(pending, results):
+                rows = {row["group_id"]: row for row in result["data"]}
+                rows_by_query[key].extend(rows.values())
+                if use_cache:
+                    cache_group_attrs(
+                        "seen-stats",
+                        query_hash,
+                        {group.id: rows.get(group.id, {}) for group in missing},
+                    )
+
+        return {key: {"data": rows} for key, rows in rows_by_query.items()}
+
+    @staticmethod
+    def _seen_stats_query_key(
+        dataset, item_list, start, end, conditions, environment_ids
+    ) -> tuple[Any, ...]:
+        return (
+            dataset.value,
+            tuple(item.id for item in item_list),
+            start,
+            end,
+            repr(conditions or []),
+            tuple(environment_ids or ()),
+        )
+
     @staticmethod
-    def _execute_error_seen_stats_query(
-        item_list, start=None, end=None, conditions=None, environment_ids=None
-    ):
+    def _seen_stats_cache_hash(dataset, start, end, conditions, environment_ids) -> str:
+        # Rounded to the minute, since relative time ranges move with every request
+        return hash_values(
+            [
+                dataset.value,
+                start.replace(second=0, microsecond=0).isoformat() if start else "",
+                end.replace(second=0, microsecond=0).isoformat() if end else "",
+                repr(conditions or []),
+                sorted(environment_ids or ()),
+            ]
+        )
+
+    @staticmethod
+    def _seen_stats_query_kwargs(
+        dataset, item_list, start=None, end=None, conditions=None, environment_ids=None
+    ) -> dict[str, Any]:
         project_ids = list({item.project_id for item in item_list})
         group_ids = [item.id for item in item_list]
         aggregations = [
@@ -1071,47 +1208,52 @@ class GroupSerializerSnuba(GroupSerializerBase):
         if environment_ids:
             filters["environment"] = environment_ids
 
-        return aliased_query(
-            dataset=Dataset.Events,
+        if dataset == Dataset.Events:
+            referrer = "serializers.GroupSerializerSnuba._execute_error_seen_stats_query"
+        else:
+            referrer = "serializers.GroupSerializerSnuba._execute_generic_seen_stats_query"
+
+        return dict(
+            dataset=dataset,
             start=start,
             end=end,
             groupby=["group_id"],
             conditions=conditions,
             filter_keys=filters,
             aggregations=aggregations,
-            referrer="serializers.GroupSerializerSnuba._execute_error_seen_stats_query",
+            referrer=referrer,
             tenant_ids=(
                 {"organization_id": item_list[0].project.organization_id} if item_list else None
             ),
         )
 
-    @staticmethod
-    def _execute_generic_seen_stats_query(
-        item_list, start=None, end=None, conditions=None, environment_ids=None
+    def _execute_seen_stats_query(
+        self, dataset, item_list, start=None, end=None, conditions=None, environment_ids=None
     ):
-        project_ids = list({item.project_id for item in item_list})
-        group_ids = [item.id for item in item_list]
-        aggregations = [
-            ["count()", "", "times_seen"],
-            ["min", "timestamp", "first_seen"],
-            ["max", "timestamp", "last_seen"],
-            ["uniq", "tags[sentry:user]", "count"],
-        ]
-        filters = {"project_id": project_ids, "group_id": group_ids}
-        if environment_ids:
-            filters["environment"] = environment_ids
+        prefetched = self._prefetched_seen_stats.get(
+            self._seen_stats_query_key(dataset, item_list, start, end, conditions, environment_ids)
+        )
+        if prefetched is not None:
+            return prefetched
+
         return aliased_query(
-            dataset=Dataset.IssuePlatform,
-            start=start,
-            end=end,
-            groupby=["group_id"],
-            conditions=conditions,
-            filter_keys=filters,
-            aggregations=aggregations,
-            referrer="serializers.GroupSerializerSnuba._execute_generic_seen_stats_query",
-            tenant_ids=(
-                {"organization_id": item_list[0].project.organization_id} if item_list else None
-            ),
+            **self._seen_stats_query_kwargs(
+                dataset, item_list, start, end, conditions, environment_ids
+            )
+        )
+
+    def _execute_error_seen_stats_query(
+        self, item_list, start=None, end=None, conditions=None, environment_ids=None
+    ):
+        return self._execute_seen_stats_query(
+            Dataset.Events, item_list, start, end, conditions, environment_ids
+        )
+
+    def _execute_generic_seen_stats_query(
+        self, item_list, start=None, end=None, conditions=None, environment_ids=None
+    ):
+        return self._execute_seen_stats_query(
+            Dataset.IssuePlatform, item_list, start, end, conditions, environment_ids
         )
 
     @staticmethod
@@ -632,6 +632,19 @@ class StreamGroupSerializerSnuba(GroupSerializerSnuba, GroupStatsMixin):
     ) -> Mapping[Group, SeenStats]:
         return self.__seen_stats_impl(generic_issue_list, self._execute_generic_seen_stats_query)
 
+    def _seen_stats_variants(
+        self,
+    ) -> list[tuple[datetime | None, datetime | None, list[Any] | None]]:
+        # Mirrors the queries run by `__seen_stats_impl`
+        variants: list[tuple[datetime | None, datetime | None, list[Any] | None]] = [
+            (self.start, self.end, None)
+        ]
+        if self.conditions and not self._collapse("filtered"):
+            variants.append((self.start, self.end, self.conditions))
+        if (self.start or self.end) and not self._collapse("lifetime"):
+            variants.append((None, None, None))
+        return variants
+
     def __seen_stats_impl(
         self,
         error_issue_list: Sequence[Group],
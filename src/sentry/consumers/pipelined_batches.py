@@ -0,0 +1,230 @@
+"""
+A strategy for consumers which process batches of messages in parallel, split into groups of
+related messages which have to be processed in order (e.g. all check-ins of a monitor
+environment).
+
+Instead of waiting for every group of a batch to finish before accepting the next batch, groups
+are submitted to a shared executor as soon as the batch arrives. Groups with the same key are
+chained behind each other, so that ordering per key is preserved across batches, while unrelated
+groups of the next batch can start as soon as a worker is free. A single slow group therefore no
+longer stalls the whole partition.
+
+Offsets are only committed once every group of a batch (and of all batches before it) has
+finished, and once the number of in-flight batches or groups reaches its limit, new batches are
+rejected so that the consumer stops fetching until the executor has caught up.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+from collections.abc import Callable, Mapping
+from concurrent.futures import Executor, Future, wait
+from dataclasses import dataclass, field
+from typing import Any, cast
+
+from arroyo.processing.strategies import MessageRejected, ProcessingStrategy
+from arroyo.processing.strategies.batching import ValuesBatch
+from arroyo.types import FilteredPayload, Message, TStrategyPayload
+
+from sentry import options
+from sentry.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PreparedBatch:
+    groups: Mapping[str, Callable[[], None]]
+    """
+    The work for each group of the batch, keyed by the key which needs to be processed in order.
+    """
+
+    on_done: Callable[[], None] | None = None
+    """
+    Called once all groups of the batch (and of every batch before it) have finished, right before
+    its offsets are committed.
+    """
+
+
+@dataclass
+class _PendingBatch:
+    message: Message[ValuesBatch[Any]]
+    prepared: PreparedBatch
+    futures: dict[str, Future[None]]
+    received: float = field(default_factory=time.monotonic)
+
+    def done(self) -> bool:
+        return all(future.done() for future in self.futures.values())
+
+
+def pipelining_enabled(consumer: str) -> bool:
+    return consumer in options.get("consumers.pipelined-batches.enabled")
+
+
+class PipelinedBatchStep(ProcessingStrategy[ValuesBatch[TStrategyPayload] | FilteredPayload]):
+    """
+    Runs the groups of each batch on `executor` and forwards the batch to `next_step` (usually
+    `CommitOffsets`) once all of them have finished. `prepare_batch` runs on the consumer thread
+    and splits the batch into groups.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        executor: Executor,
+        prepare_batch: Callable[[Message[ValuesBatch[TStrategyPayload]]], PreparedBatch],
+        next_step: ProcessingStrategy[None | FilteredPayload],
+        max_pending_batches: int | None = None,
+        max_pending_groups: int | None = None,
+    ) -> None:
+        self.__name = name
+        self.__executor = executor
+        self.__prepare_batch = prepare_batch
+        self.__next_step = next_step
+
+        if max_pending_batches is None:
+            max_pending_batches = options.get("consumers.pipelined-batches.max-pending-batches")
+        if max_pending_groups is None:
+            max_pending_groups = options.get("consumers.pipelined-batches.max-pending-groups")
+        self.__max_pending_batches = max_pending_batches
+        self.__max_pending_groups = max_pending_groups
+
+        self.__batches: deque[_PendingBatch] = deque()
+        # The future of the most recently submitted group of each key. Only accessed from the
+        # consumer thread.
+        self.__tails: dict[str, Future[None]] = {}
+        self.__closed = False
+
+    @property
+    def pending_groups(self) -> int:
+        return sum(
+            not future.done() for batch in self.__batches for future in batch.futures.values()
+        )
+
+    def __run_group(self, future: Future[None], fn: Callable[[], None]) -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            fn()
+        except Exception:
+            # Failing groups don't hold up the partition, the same way as when waiting on the
+            # whole batch.
+            logger.exception("Failed to process group", extra={"consumer": self.__name})
+        future.set_result(None)
+
+    def __schedule(self, future: Future[None], fn: Callable[[], None]) -> None:
+        try:
+            self.__executor.submit(self.__run_group, future, fn)
+        except RuntimeError:
+            # The executor has been shut down, which only happens when the consumer is stopping.
+            if future.set_running_or_notify_cancel():
+                future.set_result(None)
+
+    def __submit_group(self, key: str, fn: Callable[[], None]) -> Future[None]:
+        future: Future[None] = Future()
+        previous = self.__tails.get(key)
+        if previous is None or previous.done():
+            self.__schedule(future, fn)
+        else:
+            # Run right after the previous group of this key instead of blocking a worker waiting
+            # for it. If it has finished in the meantime the callback is called immediately.
+            previous.add_done_callback(lambda _: self.__schedule(future, fn))
+        self.__tails[key] = future
+        return future
+
+    def submit(self, message: Message[ValuesBatch[TStrategyPayload] | FilteredPayload]) -> None:
+        assert not self.__closed
+
+        # Arroyo may call `submit` in a loop without polling in between (e.g. when flushing its
+        # buffers on shutdown), so finished batches have to make room here as well.
+        self.__forward_completed()
+
+        if isinstance(message.payload, FilteredPayload):
+            # Filtered messages still need to be committed in order, so they can only be forwarded
+            # once there's nothing in flight.
+            if self.__batches:
+                raise MessageRejected()
+            self.__next_step.submit(cast(Message[FilteredPayload], message))
+            return
+
+        pending_groups = self.pending_groups
+        if (
+            len(self.__batches) >= self.__max_pending_batches
+            or pending_groups >= self.__max_pending_groups
+        ):
+            metrics.incr("consumers.pipelined_batches.backpressure", tags={"consumer": self.__name})
+            raise MessageRejected()
+
+        batch_message = cast(Message[ValuesBatch[TStrategyPayload]], message)
+        prepared = self.__prepare_batch(batch_message)
+        futures = {key: self.__submit_group(key, fn) for key, fn in prepared.groups.items()}
+        self.__batches.append(_PendingBatch(batch_message, prepared, futures))
+
+        metrics.gauge(
+            "consumers.pipelined_batches.pending_batches",
+            len(self.__batches),
+            tags={"consumer": self.__name},
+        )
+        metrics.gauge(
+            "consumers.pipelined_batches.pending_groups",
+            pending_groups + len(futures),
+            tags={"consumer": self.__name},
+        )
+
+    def __forward_completed(self) -> None:
+        while self.__batches and self.__batches[0].done():
+            batch = self.__batches[0]
+
+            if batch.prepared.on_done is not None:
+                try:
+                    batch.prepared.on_done()
+                except Exception:
+                    logger.exception("Failed to complete batch", extra={"consumer": self.__name})
+
+            self.__next_step.submit(batch.message.replace(None))
+            self.__batches.popleft()
+
+            for key, future in batch.futures.items():
+                if self.__tails.get(key) is future:
+                    del self.__tails[key]
+
+            metrics.timing(
+                "consumers.pipelined_batches.batch_duration",
+                time.monotonic() - batch.received,
+                tags={"consumer": self.__name},
+            )
+
+    def poll(self) -> None:
+        self.__forward_completed()
+        self.__next_step.poll()
+
+    def join(self, timeout: float | None = None) -> None:
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        futures = [future for batch in self.__batches for future in batch.futures.values()]
+        wait(futures, timeout=timeout)
+        self.__forward_completed()
+
+        if self.__batches:
+            logger.warning(
+                "Timed out waiting for pending batches",
+                extra={"consumer": self.__name, "pending_batches": len(self.__batches)},
+            )
+
+        self.__next_step.close()
+        self.__next_step.join(max(deadline - time.monotonic(), 0) if deadline is not None else None)
+
+    def close(self) -> None:
+        self.__closed = True
+
+    def terminate(self) -> None:
+        self.__closed = True
+
+        # Groups which haven't started yet are dropped, their batches will be consumed again.
+        for batch in self.__batches:
+            for future in batch.futures.values():
+                future.cancel()
+
+        self.__next_step.terminate()
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import logging
-from collections.abc import MutableMapping
+from collections.abc import MutableMapping, Sequence
 from typing import Any
 
 from django.utils.functional import cached_property
@@ -122,11 +122,33 @@ class NodeData(MutableMapping[str, Any]):
             currently only {"unprocessed": {...}} is added for reprocessing.
             See documentation of nodestore.
         """
+        subkeys = self._get_subkeys_to_write(subkeys)
+        if subkeys is None:
+            return
+
+        nodestore.backend.set_subkeys(self.id, subkeys)
 
+    @classmethod
+    def save_many(cls, nodes: Sequence[tuple[NodeData, dict[str | None, Any] | None]]) -> None:
+        """
+        Write the data of multiple nodes back to nodestore in one batch.
+
+        :param nodes: Pairs of ``(node_data, subkeys)``, see ``save``.
+        """
+        items = {}
+        for node_data, subkeys in nodes:
+            subkeys = node_data._get_subkeys_to_write(subkeys)
+            if subkeys is not None:
+                items[node_data.id] = subkeys
+
+        if items:
+            nodestore.backend.set_subkeys_multi(items)
+
+    def _get_subkeys_to_write(self, subkeys):
         # We never loaded any data for reading or writing, so there
         # is nothing to save.
         if self._node_data is None:
-            return
+            return None
 
         # We can't put our wrappers into the nodestore, so we need to
         # ensure that the data is converted into a plain old dict
@@ -136,5 +158,4 @@ class NodeData(MutableMapping[str, Any]):
 
         subkeys = subkeys or {}
         subkeys[None] = to_write
-
-        nodestore.backend.set_subkeys(self.id, subkeys)
+        return subkeys
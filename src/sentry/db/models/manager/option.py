@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 from typing import Any
 
 from celery.signals import task_postrun
@@ -21,6 +22,14 @@ class OptionManager(BaseManager[M]):
     def clear_local_cache(self, **kwargs: Any) -> None:
         self._option_cache.clear()
 
+    def populate_local_cache(self, values: Mapping[int, Mapping[str, Any]]) -> None:
+        """
+        Store already loaded option values, keyed by instance id, in the local cache of the current
+        thread so that `get_all_values` doesn't have to look them up one instance at a time.
+        """
+        for instance_id, instance_values in values.items():
+            self._option_cache[self._make_key(instance_id)] = dict(instance_values)
+
     def contribute_to_class(self, model: type[Model], name: str) -> None:
         super().contribute_to_class(model, name)
         task_postrun.connect(self.clear_local_cache)
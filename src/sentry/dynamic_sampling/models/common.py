@@ -1,4 +1,6 @@
+from collections.abc import Sequence
 from dataclasses import dataclass
+from operator import attrgetter
 from typing import Any
 
 import sentry_sdk
@@ -14,11 +16,21 @@ class RebalancedItem:
     new_sample_rate: float = 0.0
 
 
+# The key used to sort classes before rebalancing them.
+rebalancing_sort_key = attrgetter("count", "id")
+
+
 def sum_classes_counts(classes: list[RebalancedItem]) -> float:
+    return sum_counts([elm.count for elm in classes])
+
+
+def sum_counts(counts: Sequence[float]) -> float:
+    # Not using `sum`, which compensates rounding errors of floats and would therefore change the
+    # resulting sample rates.
     ret_val = 0.0
 
-    for elm in classes:
-        ret_val += elm.count
+    for count in counts:
+        ret_val += count
 
     return ret_val
 
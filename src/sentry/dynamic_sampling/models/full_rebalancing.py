@@ -1,7 +1,8 @@
+from collections.abc import Sequence
 from dataclasses import dataclass
 
 from sentry.dynamic_sampling.models.base import Model, ModelInput
-from sentry.dynamic_sampling.models.common import RebalancedItem, sum_classes_counts
+from sentry.dynamic_sampling.models.common import RebalancedItem, sum_counts
 
 
 @dataclass
@@ -36,49 +37,73 @@ class FullRebalancingModel(Model[FullRebalancingInput, tuple[list[RebalancedItem
         minimum_consumption if passed).
         """
         classes = model_input.classes
-        sample_rate = model_input.sample_rate
-        intensity = model_input.intensity
-        min_budget = model_input.min_budget
-
-        total = sum_classes_counts(classes)
-        num_classes = len(classes)
-
-        if min_budget is None:
-            # use exactly what we need (default handling when we resize everything)
-            min_budget = total * sample_rate
-
-        assert total >= min_budget
-        ideal = total * sample_rate / num_classes
-
-        used_budget: float = 0.0
-
-        ret_val = []
-        while classes:
-            element = classes.pop()
-            count = element.count
-            if ideal * num_classes < min_budget:
-                # if we keep to our ideal we will not be able to use the minimum budget (readjust our target)
-                ideal = min_budget / num_classes
-            # see what's the difference from our ideal
-            sampled = count * sample_rate
-            delta = ideal - sampled
-            correction = delta * intensity
-            desired_count = sampled + correction
-
-            if desired_count > count:
-                # we need more than we have, the best we can do is give all, i.e. rate = 1.0
-                new_sample_rate = 1.0
-                used = count
-            else:
-                # we can spend what we want
-                new_sample_rate = desired_count / count
-                used = desired_count
-
-            ret_val.append(
-                RebalancedItem(id=element.id, count=count, new_sample_rate=new_sample_rate)
-            )
-            min_budget -= used
-            used_budget += used
-            num_classes -= 1
-
-        return ret_val, used_budget
+
+        rates, used_budget = rebalance_counts(
+            [element.count for element in classes],
+            model_input.sample_rate,
+            model_input.intensity,
+            model_input.min_budget,
+        )
+
+        # The classes are returned in the order in which they have been processed.
+        return [
+            RebalancedItem(id=element.id, count=element.count, new_sample_rate=rate)
+            for element, rate in zip(reversed(classes), reversed(rates))
+        ], used_budget
+
+
+def rebalance_counts(
+    counts: Sequence[float],
+    sample_rate: float,
+    intensity: float,
+    min_budget: float | None = None,
+) -> tuple[list[float], float]:
+    """
+    Implementation of `FullRebalancingModel` which operates on the counts alone, so that large
+    numbers of classes can be rebalanced without going through `RebalancedItem` objects.
+
+    The counts are processed from the last to the first (i.e. in ascending order when sorted the
+    same way as the classes), each class can only use the budget which is left over by the classes
+    processed before it.
+
+    :return: The new sample rate of each count (in the same order) and the amount of items used.
+    """
+    total = sum_counts(counts)
+    num_classes = len(counts)
+
+    if min_budget is None:
+        # use exactly what we need (default handling when we resize everything)
+        min_budget = total * sample_rate
+
+    assert total >= min_budget
+    ideal = total * sample_rate / num_classes
+
+    used_budget: float = 0.0
+
+    rates: list[float] = []
+    for count in reversed(counts):
+        if ideal * num_classes < min_budget:
+            # if we keep to our ideal we will not be able to use the minimum budget (readjust our
+            # target)
+            ideal = min_budget / num_classes
+        # see what's the difference from our ideal
+        sampled = count * sample_rate
+        delta = ideal - sampled
+        correction = delta * intensity
+        desired_count = sampled + correction
+
+        if desired_count > count:
+            # we need more than we have, the best we can do is give all, i.e. rate = 1.0
+            rates.append(1.0)
+            used = count
+        else:
+            # we can spend what we want
+            rates.append(desired_count / count)
+            used = desired_count
+
+        min_budget -= used
+        used_budget += used
+        num_classes -= 1
+
+    rates.reverse()
+    return rates, used_budget
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 
 from sentry.dynamic_sampling.models.base import Model, ModelInput
-from sentry.dynamic_sampling.models.common import RebalancedItem
+from sentry.dynamic_sampling.models.common import RebalancedItem, rebalancing_sort_key
 from sentry.dynamic_sampling.models.full_rebalancing import (
     FullRebalancingInput,
     FullRebalancingModel,
@@ -28,7 +28,7 @@ class ProjectsRebalancingModel(Model[ProjectsRebalancingInput, list[RebalancedIt
         if len(classes) == 1:
             classes[0].new_sample_rate = sample_rate
 
-        sorted_classes = sorted(classes, key=lambda x: (x.count, x.id), reverse=True)
+        sorted_classes = sorted(classes, key=rebalancing_sort_key, reverse=True)
 
         full_rebalancing = FullRebalancingModel()
         result, _ = full_rebalancing.run(
@@ -1,7 +1,11 @@
 from dataclasses import dataclass
 
 from sentry.dynamic_sampling.models.base import Model, ModelInput
-from sentry.dynamic_sampling.models.common import RebalancedItem, sum_classes_counts
+from sentry.dynamic_sampling.models.common import (
+    RebalancedItem,
+    rebalancing_sort_key,
+    sum_classes_counts,
+)
 from sentry.dynamic_sampling.models.full_rebalancing import (
     FullRebalancingInput,
     FullRebalancingModel,
@@ -49,7 +53,7 @@ class TransactionsRebalancingModel(
         total = model_input.total
         intensity = model_input.intensity
 
-        classes = sorted(classes, key=lambda x: (x.count, x.id), reverse=True)
+        classes = sorted(classes, key=rebalancing_sort_key, reverse=True)
 
         # total count for the explicitly specified classes
         total_explicit = sum_classes_counts(classes)
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+from collections import deque
 from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import TypedDict
+from typing import Any, TypedDict
 
 import sentry_sdk
 from snuba_sdk import (
@@ -114,29 +116,41 @@ def boost_low_volume_transactions() -> None:
     else:
         granularity = Granularity(3600)
 
-    orgs_iterator = GetActiveOrgs(max_projects=MAX_PROJECTS_PER_QUERY, granularity=granularity)
-    for orgs in orgs_iterator:
-        # get the low and high transactions
-        totals_it = FetchProjectTransactionTotals(orgs)
-        small_transactions_it = FetchProjectTransactionVolumes(
-            orgs,
-            large_transactions=False,
-            max_transactions=num_small_trans,
-        )
-        big_transactions_it = FetchProjectTransactionVolumes(
-            orgs,
-            large_transactions=True,
-            max_transactions=num_big_trans,
-        )
+    # The next page of each of the three queries is fetched in the background while the current
+    # pages are merged and dispatched.
+    executor = None
+    if options.get("dynamic-sampling.boost_low_volume_transactions.prefetch-pages"):
+        executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix=__name__)
 
-        for project_transactions in transactions_zip(
-            totals_it, big_transactions_it, small_transactions_it
-        ):
-            boost_low_volume_transactions_of_project.apply_async(
-                kwargs={"project_transactions": project_transactions},
-                headers={"sentry-propagate-traces": False},
+    try:
+        orgs_iterator = GetActiveOrgs(max_projects=MAX_PROJECTS_PER_QUERY, granularity=granularity)
+        for orgs in orgs_iterator:
+            # get the low and high transactions
+            totals_it = FetchProjectTransactionTotals(orgs, executor=executor)
+            small_transactions_it = FetchProjectTransactionVolumes(
+                orgs,
+                large_transactions=False,
+                max_transactions=num_small_trans,
+                executor=executor,
+            )
+            big_transactions_it = FetchProjectTransactionVolumes(
+                orgs,
+                large_transactions=True,
+                max_transactions=num_big_trans,
+                executor=executor,
             )
 
+            for project_transactions in transactions_zip(
+                totals_it, big_transactions_it, small_transactions_it
+            ):
+                boost_low_volume_transactions_of_project.apply_async(
+                    kwargs={"project_transactions": project_transactions},
+                    headers={"sentry-propagate-traces": False},
+                )
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
 
 @instrumented_task(
     name="sentry.dynamic_sampling.boost_low_volume_transactions_of_project",
@@ -259,13 +273,56 @@ def is_project_identity_before(left: ProjectIdentity, right: ProjectIdentity) ->
     )
 
 
+class PagedQuery:
+    """
+    Returns the pages of a query paginated with `CHUNK_SIZE`, where `fetch_page` is called with
+    the offset of the page and returns up to `CHUNK_SIZE + 1` rows.
+
+    If an executor is passed, the next page is requested in the background as soon as a page is
+    returned, so that it is (mostly) available by the time the caller is done with the current one.
+    At most one page is fetched ahead.
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[[int], list[dict[str, Any]]],
+        executor: Executor | None = None,
+    ):
+        self.fetch_page = fetch_page
+        self.executor = executor
+        self.offset = 0
+        self.has_more_results = True
+        self._next_page: Future[list[dict[str, Any]]] | None = None
+
+    def next_page(self) -> list[dict[str, Any]]:
+        if not self.has_more_results:
+            return []
+
+        if self._next_page is not None:
+            data = self._next_page.result()
+            self._next_page = None
+        else:
+            data = self.fetch_page(self.offset)
+
+        count = len(data)
+        self.has_more_results = count > CHUNK_SIZE
+        self.offset += CHUNK_SIZE
+
+        if self.has_more_results:
+            data = data[:-1]
+            if self.executor is not None:
+                self._next_page = self.executor.submit(self.fetch_page, self.offset)
+
+        return data
+
+
 class FetchProjectTransactionTotals:
     """
     Fetches the total number of transactions and the number of distinct transaction types for each
     project in the given organizations
     """
 
-    def __init__(self, orgs: Sequence[int]):
+    def __init__(self, orgs: Sequence[int], executor: Executor | None = None):
         transaction_string_id = indexer.resolve_shared_org("transaction")
         self.transaction_tag = f"tags_raw[{transaction_string_id}]"
         self.metric_id = indexer.resolve_shared_org(
@@ -273,82 +330,74 @@ class FetchProjectTransactionTotals:
         )
 
         self.org_ids = list(orgs)
-        self.offset = 0
-        self.has_more_results = True
-        self.cache: list[dict[str, int | float]] = []
+        self.pages = PagedQuery(self._fetch_page, executor)
+        self.cache: deque[dict[str, int | float]] = deque()
         self.last_org_id: int | None = None
 
     def __iter__(self) -> FetchProjectTransactionTotals:
         return self
 
     def __next__(self) -> ProjectTransactionsTotals:
-        if not self._cache_empty():
-            return self._get_from_cache()
+        if self._cache_empty():
+            self.cache.extend(self.pages.next_page())
 
+        return self._get_from_cache()
+
+    def _fetch_page(self, offset: int) -> list[dict[str, Any]]:
         if options.get("dynamic-sampling.query-granularity-60s.fetch-transaction-totals", None):
             granularity = Granularity(60)
         else:
             granularity = Granularity(3600)
 
-        if self.has_more_results:
-            query = (
-                Query(
-                    match=Entity(EntityKey.GenericOrgMetricsCounters.value),
-                    select=[
-                        Function("sum", [Column("value")], "num_transactions"),
-                        Function("uniq", [Column(self.transaction_tag)], "num_classes"),
-                        Column("org_id"),
-                        Column("project_id"),
-                    ],
-                    groupby=[
-                        Column("org_id"),
-                        Column("project_id"),
-                    ],
-                    where=[
-                        Condition(
-                            Column("timestamp"),
-                            Op.GTE,
-                            datetime.utcnow() - BOOST_LOW_VOLUME_TRANSACTIONS_QUERY_INTERVAL,
-                        ),
-                        Condition(Column("timestamp"), Op.LT, datetime.utcnow()),
-                        Condition(Column("metric_id"), Op.EQ, self.metric_id),
-                        Condition(Column("org_id"), Op.IN, self.org_ids),
-                    ],
-                    granularity=granularity,
-                    orderby=[
-                        OrderBy(Column("org_id"), Direction.ASC),
-                        OrderBy(Column("project_id"), Direction.ASC),
-                    ],
-                )
-                .set_limit(CHUNK_SIZE + 1)
-                .set_offset(self.offset)
-            )
-            request = Request(
-                dataset=Dataset.PerformanceMetrics.value,
-                app_id="dynamic_sampling",
-                query=query,
-                tenant_ids={"use_case_id": UseCaseID.TRANSACTIONS.value, "cross_org_query": 1},
+        query = (
+            Query(
+                match=Entity(EntityKey.GenericOrgMetricsCounters.value),
+                select=[
+                    Function("sum", [Column("value")], "num_transactions"),
+                    Function("uniq", [Column(self.transaction_tag)], "num_classes"),
+                    Column("org_id"),
+                    Column("project_id"),
+                ],
+                groupby=[
+                    Column("org_id"),
+                    Column("project_id"),
+                ],
+                where=[
+                    Condition(
+                        Column("timestamp"),
+                        Op.GTE,
+                        datetime.utcnow() - BOOST_LOW_VOLUME_TRANSACTIONS_QUERY_INTERVAL,
+                    ),
+                    Condition(Column("timestamp"), Op.LT, datetime.utcnow()),
+                    Condition(Column("metric_id"), Op.EQ, self.metric_id),
+                    Condition(Column("org_id"), Op.IN, self.org_ids),
+                ],
+                granularity=granularity,
+                orderby=[
+                    OrderBy(Column("org_id"), Direction.ASC),
+                    OrderBy(Column("project_id"), Direction.ASC),
+                ],
             )
-            data = raw_snql_query(
-                request,
-                referrer=Referrer.DYNAMIC_SAMPLING_COUNTERS_FETCH_PROJECTS_WITH_TRANSACTION_TOTALS.value,
-            )["data"]
-            count = len(data)
-            self.has_more_results = count > CHUNK_SIZE
-            self.offset += CHUNK_SIZE
-
-            if self.has_more_results:
-                data = data[:-1]
-            self.cache.extend(data)
-
-        return self._get_from_cache()
+            .set_limit(CHUNK_SIZE + 1)
+            .set_offset(offset)
+        )
+        request = Request(
+            dataset=Dataset.PerformanceMetrics.value,
+            app_id="dynamic_sampling",
+            query=query,
+            tenant_ids={"use_case_id": UseCaseID.TRANSACTIONS.value, "cross_org_query": 1},
+        )
+        return raw_snql_query(
+            request,
+            referrer=Referrer.DYNAMIC_SAMPLING_COUNTERS_FETCH_PROJECTS_WITH_TRANSACTION_TOTALS.value,
+        )["data"]
 
     def _get_from_cache(self) -> ProjectTransactionsTotals:
 
         if self._cache_empty():
             raise StopIteration()
 
-        row = self.cache.pop(0)
+        row = self.cache.popleft()
         proj_id = int(row["project_id"])
         org_id = int(row["org_id"])
         num_transactions = row["num_transactions"]
@@ -385,18 +434,18 @@ class FetchProjectTransactionVolumes:
         orgs: list[int],
         large_transactions: bool,
         max_transactions: int,
+        executor: Executor | None = None,
     ):
         self.large_transactions = large_transactions
         self.max_transactions = max_transactions
         self.org_ids = orgs
-        self.offset = 0
+        self.pages = PagedQuery(self._fetch_page, executor)
         transaction_string_id = indexer.resolve_shared_org("transaction")
         self.transaction_tag = f"tags_raw[{transaction_string_id}]"
         self.metric_id = indexer.resolve_shared_org(
             str(TransactionMRI.COUNT_PER_ROOT_PROJECT.value)
         )
-        self.has_more_results = True
-        self.cache: list[ProjectTransactions] = []
+        self.cache: deque[ProjectTransactions] = deque()
 
         if self.large_transactions:
             self.transaction_ordering = Direction.DESC
@@ -411,85 +460,85 @@ class FetchProjectTransactionVolumes:
             # the user is not interested in transactions of this type, return nothing.
             raise StopIteration()
 
-        if not self._cache_empty():
-            # data in cache no need to go to the db
-            return self._get_from_cache()
+        # The transactions of the last project in the cache may continue on the next page, so it
+        # is only returned once the next page has been added to it.
+        while len(self.cache) <= 1 and self.pages.has_more_results:
+            self._add_results_to_cache(self.pages.next_page())
 
+        # return from cache if empty stops iteration
+        return self._get_from_cache()
+
+    def _fetch_page(self, offset: int) -> list[dict[str, Any]]:
         if options.get("dynamic-sampling.query-granularity-60s.fetch-transaction-totals", None):
             granularity = Granularity(60)
         else:
             granularity = Granularity(3600)
 
-        if self.has_more_results:
-            # still data in the db, load cache
-            query = (
-                Query(
-                    match=Entity(EntityKey.GenericOrgMetricsCounters.value),
-                    select=[
-                        Function("sum", [Column("value")], "num_transactions"),
-                        Column("org_id"),
-                        Column("project_id"),
-                        AliasedExpression(Column(self.transaction_tag), "transaction_name"),
-                    ],
-                    groupby=[
-                        Column("org_id"),
-                        Column("project_id"),
-                        AliasedExpression(Column(self.transaction_tag), "transaction_name"),
-                    ],
-                    where=[
-                        Condition(
-                            Column("timestamp"),
-                            Op.GTE,
-                            datetime.utcnow() - BOOST_LOW_VOLUME_TRANSACTIONS_QUERY_INTERVAL,
-                        ),
-                        Condition(Column("timestamp"), Op.LT, datetime.utcnow()),
-                        Condition(Column("metric_id"), Op.EQ, self.metric_id),
-                        Condition(Column("org_id"), Op.IN, self.org_ids),
-                    ],
-                    granularity=granularity,
-                    orderby=[
-                        OrderBy(Column("org_id"), Direction.ASC),
-                        OrderBy(Column("project_id"), Direction.ASC),
-                        OrderBy(Column("num_transactions"), self.transaction_ordering),
-                    ],
-                )
-                .set_limitby(
-                    LimitBy(
-                        columns=[Column("org_id"), Column("project_id")],
-                        count=self.max_transactions,
-                    )
-                )
-                .set_limit(CHUNK_SIZE + 1)
-                .set_offset(self.offset)
+        query = (
+            Query(
+                match=Entity(EntityKey.GenericOrgMetricsCounters.value),
+                select=[
+                    Function("sum", [Column("value")], "num_transactions"),
+                    Column("org_id"),
+                    Column("project_id"),
+                    AliasedExpression(Column(self.transaction_tag), "transaction_name"),
+                ],
+                groupby=[
+                    Column("org_id"),
+                    Column("project_id"),
+                    AliasedExpression(Column(self.transaction_tag), "transaction_name"),
+                ],
+                where=[
+                    Condition(
+                        Column("timestamp"),
+                        Op.GTE,
+                        datetime.utcnow() - BOOST_LOW_VOLUME_TRANSACTIONS_QUERY_INTERVAL,
+                    ),
+                    Condition(Column("timestamp"), Op.LT, datetime.utcnow()),
+                    Condition(Column("metric_id"), Op.EQ, self.metric_id),
+                    Condition(Column("org_id"), Op.IN, self.org_ids),
+                ],
+                granularity=granularity,
+                orderby=[
+                    OrderBy(Column("org_id"), Direction.ASC),
+                    OrderBy(Column("project_id"), Direction.ASC),
+                    OrderBy(Column("num_transactions"), self.transaction_ordering),
+                ],
             )
-            request = Request(
-                dataset=Dataset.PerformanceMetrics.value,
-                app_id="dynamic_sampling",
-                query=query,
-                tenant_ids={"use_case_id": UseCaseID.TRANSACTIONS.value, "cross_org_query": 1},
+            .set_limitby(
+                LimitBy(
+                    columns=[Column("org_id"), Column("project_id")],
+                    count=self.max_transactions,
+                )
             )
-            data = raw_snql_query(
-                request,
-                referrer=Referrer.DYNAMIC_SAMPLING_COUNTERS_FETCH_PROJECTS_WITH_COUNT_PER_TRANSACTION.value,
-            )["data"]
-
-            count = len(data)
-            self.has_more_results = count > CHUNK_SIZE
-            self.offset += CHUNK_SIZE
-
-            if self.has_more_results:
-                data = data[:-1]
-
-            self._add_results_to_cache(data)
-
-        # return from cache if empty stops iteration
-        return self._get_from_cache()
+            .set_limit(CHUNK_SIZE + 1)
+            .set_offset(offset)
+        )
+        request = Request(
+            dataset=Dataset.PerformanceMetrics.value,
+            app_id="dynamic_sampling",
+            query=query,
+            tenant_ids={"use_case_id": UseCaseID.TRANSACTIONS.value, "cross_org_query": 1},
+        )
+        return raw_snql_query(
+            request,
+            referrer=Referrer.DYNAMIC_SAMPLING_COUNTERS_FETCH_PROJECTS_WITH_COUNT_PER_TRANSACTION.value,
+        )["data"]
 
-    def _add_results_to_cache(self, data: list[dict[str, int | float | str]]) -> None:
+    def _add_results_to_cache(self, data: list[dict[str, Any]]) -> None:
         transaction_counts: list[tuple[str, float]] = []
         current_org_id: int | None = None
         current_proj_id: int | None = None
 
+        if self.cache:
+            # continue with the last project of the previous page, which is extended in place
+            # in case its transactions continue on this page
+            last = self.cache[-1]
+            transaction_counts = last["transaction_counts"]
+            current_org_id = last["org_id"]
+            current_proj_id = last["project_id"]
+            self.cache.pop()
+
         for row in data:
             proj_id = int(row["project_id"])
             org_id = int(row["org_id"])
@@ -538,7 +587,7 @@ class FetchProjectTransactionVolumes:
         if self._cache_empty():
             raise StopIteration()
 
-        return self.cache.pop(0)
+        return self.cache.popleft()
 
 
 def merge_transactions(
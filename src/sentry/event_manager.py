@@ -3,6 +3,7 @@ from __future__ import annotations
 import ipaddress
 import logging
 import uuid
+from collections import defaultdict
 from collections.abc import Callable, Mapping, MutableMapping, Sequence
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
@@ -43,6 +44,7 @@ from sentry.constants import (
     InsightModules,
 )
 from sentry.culprit import generate_culprit
+from sentry.db.models import NodeData
 from sentry.dynamic_sampling import record_latest_release
 from sentry.eventstream.base import GroupState
 from sentry.eventtypes import EventType
@@ -122,7 +124,7 @@ from sentry.signals import (
     issue_unresolved,
 )
 from sentry.tasks.process_buffer import buffer_incr
-from sentry.tsdb.base import TSDBModel
+from sentry.tsdb.base import IncrMultiOptions, TSDBModel
 from sentry.types.activity import ActivityType
 from sentry.types.group import GroupSubStatus, PriorityLevel
 from sentry.usage_accountant import record
@@ -513,107 +515,224 @@ class EventManager:
         cache_key: str | None = None,
         has_attachments: bool = False,
     ) -> Event:
-        jobs = [job]
+        job["metric_tags"] = metric_tags
+        job["cache_key"] = cache_key
+        job["has_attachments"] = has_attachments
 
-        is_reprocessed = is_reprocessed_event(job["data"])
+        save_error_events_many([job], projects, raw=raw, raise_on_discard=True)
 
-        _get_or_create_release_many(jobs, projects)
-        _get_event_user_many(jobs, projects)
+        self._data = job["event"].data.data
 
-        job["project_key"] = None
-        if job["key_id"] is not None:
-            try:
-                job["project_key"] = ProjectKey.objects.get_from_cache(id=job["key_id"])
-            except ProjectKey.DoesNotExist:
-                pass
+        return job["event"]
+
+    @staticmethod
+    @sentry_sdk.tracing.trace
+    def save_many(
+        managers: Sequence[EventManager],
+        project_id: int,
+        raw: bool = False,
+        assume_normalized: bool = False,
+        start_time: float | None = None,
+    ) -> list[Event]:
+        """
+        Save a batch of error events belonging to the same project.
+
+        This is the multi-event counterpart of `save` for error events: release,
+        environment and project key lookups are shared across the batch, and the
+        TSDB, nodestore and eventstream writes are issued for all events at once.
+
+        Unlike `save`, events whose hash has been discarded are dropped from the
+        batch instead of raising `HashDiscarded`, so that a single tombstoned
+        event does not fail the others. Only the events which were assigned to a
+        group and persisted are returned.
+        """
+        if not managers:
+            return []
+
+        for manager in managers:
+            if not manager._normalized:
+                if not assume_normalized:
+                    manager.normalize(project_id=project_id)
+                manager._normalized = True
+
+            if manager._data.get("type") in ("transaction", "generic"):
+                raise ValueError("EventManager.save_many only supports error events")
+
+        project = Project.objects.get_from_cache(id=project_id)
+        project.set_cached_field_value(
+            "organization", Organization.objects.get_from_cache(id=project.organization_id)
+        )
+
+        projects = {project.id: project}
+
+        jobs: list[Job] = [
+            {
+                "data": manager._data,
+                "project_id": project.id,
+                "raw": raw,
+                "start_time": start_time,
+            }
+            for manager in managers
+        ]
+
+        _pull_out_data(jobs, projects)
+
+        _set_project_platform_if_needed(project, jobs[0]["event"])
+
+        with metrics.timer(
+            "event_manager.save_error_events_many",
+            tags={"platform": jobs[0]["event"].platform or "unknown"},
+        ):
+            saved_jobs = save_error_events_many(jobs, projects, raw=raw)
+
+        for manager, job in zip(managers, jobs):
+            manager._data = job["event"].data.data
+
+        metrics.distribution("event_manager.save_error_events_many.batch_size", len(jobs))
+
+        return [job["event"] for job in saved_jobs]
+
+
+@sentry_sdk.tracing.trace
+def save_error_events_many(
+    jobs: Sequence[Job],
+    projects: ProjectsMapping,
+    raw: bool = False,
+    raise_on_discard: bool = False,
+) -> list[Job]:
+    """
+    Group and persist a batch of error event jobs which have already been through
+    `_pull_out_data`.
+
+    Grouping runs event by event, but every other step operates on the whole
+    batch so that database lookups, redis round trips and kafka produces can be
+    shared between events. Jobs may carry `cache_key`, `has_attachments` and
+    `metric_tags` keys; sensible defaults are used when they are missing.
+
+    Returns the jobs which were assigned to a group. Jobs whose hash was
+    discarded are dropped, unless `raise_on_discard` is set, in which case the
+    `HashDiscarded` exception is re-raised.
+    """
+    for job in jobs:
+        project = job["event"].project
+        if "in_grouping_transition" not in job:
+            job["in_grouping_transition"] = is_in_transition(project)
+        if "metric_tags" not in job:
+            job["metric_tags"] = {
+                "platform": job["event"].platform or "unknown",
+                "sdk": normalized_sdk_tag_from_event(job["event"].data),
+                "in_transition": job["in_grouping_transition"],
+                "split_enhancements": get_enhancements_version(project) == 3,
+            }
+        job["is_reprocessed"] = is_reprocessed_event(job["data"])
 
-        _derive_plugin_tags_many(jobs, projects)
-        _derive_interface_tags_many(jobs)
-        _derive_client_error_sampling_rate(jobs, projects)
+    _get_or_create_release_many(jobs, projects)
+    _get_event_user_many(jobs, projects)
+    _get_project_keys_many(jobs)
+    _derive_plugin_tags_many(jobs, projects)
+    _derive_interface_tags_many(jobs)
+    _derive_client_error_sampling_rate(jobs, projects)
 
+    grouped_jobs = []
+    for job in jobs:
         # Load attachments first, but persist them at the very last after
         # posting to eventstream to make sure all counters and eventstream are
         # incremented for sure. Also wait for grouping to remove attachments
         # based on the group counter.
-        if has_attachments:
-            attachments = get_attachments(cache_key, job)
+        if job.get("has_attachments"):
+            attachments = get_attachments(job.get("cache_key"), job)
         else:
             attachments = []
 
+        project = job["event"].project
         try:
-            group_info = assign_event_to_group(event=job["event"], job=job, metric_tags=metric_tags)
-
+            group_info = assign_event_to_group(
+                event=job["event"], job=job, metric_tags=job["metric_tags"]
+            )
         except HashDiscarded as e:
             if features.has("organizations:grouptombstones-hit-counter", project.organization):
                 increment_group_tombstone_hit_counter(
                     getattr(e, "tombstone_id", None), job["event"]
                 )
             discard_event(job, attachments)
-            raise
+            if raise_on_discard:
+                raise
+            continue
 
         if not group_info:
-            return job["event"]
+            continue
 
         # store a reference to the group id to guarantee validation of isolation
         # XXX(markus): No clue what this does
         job["event"].data.bind_ref(job["event"])
 
-        _get_or_create_environment_many(jobs, projects)
-        _get_or_create_group_environment_many(jobs)
-        _get_or_create_release_associated_models(jobs, projects)
-        _increment_release_associated_counts_many(jobs, projects)
-        _get_or_create_group_release_many(jobs)
-        _tsdb_record_all_metrics(jobs)
+        job["attachments"] = attachments
+        grouped_jobs.append(job)
+
+    if not grouped_jobs:
+        return grouped_jobs
 
-        if attachments:
-            attachments = filter_attachments_for_group(attachments, job)
+    _get_or_create_environment_many(grouped_jobs, projects)
+    _get_or_create_group_environment_many(grouped_jobs)
+    _get_or_create_release_associated_models(grouped_jobs, projects)
+    _increment_release_associated_counts_many(grouped_jobs, projects)
+    _get_or_create_group_release_many(grouped_jobs)
+    _tsdb_record_all_metrics(grouped_jobs)
 
-        # XXX: DO NOT MUTATE THE EVENT PAYLOAD AFTER THIS POINT
-        _materialize_event_metrics(jobs)
+    for job in grouped_jobs:
+        if job["attachments"]:
+            job["attachments"] = filter_attachments_for_group(job["attachments"], job)
 
-        for attachment in attachments:
+    # XXX: DO NOT MUTATE THE EVENT PAYLOAD AFTER THIS POINT
+    _materialize_event_metrics(grouped_jobs)
+
+    for job in grouped_jobs:
+        for attachment in job["attachments"]:
             key = f"bytes.stored.{attachment.type}"
             old_bytes = job["event_metrics"].get(key) or 0
             job["event_metrics"][key] = old_bytes + attachment.size
 
-        _nodestore_save_many(jobs=jobs, app_feature="errors")
+    _nodestore_save_many(jobs=grouped_jobs, app_feature="errors")
+
+    for job in grouped_jobs:
+        event = job["event"]
+        project = event.project
 
         if not raw:
             if not project.first_event:
-                project.update(first_event=job["event"].datetime)
-                first_event_received.send_robust(
-                    project=project, event=job["event"], sender=Project
-                )
+                project.update(first_event=event.datetime)
+                first_event_received.send_robust(project=project, event=event, sender=Project)
 
-            if has_event_minified_stack_trace(job["event"]):
+            if has_event_minified_stack_trace(event):
                 set_project_flag_and_signal(
                     project,
                     "has_minified_stack_trace",
                     first_event_with_minified_stack_trace_received,
-                    event=job["event"],
+                    event=event,
                 )
 
-        if is_reprocessed:
+        if job["is_reprocessed"]:
             safe_execute(
                 reprocessing2.buffered_delete_old_primary_hash,
-                project_id=job["event"].project_id,
-                group_id=reprocessing2.get_original_group_id(job["event"]),
-                event_id=job["event"].event_id,
-                datetime=job["event"].datetime,
-                old_primary_hash=reprocessing2.get_original_primary_hash(job["event"]),
-                current_primary_hash=job["event"].get_primary_hash(),
+                project_id=event.project_id,
+                group_id=reprocessing2.get_original_group_id(event),
+                event_id=event.event_id,
+                datetime=event.datetime,
+                old_primary_hash=reprocessing2.get_original_primary_hash(event),
+                current_primary_hash=event.get_primary_hash(),
             )
 
-        _eventstream_insert_many(jobs)
+    _eventstream_insert_many(grouped_jobs)
 
+    for job in grouped_jobs:
         # Do this last to ensure signals get emitted even if connection to the
         # file store breaks temporarily.
         #
         # We do not need this for reprocessed events as for those we update the
         # group_id on existing models in post_process_group, which already does
         # this because of indiv. attachments.
-        if not is_reprocessed and attachments:
-            save_attachments(cache_key, attachments, job)
+        if not job["is_reprocessed"] and job["attachments"]:
+            save_attachments(job.get("cache_key"), job["attachments"], job)
 
         metric_tags = {"from_relay": str("_relay_processed" in job["data"])}
 
@@ -631,11 +750,9 @@ class EventManager:
             tags=metric_tags,
         )
 
-        _track_outcome_accepted_many(jobs)
-
-        self._data = job["event"].data.data
+    _track_outcome_accepted_many(grouped_jobs)
 
-        return job["event"]
+    return grouped_jobs
 
 
 @sentry_sdk.tracing.trace
@@ -731,30 +848,38 @@ def _set_project_platform_if_needed(project: Project, event: Event) -> None:
 
 @sentry_sdk.tracing.trace
 def _get_or_create_release_many(jobs: Sequence[Job], projects: ProjectsMapping) -> None:
+    # Batches usually carry the same handful of releases, only resolve each one once
+    releases: dict[tuple[int, str], Release | None] = {}
+
     for job in jobs:
         data = job["data"]
         if not data.get("release"):
-            return
+            continue
 
         project = projects[job["project_id"]]
         date = job["event"].datetime
 
-        try:
-            release = Release.get_or_create(
-                project=project,
-                version=data["release"],
-                date_added=date,
-            )
-        except ValidationError:
-            logger.exception(
-                "Failed creating Release due to ValidationError",
-                extra={"project": project, "version": data["release"]},
-            )
-            release = None
+        release_key = (project.id, data["release"])
+        if release_key in releases:
+            release = releases[release_key]
+        else:
+            try:
+                release = Release.get_or_create(
+                    project=project,
+                    version=data["release"],
+                    date_added=date,
+                )
+            except ValidationError:
+                logger.exception(
+                    "Failed creating Release due to ValidationError",
+                    extra={"project": project, "version": data["release"]},
+                )
+                release = None
+            releases[release_key] = release
 
         job["release"] = release
         if not release:
-            return
+            continue
 
         # Don't allow a conflicting 'release' tag
         pop_tag(data, "release")
@@ -781,6 +906,16 @@ def _get_event_user_many(jobs: Sequence[Job], projects: ProjectsMapping) -> None
         job["user"] = user
 
 
+def _get_project_keys_many(jobs: Sequence[Job]) -> None:
+    key_ids = {job["key_id"] for job in jobs if job["key_id"] is not None}
+    project_keys = {}
+    if key_ids:
+        project_keys = {pk.id: pk for pk in ProjectKey.objects.get_many_from_cache(key_ids)}
+
+    for job in jobs:
+        job["project_key"] = project_keys.get(job["key_id"])
+
+
 @sentry_sdk.tracing.trace
 def _derive_plugin_tags_many(jobs: Sequence[Job], projects: ProjectsMapping) -> None:
     # XXX: We ought to inline or remove this one for sure
@@ -901,10 +1036,14 @@ def _get_group_processing_kwargs(job: Job) -> dict[str, Any]:
 
 @sentry_sdk.tracing.trace
 def _get_or_create_environment_many(jobs: Sequence[Job], projects: ProjectsMapping) -> None:
+    environments: dict[tuple[int, str | None], Environment] = {}
     for job in jobs:
-        job["environment"] = Environment.get_or_create(
-            project=projects[job["project_id"]], name=job["environment"]
-        )
+        environment_key = (job["project_id"], job["environment"])
+        if environment_key not in environments:
+            environments[environment_key] = Environment.get_or_create(
+                project=projects[job["project_id"]], name=job["environment"]
+            )
+        job["environment"] = environments[environment_key]
 
 
 @sentry_sdk.tracing.trace
@@ -1022,6 +1161,12 @@ def _tsdb_record_all_metrics(jobs: Sequence[Job]) -> None:
 
     # XXX: validate whether anybody actually uses those metrics
 
+    # Counters are written with one `incr_multi` call per environment for the whole batch of jobs,
+    # which merges increments of the same counter and pipelines the rest per host.
+    incrs_by_environment: dict[int, list[tuple[TSDBModel, int, IncrMultiOptions]]] = defaultdict(
+        list
+    )
+
     for job in jobs:
         incrs = []
         frequencies = []
@@ -1060,8 +1205,9 @@ def _tsdb_record_all_metrics(jobs: Sequence[Job]) -> None:
             project_id = job["project_id"]
             records.append((TSDBModel.users_affected_by_project, project_id, (user.tag_value,)))
 
-        if incrs:
-            tsdb.backend.incr_multi(incrs, timestamp=event.datetime, environment_id=environment.id)
+        incrs_by_environment[environment.id].extend(
+            (model, key, {"timestamp": event.datetime, "count": 1}) for model, key in incrs
+        )
 
         if records:
             tsdb.backend.record_multi(
@@ -1071,12 +1217,17 @@ def _tsdb_record_all_metrics(jobs: Sequence[Job]) -> None:
         if frequencies:
             tsdb.backend.record_frequency_multi(frequencies, timestamp=event.datetime)
 
+    for environment_id, environment_incrs in incrs_by_environment.items():
+        tsdb.backend.incr_multi(environment_incrs, environment_id=environment_id)
+
 
 def _nodestore_save_many(jobs: Sequence[Job], app_feature: str) -> None:
     inserted_time = datetime.now(timezone.utc).timestamp()
+    save_many = options.get("nodestore.save-many.enabled")
+    pending: list[tuple[NodeData, dict[str | None, Any]]] = []
     for job in jobs:
         # Write the event to Nodestore
-        subkeys = {}
+        subkeys: dict[str | None, Any] = {}
 
         event = job["event"]
         # We only care about `unprocessed` for error events
@@ -1100,7 +1251,13 @@ def _nodestore_save_many(jobs: Sequence[Job], app_feature: str) -> None:
                 usage_type=UsageUnit.BYTES,
             )
         job["event"].data["nodestore_insert"] = inserted_time
-        job["event"].data.save(subkeys=subkeys)
+        if save_many:
+            pending.append((job["event"].data, subkeys))
+        else:
+            job["event"].data.save(subkeys=subkeys)
+
+    if pending:
+        NodeData.save_many(pending)
 
 
 def _eventstream_insert_many(jobs: Sequence[Job]) -> None:
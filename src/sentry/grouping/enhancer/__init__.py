@@ -3,6 +3,7 @@ from __future__ import annotations
 import base64
 import logging
 import os
+import threading
 import zlib
 from collections import Counter
 from collections.abc import Sequence
@@ -13,6 +14,7 @@ from typing import Any, Literal
 import msgpack
 import sentry_sdk
 import zstandard
+from cachetools import LRUCache
 from sentry_ophio.enhancers import Cache as RustCache
 from sentry_ophio.enhancers import Component as RustFrame
 from sentry_ophio.enhancers import Enhancements as RustEnhancements
@@ -34,6 +36,13 @@ logger = logging.getLogger(__name__)
 # So this leaves quite a bit of headroom for custom enhancement rules as well.
 RUST_CACHE = RustCache(1_000)
 
+# Decoded `Enhancements` objects, keyed by their base64 representation, so that each worker only has
+# to decode (and merge with the base rules) a given project's enhancements once. `Enhancements`
+# objects aren't modified after creation, so they can safely be shared between events.
+ENHANCEMENTS_CACHE_SIZE = 1_000
+_enhancements_cache: LRUCache[bytes, Enhancements] = LRUCache(ENHANCEMENTS_CACHE_SIZE)
+_enhancements_cache_lock = threading.Lock()
+
 # TODO: Version 2 can be removed once all events with that config have expired, 90 days after this
 # comment is merged
 VERSIONS = [2, 3]
@@ -556,17 +565,36 @@ class Enhancements:
     def from_base64_string(
         cls, base64_string: str | bytes, referrer: str | None = None
     ) -> Enhancements:
-        """Convert a base64 string into an `Enhancements` object"""
+        """
+        Convert a base64 string into an `Enhancements` object, reusing a previously-decoded object
+        for the same string if there is one
+        """
+        raw_bytes_str = (
+            base64_string.encode("ascii", "ignore")
+            if isinstance(base64_string, str)
+            else base64_string
+        )
+
+        with _enhancements_cache_lock:
+            enhancements = _enhancements_cache.get(raw_bytes_str)
+
+        metrics.incr(
+            "grouping.enhancements.cache",
+            tags={"result": "miss" if enhancements is None else "hit", "referrer": referrer},
+        )
+
+        if enhancements is None:
+            enhancements = cls._from_base64_bytes(raw_bytes_str, referrer)
+            with _enhancements_cache_lock:
+                _enhancements_cache[raw_bytes_str] = enhancements
+
+        return enhancements
 
+    @classmethod
+    def _from_base64_bytes(cls, raw_bytes_str: bytes, referrer: str | None = None) -> Enhancements:
         with metrics.timer("grouping.enhancements.creation") as metrics_timer_tags:
             metrics_timer_tags.update({"source": "base64_string", "referrer": referrer})
 
-            raw_bytes_str = (
-                base64_string.encode("ascii", "ignore")
-                if isinstance(base64_string, str)
-                else base64_string
-            )
-
             # Split the string to get encoded data for each set of rules: unsplit rules (i.e., rules
             # the way they're stored in project config), classifier rules, and contributes rules.
             # Older base64 strings - such as those stored in events created before rule-splitting
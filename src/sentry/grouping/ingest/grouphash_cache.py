@@ -0,0 +1,163 @@
+"""
+A bounded, in-process cache of resolved `GroupHash` records, used to avoid hitting Postgres for
+every event when a small set of hashes dominates traffic (e.g. during an incident).
+
+Only grouphashes which are linked to a group, aren't tombstoned, aren't locked for an unmerge, and
+already have metadata are cached, since those are the only ones for which the ingest path doesn't
+need to write anything.
+
+Entries expire after a short TTL. In addition, anything which moves grouphashes between groups
+(merge, unmerge, delete, discard) calls `invalidate_grouphash_cache`, which bumps a per-project
+generation token in the shared cache. Every lookup checks that token, so invalidations are seen by
+all ingest workers, not just the process which triggered them. Nothing is cached or served while a
+project has no token (e.g. because it was evicted), a new one is seeded instead.
+"""
+
+from __future__ import annotations
+
+import copy
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Iterable
+
+from django.core.cache import cache
+
+from sentry import options
+from sentry.models.grouphash import GroupHash
+from sentry.utils import metrics
+
+# Long enough to outlive any local entry. If the token is evicted, a new one is seeded, so every
+# local entry for the project is treated as stale, which is the safe direction.
+GENERATION_KEY_TTL = 24 * 60 * 60
+
+
+def _get_generation_key(project_id: int) -> str:
+    return f"grouphash-cache-gen:{project_id}"
+
+
+class GroupHashCache:
+    def __init__(self) -> None:
+        self._entries: OrderedDict[tuple[int, str], tuple[GroupHash, str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(
+        self, project_id: int, hashes: Iterable[str], generation: str
+    ) -> dict[str, GroupHash]:
+        now = time.monotonic()
+        found: dict[str, GroupHash] = {}
+
+        with self._lock:
+            for hash_value in hashes:
+                key = (project_id, hash_value)
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+
+                grouphash, entry_generation, expires_at = entry
+                if entry_generation != generation or expires_at < now:
+                    del self._entries[key]
+                    continue
+
+                self._entries.move_to_end(key)
+                # Hand out copies, so that callers mutating their instance (e.g. setting `group_id`)
+                # can't affect other events
+                found[hash_value] = copy.copy(grouphash)
+
+        return found
+
+    def set_many(self, project_id: int, grouphashes: Iterable[GroupHash], generation: str) -> None:
+        max_size = options.get("grouping.grouphash_cache.max_size")
+        expires_at = time.monotonic() + options.get("grouping.grouphash_cache.ttl_seconds")
+
+        with self._lock:
+            for grouphash in grouphashes:
+                key = (project_id, grouphash.hash)
+                self._entries[key] = (copy.copy(grouphash), generation, expires_at)
+                self._entries.move_to_end(key)
+
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+grouphash_cache = GroupHashCache()
+
+
+def is_grouphash_cacheable(grouphash: GroupHash) -> bool:
+    return (
+        grouphash.group_id is not None
+        and grouphash.group_tombstone_id is None
+        and grouphash.state != GroupHash.State.LOCKED_IN_MIGRATION
+        and grouphash.metadata is not None
+    )
+
+
+def get_grouphash_cache_generation(project_id: int) -> str | None:
+    """
+    Fetch the project's current generation token. This should be read *before* loading grouphashes
+    from the database, so that an invalidation racing with the load makes the resulting entries
+    stale rather than letting them be stored under the new generation.
+    """
+    if not options.get("grouping.grouphash_cache.enabled"):
+        return None
+
+    key = _get_generation_key(project_id)
+    generation = cache.get(key)
+    if generation is None:
+        # Seed a token rather than going without one, as entries cached without a token would
+        # become valid again whenever the project's token is evicted later on.
+        generation = uuid.uuid4().hex
+        if not cache.add(key, generation, GENERATION_KEY_TTL):
+            # Another process seeded it first
+            generation = cache.get(key)
+
+    return generation
+
+
+def get_cached_grouphashes(
+    project_id: int, hashes: Iterable[str], generation: str | None
+) -> dict[str, GroupHash]:
+    """
+    Return whichever of the given hashes are in the cache, keyed by hash value.
+    """
+    if not options.get("grouping.grouphash_cache.enabled") or generation is None:
+        return {}
+
+    hashes = list(hashes)
+    found = grouphash_cache.get_many(project_id, hashes, generation)
+
+    metrics.incr("grouping.grouphash_cache.hit", amount=len(found), sample_rate=1.0)
+    metrics.incr("grouping.grouphash_cache.miss", amount=len(hashes) - len(found), sample_rate=1.0)
+
+    return found
+
+
+def cache_grouphashes(
+    project_id: int, grouphashes: Iterable[GroupHash], generation: str | None
+) -> None:
+    """
+    Store the given grouphashes in the cache, skipping any which aren't safe to serve from it.
+    """
+    if not options.get("grouping.grouphash_cache.enabled") or generation is None:
+        return
+
+    cacheable = [gh for gh in grouphashes if is_grouphash_cacheable(gh)]
+    if cacheable:
+        grouphash_cache.set_many(project_id, cacheable, generation)
+
+
+def invalidate_grouphash_cache(project_id: int) -> None:
+    """
+    Invalidate all cached grouphashes for the given project, in every process.
+
+    Must be called whenever grouphashes are moved to a different group, unlinked, or tombstoned.
+    """
+    cache.set(_get_generation_key(project_id), uuid.uuid4().hex, GENERATION_KEY_TTL)
@@ -19,6 +19,11 @@ from sentry.grouping.api import (
     load_grouping_config,
 )
 from sentry.grouping.ingest.config import is_in_transition
+from sentry.grouping.ingest.grouphash_cache import (
+    cache_grouphashes,
+    get_cached_grouphashes,
+    get_grouphash_cache_generation,
+)
 from sentry.grouping.ingest.grouphash_metadata import (
     create_or_update_grouphash_metadata_if_needed,
     record_grouphash_metadata_metrics,
@@ -209,6 +214,31 @@ def find_grouphash_with_group(
     return None
 
 
+def bulk_get_grouphashes(project: Project, hashes: Sequence[str]) -> dict[str, GroupHash]:
+    """
+    Look up the existing `GroupHash` records for the given hashes, keyed by hash value. Hashes
+    without a record are left out - nothing is created.
+
+    Hot hashes are served from the in-process grouphash cache, and everything else is fetched in a
+    single query, so this is safe to call with all of the hashes of a batch of events at once.
+    """
+    # Read the generation before hitting the database, see `get_grouphash_cache_generation`
+    generation = get_grouphash_cache_generation(project.id)
+    grouphashes = get_cached_grouphashes(project.id, hashes, generation)
+
+    missing_hashes = [hash_value for hash_value in hashes if hash_value not in grouphashes]
+    if missing_hashes:
+        fetched_grouphashes = list(
+            GroupHash.objects.filter(project=project, hash__in=missing_hashes).select_related(
+                "_metadata"
+            )
+        )
+        cache_grouphashes(project.id, fetched_grouphashes, generation)
+        grouphashes.update((grouphash.hash, grouphash) for grouphash in fetched_grouphashes)
+
+    return grouphashes
+
+
 def get_or_create_grouphashes(
     event: Event,
     project: Project,
@@ -219,19 +249,20 @@ def get_or_create_grouphashes(
     is_secondary = grouping_config_id == project.get_option("sentry:secondary_grouping_config")
     grouphashes: list[GroupHash] = []
 
+    hashes = list(hashes)
+    existing_grouphashes = bulk_get_grouphashes(project, hashes)
+
     if is_secondary:
         # The only utility of secondary hashes is to link new primary hashes to an existing group
         # via an existing grouphash. Secondary hashes which are new are therefore of no value, so
         # filter them out before creating grouphash records.
-        existing_hashes = set(
-            GroupHash.objects.filter(project=project, hash__in=hashes).values_list(
-                "hash", flat=True
-            )
-        )
-        hashes = filter(lambda hash_value: hash_value in existing_hashes, hashes)
+        hashes = [hash_value for hash_value in hashes if hash_value in existing_grouphashes]
 
     for hash_value in hashes:
-        grouphash, created = GroupHash.objects.get_or_create(project=project, hash=hash_value)
+        if hash_value in existing_grouphashes:
+            grouphash, created = existing_grouphashes[hash_value], False
+        else:
+            grouphash, created = GroupHash.objects.get_or_create(project=project, hash=hash_value)
 
         if should_handle_grouphash_metadata(project, created):
             try:
@@ -1,4 +1,5 @@
 import dataclasses
+import functools
 import re
 from collections import defaultdict
 from collections.abc import Callable, Sequence
@@ -18,6 +19,11 @@ class ParameterizationRegex:
     raw_pattern_experimental: str | None = None
     lookbehind: str | None = None  # positive lookbehind prefix if needed
     lookahead: str | None = None  # positive lookahead postfix if needed
+    # Cheap pre-filter: the pattern can only match (ASCII) content which contains at least one of
+    # these substrings or which is at least `min_length` long. Leave both unset if no such
+    # guarantee can be given. Only applies to `raw_pattern`, not to `raw_pattern_experimental`.
+    required_substrings: tuple[str, ...] = ()
+    min_length: int | None = None
     counter: int = 0
 
     # These need to be used with `(?x)`, to tell the regex compiler to ignore comments
@@ -41,12 +47,19 @@ class ParameterizationRegex:
         return rf"{prefix}(?P<{self.name}>{pattern}){postfix}"
 
 
+_DIGITS = tuple("0123456789")
+
 DEFAULT_PARAMETERIZATION_REGEXES = [
     ParameterizationRegex(
         name="email",
         raw_pattern=r"""[a-zA-Z0-9.!#$%&'*+/=?^_`{|}~-]+@[a-zA-Z0-9-]+(?:\.[a-zA-Z0-9-]+)*""",
+        required_substrings=("@",),
+    ),
+    ParameterizationRegex(
+        name="url",
+        raw_pattern=r"""\b(wss?|https?|ftp)://[^\s/$.?#].[^\s]*""",
+        required_substrings=("://",),
     ),
-    ParameterizationRegex(name="url", raw_pattern=r"""\b(wss?|https?|ftp)://[^\s/$.?#].[^\s]*"""),
     ParameterizationRegex(
         name="hostname",
         raw_pattern=r"""
@@ -59,6 +72,7 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
             )
             \b
         """,
+        required_substrings=(".",),
     ),
     ParameterizationRegex(
         name="ip",
@@ -86,6 +100,7 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
                 (25[0-5]|(2[0-4]|1{0,1}[0-9]){0,1}[0-9])\b
             )
         """,
+        required_substrings=(".", ":"),
     ),
     ParameterizationRegex(
         name="traceparent",
@@ -96,13 +111,23 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
             # https://docs.aws.amazon.com/elasticloadbalancing/latest/application/load-balancer-request-tracing.html#request-tracing-syntax
             (\b1-[0-9a-f]{8}-[0-9a-f]{24}\b)
         """,
+        required_substrings=("-",),
     ),
     ParameterizationRegex(
         name="uuid",
         raw_pattern=r"""\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b""",
+        required_substrings=("-",),
+    ),
+    ParameterizationRegex(
+        name="sha1",
+        raw_pattern=r"""\b[0-9a-fA-F]{40}\b""",
+        min_length=40,
+    ),
+    ParameterizationRegex(
+        name="md5",
+        raw_pattern=r"""\b[0-9a-fA-F]{32}\b""",
+        min_length=32,
     ),
-    ParameterizationRegex(name="sha1", raw_pattern=r"""\b[0-9a-fA-F]{40}\b"""),
-    ParameterizationRegex(name="md5", raw_pattern=r"""\b[0-9a-fA-F]{32}\b"""),
     ParameterizationRegex(
         name="date",
         raw_pattern=r"""
@@ -158,8 +183,15 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
             ) |
             (datetime.datetime\(.*?\))
         """,
+        # Every format contains a digit, except `datetime.datetime(...)`, whose dot matches any
+        # character
+        required_substrings=(*_DIGITS, "datetime"),
+    ),
+    ParameterizationRegex(
+        name="duration",
+        raw_pattern=r"""\b(\d+ms) | (\d+(\.\d+)?s)\b""",
+        required_substrings=_DIGITS,
     ),
-    ParameterizationRegex(name="duration", raw_pattern=r"""\b(\d+ms) | (\d+(\.\d+)?s)\b"""),
     ParameterizationRegex(
         name="hex",
         raw_pattern=r"""
@@ -177,9 +209,18 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
             (\b(?=.*[0-9])[0-9a-f]{8}\b) |
             (\b(?=.*[0-9])[0-9a-f]{16}\b)
         """,
+        required_substrings=_DIGITS,
+    ),
+    ParameterizationRegex(
+        name="float",
+        raw_pattern=r"""-\d+\.\d+\b | \b\d+\.\d+\b""",
+        required_substrings=_DIGITS,
+    ),
+    ParameterizationRegex(
+        name="int",
+        raw_pattern=r"""-\d+\b | \b\d+\b""",
+        required_substrings=_DIGITS,
     ),
-    ParameterizationRegex(name="float", raw_pattern=r"""-\d+\.\d+\b | \b\d+\.\d+\b"""),
-    ParameterizationRegex(name="int", raw_pattern=r"""-\d+\b | \b\d+\b"""),
     ParameterizationRegex(
         name="quoted_str",
         raw_pattern=r"""# Using `=`lookbehind which guarantees we'll only match the value half of key-value pairs,
@@ -187,6 +228,7 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
             '([^']+)' | "([^"]+)"
         """,
         lookbehind="=",
+        required_substrings=("=",),
     ),
     ParameterizationRegex(
         name="bool",
@@ -198,6 +240,7 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
             false
         """,
         lookbehind="=",
+        required_substrings=("=",),
     ),
 ]
 
@@ -206,6 +249,65 @@ DEFAULT_PARAMETERIZATION_REGEXES_MAP = {r.name: r.pattern for r in DEFAULT_PARAM
 EXPERIMENTAL_PARAMETERIZATION_REGEXES_MAP = {
     r.name: r.experimental_pattern for r in DEFAULT_PARAMETERIZATION_REGEXES
 }
+_PARAMETERIZATION_REGEXES_BY_NAME = {r.name: r for r in DEFAULT_PARAMETERIZATION_REGEXES}
+
+
+@functools.lru_cache(maxsize=16)
+def _compile_parameterization_regex(
+    pattern_keys: tuple[str, ...], experimental: bool
+) -> re.Pattern[str]:
+    """
+    Compile (once per process) a regex matching any of the given patterns.
+
+    The `(?x)` tells the regex compiler to ignore comments and unescaped whitespace,
+    so we can use newlines and indentation for better legibility in patterns above.
+    """
+    regexes_map = (
+        EXPERIMENTAL_PARAMETERIZATION_REGEXES_MAP
+        if experimental
+        else DEFAULT_PARAMETERIZATION_REGEXES_MAP
+    )
+
+    return re.compile(rf"(?x){'|'.join(regexes_map[k] for k in pattern_keys)}")
+
+
+@functools.lru_cache(maxsize=16)
+def _get_parameterization_prefilter(
+    pattern_keys: tuple[str, ...], experimental: bool
+) -> Callable[[str], bool] | None:
+    """
+    Build a function which cheaply rules out content none of the given patterns can match, so we
+    can skip running the (comparatively expensive) combined regex over it. Returns None if any of
+    the patterns doesn't declare what it needs in order to match.
+    """
+    required_substrings: set[str] = set()
+    min_length: int | None = None
+
+    for key in pattern_keys:
+        regex = _PARAMETERIZATION_REGEXES_BY_NAME[key]
+        if experimental and regex.raw_pattern_experimental is not None:
+            return None
+        if not regex.required_substrings and regex.min_length is None:
+            return None
+
+        required_substrings.update(regex.required_substrings)
+        if regex.min_length is not None:
+            min_length = (
+                regex.min_length if min_length is None else min(min_length, regex.min_length)
+            )
+
+    substrings = tuple(sorted(required_substrings))
+
+    def could_match(content: str) -> bool:
+        # `\d` and `\b` match more than their ASCII counterparts, so only ASCII content can be ruled
+        # out based on substrings alone
+        return (
+            not content.isascii()
+            or (min_length is not None and len(content) >= min_length)
+            or any(substring in content for substring in substrings)
+        )
+
+    return could_match
 
 
 @dataclasses.dataclass
@@ -228,6 +330,7 @@ class Parameterizer:
     ):
         self._experimental = experimental
         self._parameterization_regex = self._make_regex_from_patterns(regex_pattern_keys)
+        self._could_match = _get_parameterization_prefilter(tuple(regex_pattern_keys), experimental)
         self.matches_counter: defaultdict[str, int] = defaultdict(int)
 
     def _make_regex_from_patterns(self, pattern_keys: Sequence[str]) -> re.Pattern[str]:
@@ -238,17 +341,9 @@ class Parameterizer:
         @returns: A compiled regex pattern that matches any of the given keys.
         @raises: KeyError on pattern key not in the _parameterization_regex_components dict
 
-        The `(?x)` tells the regex compiler to ignore comments and unescaped whitespace,
-        so we can use newlines and indentation for better legibility in patterns above.
+        The compiled pattern is shared by all parameterizers using the same keys.
         """
-
-        regexes_map = (
-            EXPERIMENTAL_PARAMETERIZATION_REGEXES_MAP
-            if self._experimental
-            else DEFAULT_PARAMETERIZATION_REGEXES_MAP
-        )
-
-        return re.compile(rf"(?x){'|'.join(regexes_map[k] for k in pattern_keys)}")
+        return _compile_parameterization_regex(tuple(pattern_keys), self._experimental)
 
     def parametrize_w_regex(self, content: str) -> str:
         """
@@ -261,15 +356,20 @@ class Parameterizer:
         @returns: The content with all matches replaced with placeholders.
         """
 
+        if self._could_match is not None and not self._could_match(content):
+            return content
+
         def _handle_regex_match(match: re.Match[str]) -> str:
-            # Find the first (should be only) non-None match entry, and sub in the placeholder. For
-            # example, given the groupdict item `('hex', '0x40000015')`, this returns '<hex>' as a
-            # replacement for the original value in the string.
-            for key, value in match.groupdict().items():
-                if value is not None:
-                    self.matches_counter[key] += 1
-                    return f"<{key}>"
-            return ""
+            # Each pattern is wrapped in a single top-level named group and all groups nested inside
+            # of it are unnamed, so the last named group to match is the pattern which matched. For
+            # example, given a match on `0x40000015`, this returns '<hex>' as a replacement for the
+            # original value in the string.
+            key = match.lastgroup
+            if key is None:
+                return ""
+
+            self.matches_counter[key] += 1
+            return f"<{key}>"
 
         return self._parameterization_regex.sub(_handle_regex_match, content)
 
@@ -0,0 +1,58 @@
+"""
+A short-lived cache of per-group attributes which are expensive to compute when serializing groups
+(e.g. the Snuba seen stats of the issue stream), shared between requests.
+
+Entries are stored per group and per query, and are never invalidated explicitly: seen stats change
+with every new event, and groups are updated through many bulk paths (status changes, merges,
+buffer flushes) which don't send any signal. Changes are only picked up once the entry expires, so
+the TTL should stay in the order of seconds.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from sentry import options
+from sentry.utils import metrics
+from sentry.utils.cache import cache
+
+
+def _get_entry_key(namespace: str, query_hash: str, group_id: int) -> str:
+    return f"group-attrs:{namespace}:{query_hash}:{group_id}"
+
+
+def get_cached_group_attrs(
+    namespace: str, query_hash: str, group_ids: Sequence[int]
+) -> dict[int, Any]:
+    """
+    Return whichever groups have an entry for the given query, keyed by group id.
+    """
+    keys = {group_id: _get_entry_key(namespace, query_hash, group_id) for group_id in group_ids}
+    entries = cache.get_many(keys.values())
+    found = {group_id: entries[key] for group_id, key in keys.items() if key in entries}
+
+    metrics.incr(
+        "group_attrs_cache.hit", amount=len(found), tags={"namespace": namespace}, sample_rate=1.0
+    )
+    metrics.incr(
+        "group_attrs_cache.miss",
+        amount=len(keys) - len(found),
+        tags={"namespace": namespace},
+        sample_rate=1.0,
+    )
+    return found
+
+
+def cache_group_attrs(namespace: str, query_hash: str, values: Mapping[int, Any]) -> None:
+    ttl = options.get("issues.group-attrs-cache.ttl-seconds")
+    if ttl <= 0:
+        return
+
+    cache.set_many(
+        {
+            _get_entry_key(namespace, query_hash, group_id): value
+            for group_id, value in values.items()
+        },
+        ttl,
+    )
@@ -28,7 +28,12 @@ from sentry.issues.producer import PayloadType
 from sentry.issues.status_change_consumer import process_status_change_message
 from sentry.models.organization import Organization
 from sentry.models.project import Project
-from sentry.ratelimits.sliding_windows import Quota, RedisSlidingWindowRateLimiter, RequestedQuota
+from sentry.ratelimits.sliding_windows import (
+    LeasedSlidingWindowRateLimiter,
+    Quota,
+    RedisSlidingWindowRateLimiter,
+    RequestedQuota,
+)
 from sentry.services.eventstore.models import Event
 from sentry.types.actor import parse_and_validate_actor
 from sentry.utils import metrics
@@ -36,6 +41,9 @@ from sentry.utils import metrics
 logger = logging.getLogger(__name__)
 
 rate_limiter = RedisSlidingWindowRateLimiter(cluster=settings.SENTRY_RATE_LIMIT_REDIS_CLUSTER)
+leased_rate_limiter = LeasedSlidingWindowRateLimiter(
+    cluster=settings.SENTRY_RATE_LIMIT_REDIS_CLUSTER
+)
 
 
 class InvalidEventPayloadError(Exception):
@@ -62,7 +70,12 @@ def is_rate_limited(
 
         rate_limit_key = create_rate_limit_key(project_id, fingerprint)
         rate_limit_quota = Quota(**options.get("issues.occurrence-consumer.rate-limit.quota"))
-        granted_quota = rate_limiter.check_and_use_quotas(
+        limiter = (
+            leased_rate_limiter
+            if options.get("issues.occurrence-consumer.rate-limit.leased")
+            else rate_limiter
+        )
+        granted_quota = limiter.check_and_use_quotas(
             [
                 RequestedQuota(
                     rate_limit_key,
@@ -425,20 +438,14 @@ def _process_message(
     return None
 
 
-@sentry_sdk.tracing.trace
-@metrics.wraps("occurrence_consumer.process_batch")
-def process_occurrence_batch(
-    worker: ThreadPoolExecutor, message: Message[ValuesBatch[KafkaPayload]]
-) -> None:
+def partition_occurrence_batch(
+    message: Message[ValuesBatch[KafkaPayload]],
+) -> Mapping[str, list[Mapping[str, Any]]]:
     """
-    Receives batches of occurrences. This function will take the batch
-    and group them together by fingerprint (ensuring order is preserved) and
-    execute each group using a ThreadPoolWorker.
-
-    By batching we're able to process occurrences in parallel while guaranteeing
-    that no occurrences are processed out of order per group.
+    Groups a batch of occurrences by fingerprint (ensuring order is preserved).
+    Each group is to be processed serially, while groups may be processed in
+    parallel.
     """
-
     batch = message.payload
 
     occcurrence_mapping: Mapping[str, list[Mapping[str, Any]]] = defaultdict(list)
@@ -462,6 +469,25 @@ def process_occurrence_batch(
 
     # Number of groups we've collected to be processed in parallel
     metrics.gauge("occurrence_consumer.checkin.parallel_batch_groups", len(occcurrence_mapping))
+
+    return occcurrence_mapping
+
+
+@sentry_sdk.tracing.trace
+@metrics.wraps("occurrence_consumer.process_batch")
+def process_occurrence_batch(
+    worker: ThreadPoolExecutor, message: Message[ValuesBatch[KafkaPayload]]
+) -> None:
+    """
+    Receives batches of occurrences. This function will take the batch
+    and group them together by fingerprint (ensuring order is preserved) and
+    execute each group using a ThreadPoolWorker.
+
+    By batching we're able to process occurrences in parallel while guaranteeing
+    that no occurrences are processed out of order per group.
+    """
+    occcurrence_mapping = partition_occurrence_batch(message)
+
     # Submit occurrences & status changes for processing
     with sentry_sdk.start_transaction(op="process_batch", name="occurrence.occurrence_consumer"):
         futures = [
@@ -15,6 +15,7 @@ from arroyo.processing.strategies.batching import BatchStep, ValuesBatch
 from arroyo.processing.strategies.run_task import RunTask
 from arroyo.types import Commit, Message, Partition
 
+from sentry.consumers.pipelined_batches import PipelinedBatchStep, PreparedBatch, pipelining_enabled
 from sentry.utils.arroyo import MultiprocessingPool, run_task_with_multiprocessing
 
 logger = logging.getLogger(__name__)
@@ -65,10 +66,19 @@ class OccurrenceStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
 
     def create_batched_parallel_worker(self, commit: Commit) -> ProcessingStrategy[KafkaPayload]:
         assert self.worker is not None
-        batch_processor = RunTask(
-            function=functools.partial(process_batch, self.worker),
-            next_step=CommitOffsets(commit),
-        )
+        batch_processor: ProcessingStrategy[ValuesBatch[KafkaPayload]]
+        if pipelining_enabled("occurrences"):
+            batch_processor = PipelinedBatchStep(
+                name="occurrences",
+                executor=self.worker,
+                prepare_batch=prepare_batch,
+                next_step=CommitOffsets(commit),
+            )
+        else:
+            batch_processor = RunTask(
+                function=functools.partial(process_batch, self.worker),
+                next_step=CommitOffsets(commit),
+            )
         return BatchStep(
             max_batch_size=self.max_batch_size,
             max_batch_time=self.max_batch_time,
@@ -109,3 +119,23 @@ def process_batch(worker: ThreadPoolExecutor, messages: Message[ValuesBatch[Kafk
         process_occurrence_batch(worker, messages)
     except Exception:
         logger.exception("failed to process batch payload")
+
+
+def prepare_batch(messages: Message[ValuesBatch[KafkaPayload]]) -> PreparedBatch:
+    from sentry.issues.occurrence_consumer import (
+        partition_occurrence_batch,
+        process_occurrence_group,
+    )
+
+    try:
+        occurrence_mapping = partition_occurrence_batch(messages)
+    except Exception:
+        logger.exception("failed to process batch payload")
+        return PreparedBatch(groups={})
+
+    return PreparedBatch(
+        groups={
+            key: functools.partial(process_occurrence_group, group)
+            for key, group in occurrence_mapping.items()
+        }
+    )
@@ -3,11 +3,12 @@ from __future__ import annotations
 import logging
 import uuid
 from collections import defaultdict
-from collections.abc import Mapping
+from collections.abc import Callable, Iterable, Mapping
 from concurrent.futures import ThreadPoolExecutor, wait
 from copy import deepcopy
 from datetime import UTC, datetime
-from functools import partial
+from functools import partial, reduce
+from operator import or_
 from typing import Any, Literal, NotRequired, TypedDict
 
 import sentry_sdk
@@ -18,6 +19,7 @@ from arroyo.processing.strategies.commit import CommitOffsets
 from arroyo.processing.strategies.run_task import RunTask
 from arroyo.types import BrokerValue, Commit, FilteredPayload, Message, Partition
 from django.db import router, transaction
+from django.db.models import Q
 from sentry_kafka_schemas.codecs import Codec
 from sentry_kafka_schemas.schema_types.ingest_monitors_v1 import IngestMonitorMessage
 from sentry_sdk.tracing import Span, Transaction
@@ -25,6 +27,7 @@ from sentry_sdk.tracing import Span, Transaction
 from sentry import options, quotas, ratelimits
 from sentry.conf.types.kafka_definition import Topic, get_topic_codec
 from sentry.constants import DataCategory, ObjectStatus
+from sentry.consumers.pipelined_batches import PipelinedBatchStep, PreparedBatch, pipelining_enabled
 from sentry.db.postgres.transactions import in_test_hide_transaction_boundary
 from sentry.killswitches import killswitch_matches_context
 from sentry.models.project import Project
@@ -92,15 +95,19 @@ def _ensure_monitor_with_config(
     project: Project,
     monitor_slug: str,
     config: dict[str, Any] | None,
+    preloaded_monitor: Monitor | None = None,
 ) -> Monitor | None:
-    try:
-        monitor = Monitor.objects.get(
-            slug=monitor_slug,
-            project_id=project.id,
-            organization_id=project.organization_id,
-        )
-    except Monitor.DoesNotExist:
-        monitor = None
+    if preloaded_monitor is not None:
+        monitor: Monitor | None = preloaded_monitor
+    else:
+        try:
+            monitor = Monitor.objects.get(
+                slug=monitor_slug,
+                project_id=project.id,
+                organization_id=project.organization_id,
+            )
+        except Monitor.DoesNotExist:
+            monitor = None
 
     # Monitor was previously marked as upserting, but no config is provided for
     # this check-in, therefore it's no longer upserting.
@@ -448,7 +455,11 @@ def update_existing_check_in(
     existing_check_in.update(**updated_checkin)
 
 
-def _process_checkin(item: CheckinItem, txn: Transaction | Span) -> None:
+def _process_checkin(
+    item: CheckinItem,
+    txn: Transaction | Span,
+    monitors: dict[tuple[int, str], Monitor] | None = None,
+) -> None:
     params = item.payload
 
     # XXX: The start_time is when relay received the original envelope store
@@ -626,6 +637,7 @@ def _process_checkin(item: CheckinItem, txn: Transaction | Span) -> None:
             project,
             monitor_slug,
             monitor_config,
+            monitors.get((project.id, monitor_slug)) if monitors is not None else None,
         )
     except ProcessingErrorsException as e:
         ensure_config_errors = list(e.processing_errors)
@@ -654,6 +666,11 @@ def _process_checkin(item: CheckinItem, txn: Transaction | Span) -> None:
         }
         raise ProcessingErrorsException([limit_error])
 
+    # Later check-ins of the group reuse the monitor, including any changes
+    # made to it while processing this one
+    if monitor and monitors is not None:
+        monitors[(project.id, monitor_slug)] = monitor
+
     # When accepting for upsert attempt to assign a seat for the monitor,
     # otherwise the monitor is marked as disabled
     if monitor and quotas_outcome == PermitCheckInStatus.ACCEPTED_FOR_UPSERT:
@@ -1003,9 +1020,14 @@ def _process_checkin(item: CheckinItem, txn: Transaction | Span) -> None:
         logger.exception("Failed to process check-in")
 
 
-def process_checkin(item: CheckinItem) -> None:
+def process_checkin(
+    item: CheckinItem, monitors: dict[tuple[int, str], Monitor] | None = None
+) -> None:
     """
     Process an individual check-in
+
+    :param monitors: Monitors which have already been loaded, by project id
+        and slug. Updated with the monitor of the check-in once processed.
     """
     try:
         with sentry_sdk.start_transaction(
@@ -1014,32 +1036,63 @@ def process_checkin(item: CheckinItem) -> None:
         ) as txn:
             # Deepcopy the checkin here so that it's not modified. We need the original when we get a
             # `ProcessingErrorsException`
-            _process_checkin(deepcopy(item), txn)
+            _process_checkin(deepcopy(item), txn, monitors)
     except ProcessingErrorsException as e:
         handle_processing_errors(item, e)
     except Exception:
         logger.exception("Failed to process check-in")
 
 
-def process_checkin_group(items: list[CheckinItem]) -> None:
+def process_checkin_group(
+    items: list[CheckinItem],
+    monitors: dict[tuple[int, str], Monitor] | None = None,
+    load_monitors: bool = False,
+) -> None:
     """
     Process a group of related check-ins (all part of the same monitor)
     completely serially.
+
+    :param monitors: Monitors preloaded for this group, see `process_checkin`.
+    :param load_monitors: Load the monitor of the group once before processing
+        its check-ins, when the monitors haven't been preloaded.
     """
+    if monitors is None and load_monitors:
+        try:
+            monitors = preload_monitors(items)
+        except Exception:
+            logger.exception("Failed to preload monitors")
+            monitors = {}
+
     for item in items:
-        process_checkin(item)
+        process_checkin(item, monitors)
 
 
-def process_batch(
-    executor: ThreadPoolExecutor, message: Message[ValuesBatch[KafkaPayload]]
-) -> None:
+def preload_monitors(items: Iterable[CheckinItem]) -> dict[tuple[int, str], Monitor]:
     """
-    Receives batches of check-in messages. This function will take the batch
-    and group them together by monitor ID (ensuring order is preserved) and
-    execute each group using a ThreadPoolWorker.
+    Load the monitors of all of the given check-ins with a single query, keyed
+    by project id and slug. Monitors which don't exist yet are not included.
+    """
+    keys = {(int(item.message["project_id"]), item.valid_monitor_slug) for item in items}
+    if not keys:
+        return {}
 
-    By batching we're able to process check-ins in parallel while guaranteeing
-    that no check-ins are processed out of order per monitor environment.
+    query = reduce(or_, (Q(project_id=project_id, slug=slug) for project_id, slug in keys))
+    return {
+        (monitor.project_id, monitor.slug): monitor for monitor in Monitor.objects.filter(query)
+    }
+
+
+def prepare_batch(
+    message: Message[ValuesBatch[KafkaPayload]], pipelined: bool = False
+) -> PreparedBatch:
+    """
+    Groups a batch of check-in messages by monitor environment (ensuring order
+    is preserved). Each group is to be processed serially, while groups may be
+    processed in parallel. Once all groups are processed the batch is completed
+    by updating the check-in volume and ticking the clock.
+
+    :param pipelined: Whether groups of the previous batch may still be running
+        while this batch is prepared (see `PipelinedBatchStep`).
     """
     batch = message.payload
 
@@ -1077,22 +1130,68 @@ def process_batch(
     # Number of check-in groups we've collected to be processed in parallel
     metrics.gauge("monitors.checkin.parallel_batch_groups", len(checkin_mapping))
 
+    groups: dict[str, Callable[[], None]] = {}
+    if options.get("crons.consumer.preload-monitors") and pipelined:
+        # The groups of the previous batch may still be updating the same
+        # monitors, so they can't be loaded up front. Instead each group loads
+        # its monitor once it starts, after the previous group of the same
+        # monitor environment has finished.
+        for processing_key, group in checkin_mapping.items():
+            groups[processing_key] = partial(process_checkin_group, group, load_monitors=True)
+    elif options.get("crons.consumer.preload-monitors"):
+        # Load the monitors of the whole batch at once instead of once per
+        # check-in. Groups of the same monitor (for different environments)
+        # run in parallel, so each group gets its own instance.
+        try:
+            monitors = preload_monitors(
+                item for group in checkin_mapping.values() for item in group
+            )
+        except Exception:
+            logger.exception("Failed to preload monitors")
+            monitors = {}
+
+        for processing_key, group in checkin_mapping.items():
+            key = (int(group[0].message["project_id"]), group[0].valid_monitor_slug)
+            group_monitors = {key: deepcopy(monitors[key])} if key in monitors else {}
+            groups[processing_key] = partial(process_checkin_group, group, group_monitors)
+    else:
+        for processing_key, group in checkin_mapping.items():
+            groups[processing_key] = partial(process_checkin_group, group)
+
+    def complete_batch() -> None:
+        # Update check in volume for the entire batch we've just processed
+        update_check_in_volume(item.timestamp for item in batch if item.timestamp is not None)
+
+        # Attempt to trigger monitor tasks across processed partitions
+        for partition, ts in latest_partition_ts.items():
+            try:
+                try_monitor_clock_tick(ts, partition)
+            except Exception:
+                logger.exception("Failed to trigger monitor tasks")
+
+    return PreparedBatch(groups=groups, on_done=complete_batch)
+
+
+def process_batch(
+    executor: ThreadPoolExecutor, message: Message[ValuesBatch[KafkaPayload]]
+) -> None:
+    """
+    Receives batches of check-in messages. This function will take the batch
+    and group them together by monitor ID (ensuring order is preserved) and
+    execute each group using a ThreadPoolWorker.
+
+    By batching we're able to process check-ins in parallel while guaranteeing
+    that no check-ins are processed out of order per monitor environment.
+    """
+    prepared = prepare_batch(message)
+
     # Submit check-in groups for processing
     with sentry_sdk.start_transaction(op="process_batch", name="monitors.monitor_consumer"):
-        futures = [
-            executor.submit(process_checkin_group, group) for group in checkin_mapping.values()
-        ]
+        futures = [executor.submit(group) for group in prepared.groups.values()]
         wait(futures)
 
-    # Update check in volume for the entire batch we've just processed
-    update_check_in_volume(item.timestamp for item in batch if item.timestamp is not None)
-
-    # Attempt to trigger monitor tasks across processed partitions
-    for partition, ts in latest_partition_ts.items():
-        try:
-            try_monitor_clock_tick(ts, partition)
-        except Exception:
-            logger.exception("Failed to trigger monitor tasks")
+    assert prepared.on_done is not None
+    prepared.on_done()
 
 
 def process_single(message: Message[KafkaPayload | FilteredPayload]) -> None:
@@ -1166,10 +1265,19 @@ class StoreMonitorCheckInStrategyFactory(ProcessingStrategyFactory[KafkaPayload]
 
     def create_parallel_worker(self, commit: Commit) -> ProcessingStrategy[KafkaPayload]:
         assert self.parallel_executor is not None
-        batch_processor = RunTask(
-            function=partial(process_batch, self.parallel_executor),
-            next_step=CommitOffsets(commit),
-        )
+        batch_processor: ProcessingStrategy[ValuesBatch[KafkaPayload]]
+        if pipelining_enabled("monitors"):
+            batch_processor = PipelinedBatchStep(
+                name="monitors",
+                executor=self.parallel_executor,
+                prepare_batch=partial(prepare_batch, pipelined=True),
+                next_step=CommitOffsets(commit),
+            )
+        else:
+            batch_processor = RunTask(
+                function=partial(process_batch, self.parallel_executor),
+                next_step=CommitOffsets(commit),
+            )
         return BatchStep(
             max_batch_size=self.max_batch_size,
             max_batch_time=self.max_batch_time,
@@ -783,8 +783,63 @@ register(
     default=30.0,
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
+# Fetch subsequent search chunks after the last sort key of the previous chunk, instead of by offset.
+register(
+    "snuba.search.keyset-pagination.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Most groups tying on the last score of a chunk to exclude from the next one by id, past this the
+# search continues by offset.
+register(
+    "snuba.search.keyset-pagination.max-seen-groups",
+    type=Int,
+    default=500,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
 register("snuba.search.hits-sample-size", default=100, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# How long to cache issue search hit counts for, 0 disables the cache.
+register(
+    "snuba.search.hits-cache-ttl-seconds",
+    type=Int,
+    default=0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
 register("snuba.track-outcomes-sample-rate", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Deduplicate concurrent identical cached Snuba queries, within and across processes.
+register(
+    "snuba.query-coalescing.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# How long a query may run before others stop waiting for it and query Snuba themselves.
+register(
+    "snuba.query-coalescing.lease-seconds",
+    type=Int,
+    default=10,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "snuba.query-coalescing.poll-interval-seconds",
+    type=Float,
+    default=0.1,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# How long stale results are kept around for referrers allowed to use them, 0 disables them.
+register(
+    "snuba.query-coalescing.stale-ttl-seconds",
+    type=Int,
+    default=0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "snuba.query-coalescing.stale-referrer-prefixes",
+    type=Sequence,
+    default=["api.dashboards."],
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
 
 # The percentage of tagkeys that we want to cache. Set to 1.0 in order to cache everything, <=0.0 to stop caching
 register(
@@ -945,6 +1000,22 @@ register(
     flags=FLAG_MODIFIABLE_BOOL | FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# Run the seen stats queries of error and generic issues as a single bulk Snuba request when
+# serializing groups.
+register(
+    "issues.group-serializer.prefetch-seen-stats",
+    default=False,
+    type=Bool,
+    flags=FLAG_MODIFIABLE_BOOL | FLAG_AUTOMATOR_MODIFIABLE,
+)
+# How long to cache per-group serializer attributes (e.g. seen stats) for, 0 disables the cache.
+register(
+    "issues.group-attrs-cache.ttl-seconds",
+    default=0,
+    type=Int,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # Killswitch for all Seer services
 #
 # TODO: So far this is only being checked when calling the Seer similar issues service during
@@ -1258,6 +1329,22 @@ register("relay.static_auth", default={}, flags=FLAG_NOSTORE)
 # Example value: [{"project_id": 42}, {"project_id": 123}]
 register("relay.drop-transaction-metrics", default=[], flags=FLAG_AUTOMATOR_MODIFIABLE)
 
+# Recompute the project configs of an organization-wide invalidation in bulk: existence checks are
+# pipelined, projects, keys and options are loaded once, and configs are computed by
+# `relay.compute-configs.bulk-workers` threads.
+register("relay.compute-configs.bulk", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register("relay.compute-configs.bulk-workers", default=4, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
+# Sections of project configs (e.g. `performanceScore`) which are stored once in the project config
+# cache and referenced by digest from every config containing them. Relays which read configs
+# directly from Redis can't decode this format, only enable it if all configs go through Sentry.
+register(
+    "relay.projectconfig-cache.shared-sections",
+    type=Sequence,
+    default=[],
+    flags=FLAG_ALLOW_EMPTY | FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # Relay should emit a usage metric to track total spans.
 register("relay.span-usage-metric", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
@@ -1316,6 +1403,30 @@ register("eventstream:kafka-headers", default=True, flags=FLAG_AUTOMATOR_MODIFIA
 # Controls the rollout of individual Kafka producers by name
 register("arroyo.producer.factory-rollout", default={}, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
+# Batched-parallel consumers (by name: "monitors", "occurrences", or the identifier of a remote
+# subscriptions result consumer such as "uptime") which start on the next batch while the groups of
+# previous batches are still being processed, instead of waiting for the whole batch.
+register(
+    "consumers.pipelined-batches.enabled",
+    type=Sequence,
+    default=[],
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# The number of batches which may be in flight at once before the consumer is paused.
+register(
+    "consumers.pipelined-batches.max-pending-batches",
+    type=Int,
+    default=3,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# The number of unfinished groups across in-flight batches before the consumer is paused.
+register(
+    "consumers.pipelined-batches.max-pending-groups",
+    type=Int,
+    default=2000,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # Post process forwarder options
 # Gets data from Kafka headers
 register(
@@ -2178,6 +2289,47 @@ register(
     default=True,
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
+# Write nodes in the indexed format, which allows reading a subkey without decoding the others.
+# Both formats are always readable.
+register(
+    "nodestore.indexed-format.write",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# zstd level for compressing each subkey of indexed nodes, 0 disables per-subkey compression.
+register(
+    "nodestore.indexed-format.zstd-level",
+    type=Int,
+    default=0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Process-local LRU of raw node bytes in front of the `nodedata` cache.
+register(
+    "nodestore.local-cache.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "nodestore.local-cache.max-bytes",
+    type=Int,
+    default=64 * 1024 * 1024,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "nodestore.local-cache.ttl-seconds",
+    type=Float,
+    default=30.0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Write all events of a batch to nodestore with a single bulk write instead of one write per event.
+register(
+    "nodestore.save-many.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
 
 # === Backpressure related runtime options ===
 
@@ -2302,6 +2454,15 @@ register(
     flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# Load the monitors of a whole batch of check-ins with a single query in the
+# monitor consumer, instead of once per check-in.
+register(
+    "crons.consumer.preload-monitors",
+    type=Bool,
+    default=False,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 
 # Sets the timeout for webhooks
 register(
@@ -2594,6 +2755,13 @@ register(
     default=0.0,
     flags=FLAG_AUTOMATOR_MODIFIABLE | FLAG_MODIFIABLE_RATE,
 )
+# TTL in seconds of the specs converted from widget and alert queries when computing project
+# configs. 0 disables the cache.
+register(
+    "on_demand_metrics.derived_specs_cache.ttl",
+    default=0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
 
 # Relocation: whether or not the self-serve API for the feature is enabled. When set on a region
 # silo, this flag controls whether or not that region's API will serve relocation requests to
@@ -2879,6 +3047,50 @@ register(
     default=-1,
     flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
 )
+# Pipelines span payloads and the buffer script into a single round trip, and sizes flush
+# batches based on observed segment sizes and Redis memory usage.
+register(
+    "spans.buffer.adaptive-mode",
+    type=Bool,
+    default=False,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Approximate number of segment bytes to load per flush cycle in adaptive mode.
+register(
+    "spans.buffer.adaptive-flush.max-bytes",
+    type=Int,
+    default=64 * 1024 * 1024,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Upper bound for adaptive flush batch and page sizes, as a multiple of the static options.
+register(
+    "spans.buffer.adaptive-flush.max-scale",
+    type=Int,
+    default=4,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Redis memory usage ratio above which the adaptive flusher drains the buffer more aggressively.
+register(
+    "spans.buffer.adaptive-flush.memory-pressure-ratio",
+    type=Float,
+    default=0.7,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Number of seconds between Redis memory usage checks in adaptive mode.
+register(
+    "spans.buffer.adaptive-flush.memory-check-interval",
+    type=Int,
+    default=10,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Assemble flushed segments from serialized spans instead of parsing and re-serializing every span.
+register(
+    "spans.buffer.flush-raw-payloads",
+    type=Bool,
+    default=False,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
 
 # Segments consumer
 register(
@@ -3101,6 +3313,14 @@ register(
     default=False,
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
+# Share event frequency query results between delayed rule and workflow processing for this many
+# seconds. 0 disables sharing.
+register(
+    "delayed_processing.shared_frequency_queries.ttl_seconds",
+    type=Int,
+    default=0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
 register(
     "delayed_workflow.use_workflow_engine_pool",
     type=Bool,
@@ -3131,6 +3351,25 @@ register(
     default=0.0,
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
+# In-process cache of grouphash -> group lookups used during ingest
+register(
+    "grouping.grouphash_cache.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "grouping.grouphash_cache.max_size",
+    type=Int,
+    default=10_000,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "grouping.grouphash_cache.ttl_seconds",
+    type=Int,
+    default=60,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
 
 register(
     "workflow_engine.issue_alert.group.type_id.rollout",
@@ -3268,6 +3507,14 @@ register(
     default=False,
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
+# Serve the occurrence consumer rate limit from quota leased in process memory, instead of asking
+# Redis for every occurrence.
+register(
+    "issues.occurrence-consumer.rate-limit.leased",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
 register(
     "eventstore.adjacent_event_ids_use_snql",
     type=Bool,
@@ -3481,6 +3728,15 @@ register(
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# Whether boost_low_volume_transactions fetches the next page of its queries in the background
+# while the current pages are being processed.
+register(
+    "dynamic-sampling.boost_low_volume_transactions.prefetch-pages",
+    type=Bool,
+    default=False,
+    flags=FLAG_MODIFIABLE_BOOL | FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # Controls whether the async task fetches AI model prices from
 # external sources and stores them in cache.
 register(
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import threading
+import time
 from collections.abc import Sequence
-from typing import Any
+from dataclasses import dataclass
+from typing import Any, cast
 
 from sentry_redis_tools.clients import RedisCluster, StrictRedis
 from sentry_redis_tools.sliding_windows_rate_limiter import GrantedQuota, Quota
@@ -158,3 +161,171 @@ class RedisSlidingWindowRateLimiter(SlidingWindowRateLimiter):
         timestamp: Timestamp,
     ) -> None:
         return self.impl.use_quotas(requests, grants, timestamp)
+
+
+@dataclass
+class _Lease:
+    size: int
+    remaining: int
+    acquired_at: Timestamp
+    expires_at: Timestamp
+
+    def is_active(self, timestamp: Timestamp) -> bool:
+        return self.acquired_at <= timestamp < self.expires_at
+
+
+class LeasedSlidingWindowRateLimiter(RedisSlidingWindowRateLimiter):
+    """
+    A `RedisSlidingWindowRateLimiter` which consumes quota from Redis in
+    leases, and hands it out from process-local memory until the lease is used
+    up or expires. Most calls to `check_and_use_quotas` for busy prefixes
+    therefore don't need a Redis round trip. `check_within_quotas` and
+    `use_quotas` are not leased.
+
+    This trades accuracy for latency:
+
+    * A prefix's first lease is a single unit. Later leases cover what is
+      expected to be used until they expire, going by the rate at which the
+      previous lease was used, up to `lease_fraction` of the smallest limit of
+      a request. Rarely used prefixes therefore go to Redis on most calls,
+      rather than losing quota to leases which expire unused.
+    * Leased quota counts as used in Redis right away, so with N processes up
+      to N leases per prefix can be reserved without being used, and requests
+      may be rejected slightly early. Quota is never over-spent by leasing.
+    * A lease expires at the end of the granule it was acquired in, so that
+      usage is never attributed to an older granule than the one it happened
+      in, or after `lease_seconds` if that is set.
+    """
+
+    def __init__(self, **options: Any) -> None:
+        self.lease_fraction: float = options.get("lease_fraction", 0.01)
+        self.lease_seconds: int | None = options.get("lease_seconds")
+        self.max_leases: int = options.get("max_leases", 10_000)
+        self._leases: dict[tuple[str, tuple[Quota, ...]], _Lease] = {}
+        self._lock = threading.Lock()
+        super().__init__(**options)
+
+    def _get_lease_size(
+        self, quotas: Sequence[Quota], previous: _Lease | None, timestamp: Timestamp
+    ) -> int:
+        min_limit = min(quota.limit for quota in quotas)
+        if min_limit <= 0:
+            return 0
+
+        size = 1
+        if previous is not None:
+            # Lease as much as is expected to be used until the new lease expires, going by the
+            # rate at which the previous lease was used.
+            used = previous.size - previous.remaining
+            elapsed = max(1, min(timestamp, previous.expires_at) - previous.acquired_at)
+            size = used * (self._get_lease_expiry(quotas, timestamp) - timestamp) // elapsed
+
+        return max(1, min(size, int(min_limit * self.lease_fraction)))
+
+    def _get_lease_expiry(self, quotas: Sequence[Quota], timestamp: Timestamp) -> Timestamp:
+        granularity = min(quota.granularity_seconds for quota in quotas)
+        expires_at = (timestamp // granularity + 1) * granularity
+        if self.lease_seconds is not None:
+            expires_at = min(expires_at, timestamp + self.lease_seconds)
+        return expires_at
+
+    def check_and_use_quotas(
+        self, requests: Sequence[RequestedQuota], timestamp: Timestamp | None = None
+    ) -> Sequence[GrantedQuota]:
+        if timestamp is None:
+            timestamp = int(time.time())
+
+        grants: list[GrantedQuota | None] = [None] * len(requests)
+        # (index into `requests`, quota left over from an exhausted lease, request to Redis)
+        lease_requests: list[tuple[int, int, RequestedQuota]] = []
+
+        with self._lock:
+            for i, request in enumerate(requests):
+                if not request.quotas:
+                    lease_requests.append((i, 0, request))
+                    continue
+
+                lease = self._leases.get((request.prefix, tuple(request.quotas)))
+                remaining = 0
+                if lease is not None and lease.is_active(timestamp):
+                    remaining = lease.remaining
+
+                if remaining >= request.requested:
+                    assert lease is not None
+                    lease.remaining = remaining - request.requested
+                    grants[i] = GrantedQuota(
+                        prefix=request.prefix, granted=request.requested, reached_quotas=[]
+                    )
+                    continue
+
+                requested = max(
+                    request.requested - remaining,
+                    self._get_lease_size(request.quotas, lease, timestamp),
+                )
+                if lease is not None:
+                    # The rest of the lease is handed out with the new one.
+                    lease.remaining = 0
+                lease_requests.append(
+                    (
+                        i,
+                        remaining,
+                        RequestedQuota(
+                            prefix=request.prefix, requested=requested, quotas=request.quotas
+                        ),
+                    )
+                )
+
+        if lease_requests:
+            redis_requests = [redis_request for _, _, redis_request in lease_requests]
+            redis_timestamp, redis_grants = self.check_within_quotas(redis_requests, timestamp)
+            self.use_quotas(redis_requests, redis_grants, redis_timestamp)
+
+            with self._lock:
+                for (i, remaining, redis_request), redis_grant in zip(lease_requests, redis_grants):
+                    request = requests[i]
+                    available = remaining + redis_grant.granted
+                    granted = min(request.requested, available)
+                    grants[i] = GrantedQuota(
+                        prefix=request.prefix,
+                        granted=granted,
+                        reached_quotas=(
+                            redis_grant.reached_quotas if granted < request.requested else []
+                        ),
+                    )
+
+                    if request.quotas:
+                        self._store_lease(
+                            redis_request,
+                            redis_grant.granted,
+                            available - granted,
+                            redis_timestamp,
+                        )
+
+        assert all(grant is not None for grant in grants)
+        return cast(list[GrantedQuota], grants)
+
+    def _store_lease(
+        self, request: RequestedQuota, size: int, remaining: int, timestamp: Timestamp
+    ) -> None:
+        key = (request.prefix, tuple(request.quotas))
+        lease = self._leases.get(key)
+        if lease is not None and lease.remaining and lease.is_active(timestamp):
+            # Another thread leased concurrently, keep both leases' quota.
+            lease.size += size
+            lease.remaining += remaining
+            return
+
+        if key not in self._leases and len(self._leases) >= self.max_leases:
+            self._leases = {
+                key: lease for key, lease in self._leases.items() if lease.expires_at > timestamp
+            }
+            if len(self._leases) >= self.max_leases:
+                self._leases.clear()
+
+        # Exhausted leases are kept as well, to size the next one.
+        self._leases[key] = _Lease(
+            size=size,
+            remaining=remaining,
+            acquired_at=timestamp,
+            expires_at=self._get_lease_expiry(request.quotas, timestamp),
+        )
@@ -1,7 +1,7 @@
 import logging
 import random
 from collections import defaultdict
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
 from datetime import timedelta
 from typing import Any, Literal, NotRequired, TypedDict
@@ -45,6 +45,7 @@ from sentry.snuba.metrics.extraction import (
     SpecVersion,
     TagMapping,
     TagSpec,
+    _get_satisfactory_metric,
     are_specs_equal,
     should_use_on_demand_metrics,
 )
@@ -52,6 +53,7 @@ from sentry.snuba.models import SnubaQuery
 from sentry.snuba.referrer import Referrer
 from sentry.utils import json, metrics
 from sentry.utils.cache import cache
+from sentry.utils.hashlib import md5_text
 
 OnDemandExtractionState = DashboardWidgetQueryOnDemand.OnDemandExtractionState
 
@@ -66,6 +68,9 @@ _METRIC_EXTRACTION_VERSION = 4
 _WIDGET_QUERY_CARDINALITY_TTL = 3600 * 24  # 24h
 _WIDGET_QUERY_CARDINALITY_SOFT_DEADLINE_TTL = 3600 * 0.5  # 30m
 
+# Bump whenever the conversion of queries to specs changes, so that cached specs are not reused.
+_DERIVED_SPECS_CACHE_VERSION = 1
+
 HashedMetricSpec = tuple[str, MetricSpec, SpecVersion]
 
 
@@ -129,13 +134,17 @@ def get_on_demand_metric_specs(
     timeout.check()
 
     prefilling = "organizations:on-demand-metrics-prefill" in enabled_features
+    derived_specs = DerivedSpecsCache(project, prefilling)
 
     with sentry_sdk.start_span(op="get_alert_metric_specs"):
-        alert_specs = _get_alert_metric_specs(project, enabled_features, prefilling)
+        alert_specs = _get_alert_metric_specs(project, enabled_features, prefilling, derived_specs)
     timeout.check()
     with sentry_sdk.start_span(op="get_widget_metric_specs"):
-        widget_specs = _get_widget_metric_specs(project, enabled_features, prefilling)
+        widget_specs = _get_widget_metric_specs(
+            project, enabled_features, prefilling, derived_specs
+        )
     timeout.check()
+    derived_specs.flush()
 
     return (alert_specs, widget_specs)
 
@@ -157,7 +166,10 @@ def on_demand_metrics_feature_flags(organization: Organization) -> set[str]:
 
 
 def get_all_alert_metric_specs(
-    project: Project, enabled_features: set[str], prefilling: bool
+    project: Project,
+    enabled_features: set[str],
+    prefilling: bool,
+    derived_specs: "DerivedSpecsCache | None" = None,
 ) -> list[HashedMetricSpec]:
     if not ("organizations:on-demand-metrics-extraction" in enabled_features or prefilling):
         return []
@@ -178,9 +190,15 @@ def get_all_alert_metric_specs(
             status=AlertRuleStatus.PENDING.value,
             snuba_query__dataset__in=datasets,
         )
-        .select_related("snuba_query")
+        .select_related("snuba_query", "snuba_query__environment")
     )
 
+    if derived_specs is not None:
+        derived_specs.prefetch(
+            derived_specs.key(*_snuba_query_conversion_args(alert.snuba_query))
+            for alert in alert_rules
+        )
+
     specs = []
     with metrics.timer("on_demand_metrics.alert_spec_convert"):
         for alert in alert_rules:
@@ -190,7 +208,9 @@ def get_all_alert_metric_specs(
                 tags={"prefilling": prefilling, "dataset": alert_snuba_query.dataset},
             )
 
-            if results := _convert_snuba_query_to_metrics(project, alert_snuba_query, prefilling):
+            if results := _convert_snuba_query_to_metrics(
+                project, alert_snuba_query, prefilling, derived_specs
+            ):
                 for spec in results:
                     metrics.incr(
                         "on_demand_metrics.on_demand_spec.for_alert",
@@ -211,9 +231,12 @@ def get_default_version_alert_metric_specs(
 
 @metrics.wraps("on_demand_metrics._get_alert_metric_specs")
 def _get_alert_metric_specs(
-    project: Project, enabled_features: set[str], prefilling: bool
+    project: Project,
+    enabled_features: set[str],
+    prefilling: bool,
+    derived_specs: "DerivedSpecsCache | None" = None,
 ) -> list[HashedMetricSpec]:
-    specs = get_all_alert_metric_specs(project, enabled_features, prefilling)
+    specs = get_all_alert_metric_specs(project, enabled_features, prefilling, derived_specs)
 
     max_alert_specs = options.get("on_demand.max_alert_specs")
     (specs, _) = _trim_if_above_limit(specs, max_alert_specs, project, "alerts")
@@ -221,6 +244,98 @@ def _get_alert_metric_specs(
     return specs
 
 
+class DerivedSpecsCache:
+    """
+    Caches the specs converted from widget and alert queries, so that computing a project config
+    only needs to convert queries which have been created or changed since.
+
+    Entries are keyed by everything the conversion depends on (the query itself, the project and
+    its satisfactory metric, prefilling and the spec versions). Changing a widget query or alert
+    results in a different key, so entries never need to be invalidated and simply expire.
+    """
+
+    def __init__(self, project: Project, prefilling: bool) -> None:
+        self.project = project
+        self.prefilling = prefilling
+        self.ttl = options.get("on_demand_metrics.derived_specs_cache.ttl")
+        self._satisfactory_metric: str | None = None
+        self._entries: dict[str, list[HashedMetricSpec]] = {}
+        self._computed: dict[str, list[HashedMetricSpec]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def key(
+        self,
+        dataset: str,
+        aggregate: str,
+        query: str,
+        environment: str | None,
+        spec_type: MetricSpecType,
+        groupbys: Sequence[str] | None,
+    ) -> str:
+        if self._satisfactory_metric is None:
+            # Only used by apdex and user misery, but cheap since it is cached per project.
+            self._satisfactory_metric = _get_satisfactory_metric(self.project)
+
+        spec_versions = [
+            (spec_version.version, sorted(spec_version.flags))
+            for spec_version in OnDemandMetricSpecVersioning.get_spec_versions()
+        ]
+        inputs = json.dumps(
+            [
+                self.project.id,
+                self._satisfactory_metric,
+                self.prefilling,
+                spec_versions,
+                dataset,
+                aggregate,
+                query,
+                environment,
+                spec_type.value,
+                list(groupbys) if groupbys is not None else None,
+            ]
+        )
+        return (
+            f"on-demand.derived-specs.{_DERIVED_SPECS_CACHE_VERSION}."
+            f"{md5_text(inputs).hexdigest()}"
+        )
+
+    def prefetch(self, keys: Iterable[str]) -> None:
+        """Load the cached specs of all given keys at once."""
+        if not self.enabled:
+            return
+
+        missing = {key for key in keys if key not in self._entries}
+        if not missing:
+            return
+
+        self._entries.update(cache.get_many(missing))
+        metrics.incr("on_demand_metrics.derived_specs_cache.prefetched", amount=len(missing))
+
+    def get(self, key: str) -> list[HashedMetricSpec] | None:
+        if key not in self._entries:
+            return None
+
+        metrics.incr("on_demand_metrics.derived_specs_cache.hit")
+        return self._entries[key]
+
+    def set(self, key: str, specs: Sequence[HashedMetricSpec]) -> None:
+        if not self.enabled:
+            return
+
+        self._entries[key] = self._computed[key] = list(specs)
+        metrics.incr("on_demand_metrics.derived_specs_cache.miss")
+
+    def flush(self) -> None:
+        """Store all specs which have been computed since this cache was created."""
+        if self._computed:
+            # Jitter the TTL, so that the specs of an organization don't all expire at once.
+            cache.set_many(self._computed, timeout=self.ttl + random.randint(0, self.ttl // 10))
+            self._computed = {}
+
+
 def _bulk_cache_query_key(project: Project, chunk: int) -> str:
     return f"on-demand.bulk-query-cache.{chunk}.{project.organization.id}"
 
@@ -258,7 +373,10 @@ def _set_bulk_cached_query(
 
 @metrics.wraps("on_demand_metrics._get_widget_metric_specs")
 def _get_widget_metric_specs(
-    project: Project, enabled_features: set[str], prefilling: bool
+    project: Project,
+    enabled_features: set[str],
+    prefilling: bool,
+    derived_specs: DerivedSpecsCache | None = None,
 ) -> list[HashedMetricSpec]:
     if "organizations:on-demand-metrics-extraction-widgets" not in enabled_features:
         metrics.incr("on_demand_metrics.get_widget_metric_specs.extraction_feature_disabled")
@@ -288,6 +406,13 @@ def _get_widget_metric_specs(
 
     organization_bulk_query_cache, cold_bulk_cache_chunks = _get_bulk_cached_query(project)
 
+    if derived_specs is not None:
+        derived_specs.prefetch(
+            derived_specs.key(*_widget_query_conversion_args(aggregate, widget_query))
+            for widget_query in widget_queries
+            for aggregate in widget_query.aggregates or ()
+        )
+
     ignored_widget_ids: dict[int, bool] = {}
     specs_for_widget: dict[int, list[HashedMetricSpec]] = defaultdict(list)
     widget_query_for_spec_hash: dict[str, DashboardWidgetQuery] = {}
@@ -298,7 +423,7 @@ def _get_widget_metric_specs(
     with metrics.timer("on_demand_metrics.widget_spec_convert"):
         for widget_query in widget_queries:
             widget_specs = convert_widget_query_to_metric(
-                project, widget_query, prefilling, organization_bulk_query_cache
+                project, widget_query, prefilling, organization_bulk_query_cache, derived_specs
             )
 
             if not widget_specs:
@@ -454,21 +579,60 @@ def _merge_metric_specs(
     return list(specs.values())
 
 
+def _snuba_query_conversion_args(
+    snuba_query: SnubaQuery,
+) -> tuple[str, str, str, str | None, MetricSpecType, Sequence[str] | None]:
+    """The arguments identifying the conversion of an alert's query, see `DerivedSpecsCache.key`."""
+    environment = snuba_query.environment.name if snuba_query.environment is not None else None
+    return (
+        snuba_query.dataset,
+        snuba_query.aggregate,
+        snuba_query.query,
+        environment,
+        MetricSpecType.SIMPLE_QUERY,
+        None,
+    )
+
+
+def _widget_query_conversion_args(
+    aggregate: str, widget_query: DashboardWidgetQuery
+) -> tuple[str, str, str, str | None, MetricSpecType, Sequence[str] | None]:
+    """The arguments identifying the conversion of a widget query, see `DerivedSpecsCache.key`."""
+    # there is an internal check to make sure we extract metrics only for performance dataset
+    # however widgets do not have a dataset field, so we need to pass it explicitly
+    return (
+        Dataset.PerformanceMetrics.value,
+        aggregate,
+        widget_query.conditions,
+        None,
+        MetricSpecType.DYNAMIC_QUERY,
+        widget_query.columns,
+    )
+
+
 def _convert_snuba_query_to_metrics(
-    project: Project, snuba_query: SnubaQuery, prefilling: bool
+    project: Project,
+    snuba_query: SnubaQuery,
+    prefilling: bool,
+    derived_specs: DerivedSpecsCache | None = None,
 ) -> Sequence[HashedMetricSpec] | None:
     """
     If the passed snuba_query is a valid query for on-demand metric extraction,
     returns a tuple of (hash, MetricSpec) for the query. Otherwise, returns None.
     """
-    environment = snuba_query.environment.name if snuba_query.environment is not None else None
+    dataset, aggregate, query, environment, spec_type, groupbys = _snuba_query_conversion_args(
+        snuba_query
+    )
     return _convert_aggregate_and_query_to_metrics(
         project,
-        snuba_query.dataset,
-        snuba_query.aggregate,
-        snuba_query.query,
+        dataset,
+        aggregate,
+        query,
         environment,
         prefilling,
+        spec_type=spec_type,
+        groupbys=groupbys,
+        derived_specs=derived_specs,
     )
 
 
@@ -477,6 +641,7 @@ def convert_widget_query_to_metric(
     widget_query: DashboardWidgetQuery,
     prefilling: bool,
     organization_bulk_query_cache: dict[int, dict[str, bool]] | None = None,
+    derived_specs: DerivedSpecsCache | None = None,
 ) -> list[HashedMetricSpec]:
     """
     Converts a passed metrics widget query to one or more MetricSpecs.
@@ -492,7 +657,13 @@ def convert_widget_query_to_metric(
 
     for aggregate in aggregates:
         metrics_specs += _generate_metric_specs(
-            aggregate, widget_query, project, prefilling, groupbys, organization_bulk_query_cache
+            aggregate,
+            widget_query,
+            project,
+            prefilling,
+            groupbys,
+            organization_bulk_query_cache,
+            derived_specs,
         )
 
     return metrics_specs
@@ -505,21 +676,24 @@ def _generate_metric_specs(
     prefilling: bool,
     groupbys: Sequence[str] | None = None,
     organization_bulk_query_cache: dict[int, dict[str, bool]] | None = None,
+    derived_specs: DerivedSpecsCache | None = None,
 ) -> list[HashedMetricSpec]:
     metrics_specs = []
     metrics.incr("on_demand_metrics.before_widget_spec_generation")
+    dataset, aggregate, query, environment, spec_type, _ = _widget_query_conversion_args(
+        aggregate, widget_query
+    )
     if results := _convert_aggregate_and_query_to_metrics(
         project,
-        # there is an internal check to make sure we extract metrics only for performance dataset
-        # however widgets do not have a dataset field, so we need to pass it explicitly
-        Dataset.PerformanceMetrics.value,
+        dataset,
         aggregate,
-        widget_query.conditions,
-        None,
+        query,
+        environment,
         prefilling,
         groupbys=groupbys,
-        spec_type=MetricSpecType.DYNAMIC_QUERY,
+        spec_type=spec_type,
         organization_bulk_query_cache=organization_bulk_query_cache,
+        derived_specs=derived_specs,
     ):
         for spec in results:
             metrics.incr(
@@ -756,6 +930,7 @@ def _convert_aggregate_and_query_to_metrics(
     spec_type: MetricSpecType = MetricSpecType.SIMPLE_QUERY,
     groupbys: Sequence[str] | None = None,
     organization_bulk_query_cache: dict[int, dict[str, bool]] | None = None,
+    derived_specs: DerivedSpecsCache | None = None,
 ) -> Sequence[HashedMetricSpec] | None:
     """
     Converts an aggregate and a query to a metric spec with its hash value.
@@ -763,6 +938,51 @@ def _convert_aggregate_and_query_to_metrics(
     Extra metric specs will be returned if we need to maintain various versions of it.
     This makes it easier to maintain multiple spec versions when a mistake is made.
     """
+    if derived_specs is None or not derived_specs.enabled:
+        return _convert_aggregate_and_query_to_metrics_uncached(
+            project,
+            dataset,
+            aggregate,
+            query,
+            environment,
+            prefilling,
+            spec_type,
+            groupbys,
+            organization_bulk_query_cache,
+        )
+
+    key = derived_specs.key(dataset, aggregate, query, environment, spec_type, groupbys)
+    cached = derived_specs.get(key)
+    if cached is not None:
+        return cached
+
+    specs = _convert_aggregate_and_query_to_metrics_uncached(
+        project,
+        dataset,
+        aggregate,
+        query,
+        environment,
+        prefilling,
+        spec_type,
+        groupbys,
+        organization_bulk_query_cache,
+    )
+    # Queries which don't need on-demand extraction are cached as well.
+    derived_specs.set(key, specs or [])
+    return specs
+
+
+def _convert_aggregate_and_query_to_metrics_uncached(
+    project: Project,
+    dataset: str,
+    aggregate: str,
+    query: str,
+    environment: str | None,
+    prefilling: bool,
+    spec_type: MetricSpecType,
+    groupbys: Sequence[str] | None,
+    organization_bulk_query_cache: dict[int, dict[str, bool]] | None,
+) -> Sequence[HashedMetricSpec] | None:
 
     # We can avoid injection of the environment in the query, since it's supported by standard, thus it won't change
     # the supported state of a query, since if it's standard, and we added environment it will still be standard
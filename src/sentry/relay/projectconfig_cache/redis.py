@@ -1,9 +1,13 @@
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
 from collections.abc import Mapping
 from typing import Any
 
 import zstandard
 
+from sentry import options
 from sentry.relay.projectconfig_cache.base import ProjectConfigCache
 from sentry.utils import json, metrics, redis
 from sentry.utils.redis import validate_dynamic_cluster
@@ -11,9 +15,43 @@ from sentry.utils.redis import validate_dynamic_cluster
 REDIS_CACHE_TIMEOUT = 8400  # 2 hr, 20 minutes
 COMPRESSION_LEVEL = 3  # 3 is the default level of compression
 
+# Configs stored with shared sections start with this prefix, followed by the compressed config.
+# The sections themselves are replaced by their digest under `SHARED_SECTIONS_KEY`.
+SHARED_FORMAT_PREFIX = b"shared-v1:"
+SHARED_SECTIONS_KEY = "_sharedSections"
+# Below this size a section is cheaper to store inline than as a reference.
+MIN_SHARED_SECTION_SIZE = 1024
+# Sections are immutable (content addressed), so they can be kept in memory without invalidation.
+MAX_LOCAL_SECTIONS = 256
+
 logger = logging.getLogger(__name__)
 
 
+class _LocalSections:
+    """
+    A small LRU of shared sections by digest, so that the same sections aren't compressed or
+    fetched and decompressed over and over again.
+    """
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest: str) -> bytes | None:
+        with self._lock:
+            value = self._entries.get(digest)
+            if value is not None:
+                self._entries.move_to_end(digest)
+            return value
+
+    def set(self, digest: str, value: bytes) -> None:
+        with self._lock:
+            self._entries[digest] = value
+            self._entries.move_to_end(digest)
+            while len(self._entries) > MAX_LOCAL_SECTIONS:
+                self._entries.popitem(last=False)
+
+
 class RedisProjectConfigCache(ProjectConfigCache):
     def __init__(self, **options):
         cluster_key = options.get("cluster", "default")
@@ -22,6 +60,10 @@ class RedisProjectConfigCache(ProjectConfigCache):
         read_cluster_key = options.get("read_cluster", cluster_key)
         self.cluster_read = redis.redis_clusters.get_binary(read_cluster_key)
 
+        # Compressed sections for writing, and uncompressed ones for reading.
+        self.__compressed_sections = _LocalSections()
+        self.__sections = _LocalSections()
+
         super().__init__(**options)
 
     def validate(self):
@@ -33,14 +75,106 @@ class RedisProjectConfigCache(ProjectConfigCache):
     def __get_redis_rev_key(self, public_key) -> str:
         return f"{self.__get_redis_key(public_key)}.rev"
 
+    def __get_redis_section_key(self, digest: str) -> str:
+        return f"relayconfig-section:{digest}"
+
+    def __split_shared_sections(
+        self, config: Mapping[str, Any], section_names: list[str]
+    ) -> tuple[Mapping[str, Any], dict[str, bytes]]:
+        """
+        Moves the given sections of the config out into separate, content addressed values.
+        Returns the remaining config and the serialized sections by digest.
+        """
+        inner = config.get("config")
+        if not isinstance(inner, Mapping):
+            return config, {}
+
+        remaining = dict(inner)
+        references = {}
+        sections = {}
+        for name in section_names:
+            if name not in remaining:
+                continue
+            serialized = json.dumps(remaining[name]).encode()
+            if len(serialized) < MIN_SHARED_SECTION_SIZE:
+                continue
+
+            digest = hashlib.sha1(serialized).hexdigest()
+            references[name] = digest
+            sections[digest] = serialized
+            del remaining[name]
+
+        if not references:
+            return config, {}
+
+        return {**config, "config": remaining, SHARED_SECTIONS_KEY: references}, sections
+
+    def __compress_section(self, digest: str, serialized: bytes) -> bytes:
+        compressed = self.__compressed_sections.get(digest)
+        if compressed is None:
+            compressed = zstandard.compress(serialized, level=COMPRESSION_LEVEL)
+            self.__compressed_sections.set(digest, compressed)
+            metrics.distribution(
+                "relay.projectconfig_cache.shared_section.size", len(compressed), unit="byte"
+            )
+        return compressed
+
+    def __load_shared_sections(self, config: dict[str, Any]) -> dict[str, Any] | None:
+        references: dict[str, str] = config.pop(SHARED_SECTIONS_KEY)
+
+        sections = {digest: self.__sections.get(digest) for digest in set(references.values())}
+        missing = [digest for digest, section in sections.items() if section is None]
+        if missing:
+            p = self.cluster_read.pipeline(transaction=False)
+            for digest in missing:
+                p.get(self.__get_redis_section_key(digest))
+            for digest, compressed in zip(missing, p.execute()):
+                if compressed is None:
+                    # The section expired before the config referencing it, treat the config as
+                    # missing so that it gets recomputed.
+                    metrics.incr("relay.projectconfig_cache.shared_section.missing")
+                    return None
+                sections[digest] = section = zstandard.decompress(compressed)
+                self.__sections.set(digest, section)
+
+        for name, digest in references.items():
+            section = sections[digest]
+            assert section is not None
+            config["config"][name] = json.loads(section.decode())
+        return config
+
     def set_many(self, configs: dict[str, Mapping[str, Any]]):
         metrics.incr("relay.projectconfig_cache.write", amount=len(configs), tags={"action": "set"})
 
+        # Sections which are identical across many keys (e.g. performance score profiles) can be
+        # stored once and referenced from each config. Relays which read configs directly from
+        # Redis don't understand this format, so this must only be enabled if all configs are
+        # fetched through Sentry.
+        section_names = options.get("relay.projectconfig-cache.shared-sections")
+        written_sections: set[str] = set()
+
         # Note: Those are multiple pipelines, one per cluster node.
         p = self.cluster.pipeline(transaction=False)
         for public_key, config in configs.items():
+            prefix = b""
+            if section_names:
+                config, sections = self.__split_shared_sections(config, section_names)
+                if sections:
+                    prefix = SHARED_FORMAT_PREFIX
+                for digest, section in sections.items():
+                    if digest in written_sections:
+                        continue
+                    written_sections.add(digest)
+                    # Always (re-)written with a fresh TTL, so that sections never expire before
+                    # the configs referencing them.
+                    p.setex(
+                        self.__get_redis_section_key(digest),
+                        REDIS_CACHE_TIMEOUT,
+                        self.__compress_section(digest, section),
+                    )
+
             serialized = json.dumps(config).encode()
-            compressed = zstandard.compress(serialized, level=COMPRESSION_LEVEL)
+            compressed = prefix + zstandard.compress(serialized, level=COMPRESSION_LEVEL)
             metrics.distribution(
                 "relay.projectconfig_cache.uncompressed_size", len(serialized), unit="byte"
             )
@@ -75,6 +209,9 @@ class RedisProjectConfigCache(ProjectConfigCache):
 
     def get(self, public_key):
         rv_b = self.cluster_read.get(self.__get_redis_key(public_key))
+        if rv_b is not None and rv_b.startswith(SHARED_FORMAT_PREFIX):
+            rv = zstandard.decompress(rv_b[len(SHARED_FORMAT_PREFIX) :]).decode()
+            return self.__load_shared_sections(json.loads(rv))
         if rv_b is not None:
             try:
                 rv = zstandard.decompress(rv_b).decode()
@@ -84,6 +221,14 @@ class RedisProjectConfigCache(ProjectConfigCache):
             return json.loads(rv)
         return None
 
+    def exists_many(self, public_keys) -> set[str]:
+        # Unlike `get`, this doesn't need to transfer and decode the configs.
+        public_keys = list(public_keys)
+        p = self.cluster_read.pipeline(transaction=False)
+        for public_key in public_keys:
+            p.exists(self.__get_redis_key(public_key))
+        return {public_key for public_key, exists in zip(public_keys, p.execute()) if exists}
+
     def get_rev(self, public_key) -> str | None:
         if value := self.cluster_read.get(self.__get_redis_rev_key(public_key)):
             return value.decode()
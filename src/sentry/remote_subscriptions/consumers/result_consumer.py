@@ -19,6 +19,7 @@ from arroyo.processing.strategies.run_task import RunTask
 from arroyo.types import BrokerValue, Commit, FilteredPayload, Message, Partition
 
 from sentry.conf.types.kafka_definition import Topic, get_topic_codec
+from sentry.consumers.pipelined_batches import PipelinedBatchStep, PreparedBatch, pipelining_enabled
 from sentry.locks import locks
 from sentry.remote_subscriptions.models import BaseRemoteSubscription
 from sentry.utils import metrics
@@ -229,20 +230,31 @@ class ResultsStrategyFactory(ProcessingStrategyFactory[KafkaPayload], Generic[T,
 
     def create_thread_parallel_worker(self, commit: Commit) -> ProcessingStrategy[KafkaPayload]:
         assert self.parallel_executor is not None
-        batch_processor = RunTask(
-            function=self.process_batch,
-            next_step=CommitOffsets(commit),
-        )
+        batch_processor: ProcessingStrategy[ValuesBatch[KafkaPayload]]
+        if pipelining_enabled(self.identifier):
+            batch_processor = PipelinedBatchStep(
+                name=self.identifier,
+                executor=self.parallel_executor,
+                prepare_batch=self.prepare_batch,
+                next_step=CommitOffsets(commit),
+            )
+        else:
+            batch_processor = RunTask(
+                function=self.process_batch,
+                next_step=CommitOffsets(commit),
+            )
         return BatchStep(
             max_batch_size=self.max_batch_size,
             max_batch_time=self.max_batch_time,
             next_step=batch_processor,
         )
 
-    def partition_message_batch(self, message: Message[ValuesBatch[KafkaPayload]]) -> list[list[T]]:
+    def partition_message_batch(
+        self, message: Message[ValuesBatch[KafkaPayload]]
+    ) -> Mapping[str, list[T]]:
         """
         Takes a batch of messages and partitions them based on the `build_payload_grouping_key` method.
-        Returns a generator that yields each partitioned list of messages.
+        Returns the partitioned lists of messages, keyed by their grouping key.
         """
         batch = message.payload
 
@@ -270,7 +282,19 @@ class ResultsStrategyFactory(ProcessingStrategyFactory[KafkaPayload], Generic[T,
             tags={"identifier": self.identifier, "mode": self.mode},
         )
 
-        return list(batch_mapping.values())
+        return batch_mapping
+
+    def prepare_batch(self, message: Message[ValuesBatch[KafkaPayload]]) -> PreparedBatch:
+        """
+        Used in pipelined batched-parallel mode, where the groups of a batch are run by
+        `PipelinedBatchStep` rather than waited on here.
+        """
+        return PreparedBatch(
+            groups={
+                key: partial(self.process_group, group)
+                for key, group in self.partition_message_batch(message).items()
+            }
+        )
 
     def process_batch(self, message: Message[ValuesBatch[KafkaPayload]]):
         """
@@ -290,7 +314,7 @@ class ResultsStrategyFactory(ProcessingStrategyFactory[KafkaPayload], Generic[T,
         ):
             futures = [
                 self.parallel_executor.submit(self.process_group, group)
-                for group in partitioned_values
+                for group in partitioned_values.values()
             ]
             wait(futures)
 
@@ -4,7 +4,7 @@ import abc
 import contextlib
 import logging
 from collections import defaultdict
-from collections.abc import Callable, Mapping
+from collections.abc import Callable, Mapping, Sequence
 from datetime import datetime, timedelta
 from typing import Any, Literal, NotRequired, TypedDict
 
@@ -15,7 +15,7 @@ from django.db.models.enums import TextChoices
 from django.utils import timezone
 from snuba_sdk import Op
 
-from sentry import features, release_health, tsdb
+from sentry import features, options, release_health, tsdb
 from sentry.issues.constants import get_issue_tsdb_group_model, get_issue_tsdb_user_group_model
 from sentry.issues.grouptype import GroupCategory
 from sentry.models.group import DEFAULT_TYPE_ID, Group
@@ -30,6 +30,8 @@ from sentry.types.condition_activity import (
     ConditionActivity,
     round_to_five_minute,
 )
+from sentry.utils import metrics
+from sentry.utils.hashlib import md5_text
 from sentry.utils.iterators import chunked
 from sentry.utils.snuba import options_override
 
@@ -379,24 +381,36 @@ class BaseEventFrequencyCondition(EventCondition, abc.ABC):
         group_on_time: bool = False,
         project_ids: list[int] | None = None,
     ) -> dict[int, int]:
-        batch_totals: dict[int, int] = defaultdict(int)
-        group_id = group_ids[0]
-        for group_chunk in chunked(group_ids, SNUBA_LIMIT):
-            result = self.get_snuba_query_result(
-                tsdb_function=tsdb_function,
-                model=model,
-                keys=[group_id for group_id in group_chunk],
-                group_id=group_id,
-                organization_id=organization_id,
-                start=start,
-                end=end,
-                environment_id=environment_id,
-                referrer_suffix=referrer_suffix,
-                group_on_time=group_on_time,
-                project_ids=project_ids,
-            )
-            batch_totals.update(result)
-        return batch_totals
+        def query(group_ids: list[int], start: datetime, end: datetime) -> dict[int, int]:
+            batch_totals: dict[int, int] = defaultdict(int)
+            group_id = group_ids[0]
+            for group_chunk in chunked(group_ids, SNUBA_LIMIT):
+                result = self.get_snuba_query_result(
+                    tsdb_function=tsdb_function,
+                    model=model,
+                    keys=[group_id for group_id in group_chunk],
+                    group_id=group_id,
+                    organization_id=organization_id,
+                    start=start,
+                    end=end,
+                    environment_id=environment_id,
+                    referrer_suffix=referrer_suffix,
+                    group_on_time=group_on_time,
+                    project_ids=project_ids,
+                )
+                batch_totals.update(result)
+            return batch_totals
+
+        return get_shared_frequency_results(
+            query,
+            tsdb_function=tsdb_function,
+            model=model,
+            group_ids=group_ids,
+            start=start,
+            end=end,
+            environment_id=environment_id,
+            group_on_time=group_on_time,
+        )
 
     def get_error_and_generic_group_ids(
         self,
@@ -766,25 +780,38 @@ class EventUniqueUserFrequencyConditionWithConditions(EventUniqueUserFrequencyCo
         project_ids: list[int] | None = None,
         conditions: list[tuple[str, str, str | list[str]]] | None = None,
     ) -> dict[int, int]:
-        batch_totals: dict[int, int] = defaultdict(int)
-        group_id = group_ids[0]
-        for group_chunk in chunked(group_ids, SNUBA_LIMIT):
-            result = self.get_snuba_query_result(
-                tsdb_function=tsdb_function,
-                model=model,
-                keys=[group_id for group_id in group_chunk],
-                group_id=group_id,
-                organization_id=organization_id,
-                start=start,
-                end=end,
-                environment_id=environment_id,
-                referrer_suffix=referrer_suffix,
-                project_ids=project_ids,
-                conditions=conditions,
-                group_on_time=group_on_time,
-            )
-            batch_totals.update(result)
-        return batch_totals
+        def query(group_ids: list[int], start: datetime, end: datetime) -> dict[int, int]:
+            batch_totals: dict[int, int] = defaultdict(int)
+            group_id = group_ids[0]
+            for group_chunk in chunked(group_ids, SNUBA_LIMIT):
+                result = self.get_snuba_query_result(
+                    tsdb_function=tsdb_function,
+                    model=model,
+                    keys=[group_id for group_id in group_chunk],
+                    group_id=group_id,
+                    organization_id=organization_id,
+                    start=start,
+                    end=end,
+                    environment_id=environment_id,
+                    referrer_suffix=referrer_suffix,
+                    project_ids=project_ids,
+                    conditions=conditions,
+                    group_on_time=group_on_time,
+                )
+                batch_totals.update(result)
+            return batch_totals
+
+        return get_shared_frequency_results(
+            query,
+            tsdb_function=tsdb_function,
+            model=model,
+            group_ids=group_ids,
+            start=start,
+            end=end,
+            environment_id=environment_id,
+            group_on_time=group_on_time,
+            conditions=conditions,
+        )
 
     @staticmethod
     def convert_rule_condition_to_snuba_condition(
@@ -1044,3 +1071,88 @@ def percent_increase(result: int | float, comparison_result: int | float) -> int
         if comparison_result > 0
         else 0
     )
+
+
+def _truncate_to_minute(value: datetime) -> datetime:
+    return value.replace(second=0, microsecond=0)
+
+
+def get_shared_frequency_results(
+    query: Callable[[list[int], datetime, datetime], Mapping[int, int]],
+    tsdb_function: Callable[..., Any],
+    model: TSDBModel,
+    group_ids: list[int],
+    start: datetime,
+    end: datetime,
+    environment_id: int | None,
+    group_on_time: bool = False,
+    conditions: Sequence[Any] | None = None,
+) -> dict[int, int]:
+    """
+    Runs `query(group_ids, start, end)` for a batch frequency condition, sharing per-group results
+    between delayed rule processing and delayed workflow processing.
+
+    While alert rules are migrated to workflows, both engines evaluate the same frequency
+    conditions for the same groups within seconds of each other, but their Snuba queries differ in
+    referrer and exact query window, so the Snuba query cache never matches across them.
+
+    When `delayed_processing.shared_frequency_queries.ttl_seconds` is set, the query window is
+    truncated to the minute and results are cached per group under a key made of everything that
+    determines them, so that only groups which haven't been queried by either engine are sent to
+    Snuba.
+    """
+    ttl = options.get("delayed_processing.shared_frequency_queries.ttl_seconds")
+    if ttl <= 0:
+        return dict(query(group_ids, start, end))
+
+    start = _truncate_to_minute(start)
+    end = _truncate_to_minute(end)
+    query_hash = md5_text(
+        repr(
+            (
+                tsdb_function.__name__,
+                model.value,
+                environment_id,
+                start.timestamp(),
+                end.timestamp(),
+                group_on_time,
+                conditions or None,
+            )
+        )
+    ).hexdigest()
+    cache_keys = {group_id: f"frequency-query:{query_hash}:{group_id}" for group_id in group_ids}
+
+    cached = cache.get_many(list(cache_keys.values()))
+    results = {
+        group_id: cached[cache_key]
+        for group_id, cache_key in cache_keys.items()
+        if cache_key in cached
+    }
+    missing_group_ids = [group_id for group_id in group_ids if group_id not in results]
+
+    metrics.incr(
+        "delayed_processing.shared_frequency_queries",
+        amount=len(results),
+        tags={"result": "hit"},
+        sample_rate=1.0,
+    )
+    metrics.incr(
+        "delayed_processing.shared_frequency_queries",
+        amount=len(missing_group_ids),
+        tags={"result": "miss"},
+        sample_rate=1.0,
+    )
+
+    if missing_group_ids:
+        queried = query(missing_group_ids, start, end)
+        cache.set_many(
+            {
+                cache_keys[group_id]: value
+                for group_id, value in queried.items()
+                if group_id in cache_keys
+            },
+            ttl,
+        )
+        results.update(queried)
+
+    return results
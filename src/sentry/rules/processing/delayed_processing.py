@@ -399,6 +399,9 @@ def get_condition_group_results(
     condition_group_results = {}
     current_time = datetime.now(tz=timezone.utc)
     project_id = project.id
+    rules_by_id = Rule.objects.in_bulk(
+        {rule_id for _, _, rule_id in condition_groups.values() if rule_id}
+    )
 
     for unique_condition, (condition_data, group_ids, rule_id) in condition_groups.items():
         cls_id = unique_condition.cls_id
@@ -411,10 +414,15 @@ def get_condition_group_results(
             )
             continue
 
+        rule = None
         if rule_id:
-            rule = Rule.objects.get(id=rule_id)
-        else:
-            rule = None
+            rule = rules_by_id.get(rule_id)
+            if rule is None:
+                logger.warning(
+                    "delayed_processing.missing_rule",
+                    extra={"rule_id": rule_id, "project_id": project_id},
+                )
+                continue
 
         condition_inst = condition_cls(
             project=project, data=condition_data, rule=rule  # type: ignore[arg-type]
@@ -451,12 +459,17 @@ def passes_comparison(
     group_id: int,
     environment_id: int,
     project_id: int,
+    unique_queries: list[UniqueConditionQuery] | None = None,
 ) -> bool:
     """
     Checks if a specific condition instance has passed. Handles both the count
     and percent comparison type conditions.
+
+    `unique_queries` can be passed in when checking the same condition for
+    many groups, to avoid generating them again for every group.
     """
-    unique_queries = generate_unique_queries(condition_data, environment_id)
+    if unique_queries is None:
+        unique_queries = generate_unique_queries(condition_data, environment_id)
     try:
         query_values = [
             condition_group_results[unique_query][group_id] for unique_query in unique_queries
@@ -491,21 +504,29 @@ def get_rules_to_fire(
     rules_to_fire = defaultdict(set)
     for alert_rule, slow_conditions in rules_to_slow_conditions.items():
         action_match = alert_rule.data.get("action_match", "any")
+        # The queries only depend on the condition, so they are shared by all of the rule's groups.
+        conditions_with_queries = [
+            (slow_condition, generate_unique_queries(slow_condition, alert_rule.environment_id))
+            for slow_condition in slow_conditions
+        ]
         for group_id in rules_to_groups[alert_rule.id]:
             conditions_matched = 0
-            for slow_condition in slow_conditions:
+            for slow_condition, unique_queries in conditions_with_queries:
                 if passes_comparison(
                     condition_group_results,
                     slow_condition,
                     group_id,
                     alert_rule.environment_id,
                     project_id,
+                    unique_queries=unique_queries,
                 ):
                     if action_match == "any":
                         rules_to_fire[alert_rule].add(group_id)
                         break
                     elif action_match == "all":
                         conditions_matched += 1
+                elif action_match == "all":
+                    break
             if action_match == "all" and conditions_matched == len(slow_conditions):
                 rules_to_fire[alert_rule].add(group_id)
     return rules_to_fire
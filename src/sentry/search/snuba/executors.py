@@ -13,6 +13,7 @@ from math import floor
 from typing import Any, TypedDict, cast
 
 import sentry_sdk
+from django.core.cache import cache
 from django.db.models import Q
 from django.utils import timezone
 from snuba_sdk.expressions import Expression
@@ -92,6 +93,33 @@ ENTITY_EVENTS = "events"
 ENTITY_SEARCH_ISSUES = "search_issues"
 
 
+@dataclass(frozen=True)
+class SearchKeyset:
+    """
+    Continuation of a chunked search sorted by descending score: the next chunk only contains
+    groups scored at most `score`, skipping the groups with exactly that score already returned.
+    A keyset without a score starts from the top.
+    """
+
+    score: int | None = None
+    seen_group_ids: frozenset[int] = frozenset()
+
+    def after(self, rows: Sequence[tuple[int, Any]], max_seen_groups: int) -> SearchKeyset | None:
+        """
+        Return the keyset continuing after `rows`, the result of the chunk fetched with this one.
+
+        Returns None when more than `max_seen_groups` groups share the last score, as those would
+        all have to be excluded from the next query. The search continues by offset instead.
+        """
+        score = min(score for _, score in rows)
+        seen_group_ids = {group_id for group_id, s in rows if s == score}
+        if score == self.score:
+            seen_group_ids.update(self.seen_group_ids)
+        if len(seen_group_ids) > max_seen_groups:
+            return None
+        return SearchKeyset(score=score, seen_group_ids=frozenset(seen_group_ids))
+
+
 @dataclass
 class TrendsParams:
     # (event or issue age_hours) / (event or issue halflife hours)
@@ -309,6 +337,7 @@ class AbstractQueryExecutor(metaclass=ABCMeta):
         get_sample: bool,
         actor: Any | None = None,
         aggregate_kwargs: TrendsSortWeights | None = None,
+        keyset: SearchKeyset | None = None,
     ) -> SnubaQueryParams | None:
         """
         :raises UnsupportedSearchQuery: when search_filters includes conditions on a dataset that doesn't support it
@@ -346,6 +375,14 @@ class AbstractQueryExecutor(metaclass=ABCMeta):
         if cursor is not None:
             having.append((sort_field, ">=" if cursor.is_prev else "<=", cursor.value))
 
+        if keyset is not None and keyset.score is not None:
+            # Continue right after the last row of the previous chunk. Rows sharing the last score
+            # may straddle the chunk boundary, so those are included again except for the ones
+            # which were already returned.
+            having.append((sort_field, "<=", keyset.score))
+            if keyset.seen_group_ids:
+                conditions.append(["group_id", "NOT IN", list(keyset.seen_group_ids)])
+
         selected_columns = []
         if get_sample:
             query_hash = md5(json.dumps(conditions).encode("utf-8")).hexdigest()[:8]
@@ -399,6 +436,7 @@ class AbstractQueryExecutor(metaclass=ABCMeta):
         search_filters: Sequence[SearchFilter] | None = None,
         actor: Any | None = None,
         aggregate_kwargs: TrendsSortWeights | None = None,
+        keyset: SearchKeyset | None = None,
         *,
         referrer: str,
     ) -> tuple[list[tuple[int, Any]], int]:
@@ -407,6 +445,9 @@ class AbstractQueryExecutor(metaclass=ABCMeta):
         Returns a tuple of:
             * a sorted list of (group_id, group_score) tuples sorted descending by score,
             * the count of total results (rows) available for this query.
+
+        When a `keyset` is passed, `offset` should be 0 and only rows after the keyset are returned,
+        trimmed so that the next keyset can be derived from them (see `SearchKeyset.after`).
         """
         filters = {"project_id": project_ids}
 
@@ -467,6 +508,7 @@ class AbstractQueryExecutor(metaclass=ABCMeta):
                     get_sample,
                     actor,
                     aggregate_kwargs,
+                    keyset,
                 )
             except UnsupportedSearchQuery:
                 pass
@@ -506,6 +548,23 @@ class AbstractQueryExecutor(metaclass=ABCMeta):
                     total += bulk_result["totals"]["total"]
                 row_length += len(bulk_result)
 
+        if keyset is not None and limit is not None:
+            # Every category is queried separately, so a category which filled its limit may still
+            # have rows scored above the last row of another category. Only keep rows down to the
+            # highest score at which a category may have been cut off, the next chunk picks up the
+            # rest from there.
+            def score(row: Mapping[str, Any]) -> Any:
+                return row[sort_field]
+
+            cutoff_scores = [
+                min(score(row) for row in bulk_result["data"])
+                for bulk_result in bulk_query_results
+                if bulk_result and len(bulk_result["data"]) >= limit
+            ]
+            if cutoff_scores:
+                cutoff_score = max(cutoff_scores)
+                rows = [row for row in rows if score(row) >= cutoff_score]
+
         rows.sort(key=lambda row: row["group_id"])
 
         if not get_sample:
@@ -889,6 +948,17 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
         chunk_limit = limit
         offset = 0
         num_chunks = 0
+        num_snuba_rows = 0
+        # Keyset mode only works with integer scores, as the last score of a chunk has to compare
+        # equal to the same score in the next one.
+        keyset: SearchKeyset | None = (
+            SearchKeyset()
+            if options.get("snuba.search.keyset-pagination.enabled")
+            and not group_ids
+            and sort_field in ("last_seen", "times_seen", "first_seen", "user_count")
+            else None
+        )
+        keyset_tag = str(keyset is not None).lower()
         hits = self.calculate_hits(
             group_ids,
             too_many_candidates,
@@ -950,15 +1020,30 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
                 referrer=referrer,
                 actor=actor,
                 aggregate_kwargs=aggregate_kwargs,
+                keyset=keyset,
             )
             metrics.distribution("snuba.search.num_snuba_results", len(snuba_groups))
             count = len(snuba_groups)
-            more_results = count >= limit and (offset + limit) < total
-            offset += len(snuba_groups)
+            num_snuba_rows += count
+            if keyset is not None:
+                # `total` only counts the rows after the keyset
+                more_results = count < total
+            else:
+                more_results = count >= limit and (offset + limit) < total
+                offset += len(snuba_groups)
 
             if not snuba_groups:
                 break
 
+            if keyset is not None:
+                keyset = keyset.after(
+                    snuba_groups, options.get("snuba.search.keyset-pagination.max-seen-groups")
+                )
+                if keyset is None:
+                    # Too many groups tie on the last score to exclude them all from the next
+                    # query, skip past every row fetched so far instead.
+                    offset = num_snuba_rows
+
             if group_ids:
                 # pre-filtered candidates were passed down to Snuba, so we're
                 # finished with filtering and these are the only results. Note
@@ -1021,6 +1106,13 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
             paginator_results.prev.has_results = True
 
         metrics.distribution("snuba.search.num_chunks", num_chunks)
+        # Rows fetched from Snuba which didn't make it into the results, either because they were
+        # filtered out by Postgres or were duplicates across chunks.
+        metrics.distribution(
+            "snuba.search.wasted_rows",
+            num_snuba_rows - len(result_groups),
+            tags={"keyset": keyset_tag},
+        )
 
         groups = Group.objects.in_bulk(paginator_results.results)
         paginator_results.results = [groups[k] for k in paginator_results.results if k in groups]
@@ -1093,6 +1185,22 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
             # requires the most samples) we would need 96 samples to achieve
             # +/-10% @ 95% confidence.
 
+            cache_key = None
+            cache_ttl = options.get("snuba.search.hits-cache-ttl-seconds")
+            if cache_ttl > 0:
+                # The estimate doesn't depend on the cursor, so paging through results (or
+                # reloading the page) can reuse it for a short while.
+                cache_key = self._get_hits_cache_key(
+                    too_many_candidates, projects, environments, search_filters, start, end, actor
+                )
+                cached_hits = cache.get(cache_key)
+                metrics.incr(
+                    "snuba.search.hits_cache",
+                    tags={"result": "miss" if cached_hits is None else "hit"},
+                )
+                if cached_hits is not None:
+                    return cached_hits
+
             sample_size = options.get("snuba.search.hits-sample-size")
             kwargs = {}
             if not too_many_candidates:
@@ -1116,7 +1224,7 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
             snuba_count = len(snuba_groups)
             if snuba_count == 0:
                 # Maybe check for 0 hits and return EMPTY_RESULT in ::query? self.empty_result
-                return 0
+                hits = 0
             else:
                 filtered_count = group_queryset.filter(
                     id__in=[gid for gid, _ in snuba_groups]
@@ -1124,9 +1232,46 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
 
                 hit_ratio = filtered_count / float(snuba_count)
                 hits = int(hit_ratio * snuba_total)
-                return hits
+
+            if cache_key is not None:
+                cache.set(cache_key, hits, cache_ttl)
+            return hits
         return None
 
+    def _get_hits_cache_key(
+        self,
+        too_many_candidates: bool,
+        projects: Sequence[Project],
+        environments: Sequence[Environment] | None,
+        search_filters: Sequence[SearchFilter] | None,
+        start: datetime,
+        end: datetime,
+        actor: Any | None,
+    ) -> str:
+        def normalize(value: Any) -> str:
+            # Relative date filters and the default time window resolve to slightly different
+            # timestamps on every request.
+            if isinstance(value, datetime):
+                return value.replace(second=0, microsecond=0).isoformat()
+            return str(value)
+
+        key = json.dumps(
+            [
+                type(self).__name__,
+                too_many_candidates,
+                sorted(p.id for p in projects),
+                sorted(e.id for e in environments) if environments is not None else None,
+                sorted(
+                    f"{sf.key.name}{sf.operator}{normalize(sf.value.raw_value)}"
+                    for sf in search_filters or ()
+                ),
+                normalize(start),
+                normalize(end),
+                getattr(actor, "id", None),
+            ]
+        )
+        return f"search:hits:{projects[0].organization_id}:{md5(key.encode("utf-8")).hexdigest()}"
+
 
 class InvalidQueryForExecutor(Exception):
     pass
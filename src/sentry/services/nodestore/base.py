@@ -1,15 +1,18 @@
 from __future__ import annotations
 
+import struct
 from collections.abc import Mapping
 from datetime import datetime, timedelta
 from threading import local
 from typing import Any
 
 import sentry_sdk
+import zstandard
 from django.core.cache import BaseCache, InvalidCacheBackendError, caches
 from django.utils.functional import cached_property
 
 from sentry import options
+from sentry.services.nodestore.local_cache import LocalNodeCache, local_node_cache
 from sentry.utils import json, metrics
 from sentry.utils.services import Service
 
@@ -28,6 +31,19 @@ json_dumps = json.JSONEncoder(
 
 json_loads = json.loads
 
+# Nodes in the indexed format start with this magic. Nodes in the legacy format are newline-joined
+# JSON and always start with "{", so both formats can be told apart and read side by side.
+INDEXED_NODE_MAGIC = b"\x00SNI"
+INDEXED_NODE_VERSION = 1
+
+# magic, version, number of entries
+_INDEXED_NODE_HEADER = struct.Struct("<4sBH")
+# subkey length, flags, payload offset, payload length; followed by the subkey itself. Payload
+# offsets are relative to the end of the index.
+_INDEXED_NODE_ENTRY = struct.Struct("<HBII")
+_ENTRY_DEFAULT = 0x1
+_ENTRY_ZSTD = 0x2
+
 
 class NodeStorage(local, Service):
     """
@@ -72,7 +88,10 @@ class NodeStorage(local, Service):
         "get_multi",
         "set",
         "set_bytes",
+        "set_bytes_multi",
+        "set_multi",
         "set_subkeys",
+        "set_subkeys_multi",
         "cleanup",
         "validate",
         "bootstrap",
@@ -100,6 +119,9 @@ class NodeStorage(local, Service):
         if value is None:
             return None
 
+        if value.startswith(INDEXED_NODE_MAGIC):
+            return self._decode_indexed(value, subkey)
+
         lines_iter = iter(value.splitlines())
         try:
             if subkey is not None:
@@ -120,6 +142,39 @@ class NodeStorage(local, Service):
         except StopIteration:
             return None
 
+    def _decode_indexed(self, value: bytes, subkey: str | None) -> Any | None:
+        """
+        Decode a node in the indexed format. Only the payload of the requested
+        subkey is decompressed and parsed.
+        """
+        _, version, num_entries = _INDEXED_NODE_HEADER.unpack_from(value)
+        if version != INDEXED_NODE_VERSION:
+            raise ValueError(f"Unsupported node format version {version}")
+
+        _subkey = subkey.encode("ascii") if subkey is not None else None
+        found = None
+        pos = _INDEXED_NODE_HEADER.size
+        for _ in range(num_entries):
+            key_length, flags, offset, length = _INDEXED_NODE_ENTRY.unpack_from(value, pos)
+            pos += _INDEXED_NODE_ENTRY.size
+            if found is None:
+                if _subkey is None:
+                    if flags & _ENTRY_DEFAULT:
+                        found = (flags, offset, length)
+                elif not flags & _ENTRY_DEFAULT and value[pos : pos + key_length] == _subkey:
+                    found = (flags, offset, length)
+            pos += key_length
+
+        if found is None:
+            return None
+
+        flags, offset, length = found
+        payload = value[pos + offset : pos + offset + length]
+        if flags & _ENTRY_ZSTD:
+            payload = zstandard.ZstdDecompressor().decompress(payload)
+
+        return json_loads(payload)
+
     def get_bytes(self, id: str) -> bytes | None:
         """
         >>> nodestore._get_bytes('key1')
@@ -138,6 +193,11 @@ class NodeStorage(local, Service):
         """
         with sentry_sdk.start_span(op="nodestore.get") as span:
             span.set_tag("node_id", id)
+            item_from_local_cache = self._get_local_cache_items([id]).get(id)
+            if item_from_local_cache is not None:
+                span.set_tag("origin", "from_local_cache")
+                return self._decode(item_from_local_cache, subkey=subkey)
+
             if subkey is None:
                 item_from_cache = self._get_cache_item(id)
                 if item_from_cache:
@@ -152,6 +212,7 @@ class NodeStorage(local, Service):
             if subkey is None:
                 # set cache item only after we know decoding did not fail
                 self._set_cache_item(id, rv)
+            self._set_local_cache_items({id: bytes_data})
 
             span.set_tag("result", "from_service")
             if bytes_data:
@@ -185,24 +246,33 @@ class NodeStorage(local, Service):
             span.set_tag("subkey", str(subkey))
             span.set_tag("num_ids", len(id_list))
 
+            cache_items = {
+                id: self._decode(value, subkey=subkey)
+                for id, value in self._get_local_cache_items(id_list).items()
+            }
+            if len(cache_items) == len(id_list):
+                span.set_tag("result", "from_local_cache")
+                return cache_items
+
             if subkey is None:
-                cache_items = self._get_cache_items(id_list)
+                cache_items.update(
+                    self._get_cache_items([id for id in id_list if id not in cache_items])
+                )
                 if len(cache_items) == len(id_list):
                     span.set_tag("result", "from_cache")
                     return cache_items
 
-                uncached_ids = [id for id in id_list if id not in cache_items]
-            else:
-                uncached_ids = id_list
+            uncached_ids = [id for id in id_list if id not in cache_items]
 
             with sentry_sdk.start_span(op="nodestore._get_bytes_multi_and_decode") as span:
+                bytes_items = self._get_bytes_multi(uncached_ids)
                 items = {
-                    id: self._decode(value, subkey=subkey)
-                    for id, value in self._get_bytes_multi(uncached_ids).items()
+                    id: self._decode(value, subkey=subkey) for id, value in bytes_items.items()
                 }
             if subkey is None:
                 self._set_cache_items(items)
-                items.update(cache_items)
+            self._set_local_cache_items(bytes_items)
+            items.update(cache_items)
 
             span.set_tag("result", "from_service")
             span.set_tag("found", len(items))
@@ -218,6 +288,9 @@ class NodeStorage(local, Service):
         >>> _encode({"unprocessed": {}, None: {"stacktrace": {}}})
         b'{"stacktrace": {}}\nunprocessed\n{}'
         """
+        if options.get("nodestore.indexed-format.write"):
+            return self._encode_indexed(data)
+
         lines = [json_dumps(data.pop(None)).encode("utf8")]
         for key, value in data.items():
             if key is not None:
@@ -226,16 +299,67 @@ class NodeStorage(local, Service):
 
         return b"\n".join(lines)
 
+    def _encode_indexed(self, data: dict[str | None, Mapping[str, Any]]) -> bytes:
+        """
+        Encode data dict in the indexed format: a header with the offset of
+        every subkey's payload, followed by the payloads, each optionally
+        zstd-compressed. Reading a subkey does not require decoding any other.
+        """
+        compression_level = options.get("nodestore.indexed-format.zstd-level")
+        compressor = (
+            zstandard.ZstdCompressor(level=compression_level) if compression_level > 0 else None
+        )
+
+        entries = [(None, data.pop(None))]
+        entries.extend((key, value) for key, value in data.items() if key is not None)
+
+        index = [_INDEXED_NODE_HEADER.pack(INDEXED_NODE_MAGIC, INDEXED_NODE_VERSION, len(entries))]
+        payloads = []
+        offset = 0
+        for key, value in entries:
+            payload = json_dumps(value).encode("utf8")
+            flags = _ENTRY_DEFAULT if key is None else 0
+            if compressor is not None:
+                payload = compressor.compress(payload)
+                flags |= _ENTRY_ZSTD
+
+            encoded_key = key.encode("ascii") if key is not None else b""
+            index.append(_INDEXED_NODE_ENTRY.pack(len(encoded_key), flags, offset, len(payload)))
+            index.append(encoded_key)
+            payloads.append(payload)
+            offset += len(payload)
+
+        return b"".join(index + payloads)
+
     def set_bytes(self, item_id: str, data: bytes, ttl: timedelta | None = None) -> None:
         """
         >>> nodestore.set_bytes('key1', b"{'foo': 'bar'}")
         """
         metrics.distribution("nodestore.set_bytes", len(data))
-        return self._set_bytes(item_id, data, ttl)
+        self._set_bytes(item_id, data, ttl)
+        self._set_local_cache_items({item_id: data})
 
     def _set_bytes(self, item_id: str, data: bytes, ttl: timedelta | None = None) -> None:
         raise NotImplementedError
 
+    def set_bytes_multi(self, items: Mapping[str, bytes], ttl: timedelta | None = None) -> None:
+        """
+        Write multiple nodes at once.
+
+        Note: This is not guaranteed to be atomic and may result in a partial
+        write.
+
+        >>> nodestore.set_bytes_multi({'key1': b"{'foo': 'bar'}", 'key2': b"{'foo': 'baz'}"})
+        """
+        for data in items.values():
+            metrics.distribution("nodestore.set_bytes", len(data))
+        self._set_bytes_multi(items, ttl)
+        self._set_local_cache_items(items)
+
+    def _set_bytes_multi(self, items: Mapping[str, bytes], ttl: timedelta | None = None) -> None:
+        for item_id, data in items.items():
+            self._set_bytes(item_id, data, ttl)
+
     def set(self, item_id: str, data: Mapping[str, Any], ttl: timedelta | None = None) -> None:
         """
         Set value for `item_id`. Note that this deletes existing subkeys for `item_id` as
@@ -269,6 +393,39 @@ class NodeStorage(local, Service):
         if options.get("nodestore.set-subkeys.enable-set-cache-item"):
             self._set_cache_item(item_id, cache_item)
 
+    def set_multi(
+        self, items: Mapping[str, Mapping[str, Any]], ttl: timedelta | None = None
+    ) -> None:
+        """
+        Set values for multiple items, see `set`.
+
+        >>> nodestore.set_multi({'key1': {'foo': 'bar'}, 'key2': {'foo': 'baz'}})
+        """
+        return self.set_subkeys_multi(
+            {item_id: {None: data} for item_id, data in items.items()}, ttl
+        )
+
+    @sentry_sdk.tracing.trace
+    def set_subkeys_multi(
+        self,
+        items: Mapping[str, dict[str | None, Mapping[str, Any]]],
+        ttl: timedelta | None = None,
+    ) -> None:
+        """
+        Set values and subkeys for multiple items, see `set_subkeys`.
+
+        >>> nodestore.set_subkeys_multi({
+        ...    'key1': {None: {'foo': 'bar'}, "reprocessing": {'foo': 'bam'}},
+        ...    'key2': {None: {'foo': 'baz'}},
+        ... })
+        """
+        cache_items = {item_id: data.get(None) for item_id, data in items.items()}
+        bytes_data = {item_id: self._encode(data) for item_id, data in items.items()}
+        self.set_bytes_multi(bytes_data, ttl=ttl)
+        # set cache only after encoding and write to nodestore has succeeded
+        if options.get("nodestore.set-subkeys.enable-set-cache-item"):
+            self._set_cache_items({k: v for k, v in cache_items.items() if v})
+
     def cleanup(self, cutoff_timestamp: datetime) -> None:
         raise NotImplementedError
 
@@ -277,13 +434,17 @@ class NodeStorage(local, Service):
 
     def _get_cache_item(self, item_id: str) -> Any | None:
         if self.cache:
-            return self.cache.get(item_id)
+            rv = self.cache.get(item_id)
+            self._record_cache_result("shared", hits=int(rv is not None), total=1)
+            return rv
         return None
 
     @sentry_sdk.tracing.trace
     def _get_cache_items(self, id_list: list[str]) -> dict[str, Any]:
         if self.cache:
-            return self.cache.get_many(id_list)
+            rv = self.cache.get_many(id_list)
+            self._record_cache_result("shared", hits=len(rv), total=len(id_list))
+            return rv
         return {}
 
     def _set_cache_item(self, item_id: str, data: Any) -> None:
@@ -296,13 +457,47 @@ class NodeStorage(local, Service):
             self.cache.set_many(items)
 
     def _delete_cache_item(self, item_id: str) -> None:
+        self.local_cache.delete_many([item_id])
         if self.cache:
             self.cache.delete(item_id)
 
     def _delete_cache_items(self, id_list: list[str]) -> None:
+        self.local_cache.delete_many(id_list)
         if self.cache:
             self.cache.delete_many([item_id for item_id in id_list])
 
+    def _get_local_cache_items(self, id_list: list[str]) -> dict[str, bytes]:
+        if not id_list or not options.get("nodestore.local-cache.enabled"):
+            return {}
+
+        rv = self.local_cache.get_many(id_list)
+        self._record_cache_result("local", hits=len(rv), total=len(id_list))
+        return rv
+
+    def _set_local_cache_items(self, items: Mapping[str, bytes | None]) -> None:
+        if not options.get("nodestore.local-cache.enabled"):
+            return
+
+        self.local_cache.set_many(
+            {item_id: data for item_id, data in items.items() if data},
+            max_bytes=options.get("nodestore.local-cache.max-bytes"),
+            ttl_seconds=options.get("nodestore.local-cache.ttl-seconds"),
+        )
+        metrics.gauge("nodestore.cache.local.size", self.local_cache.size)
+
+    def _record_cache_result(self, tier: str, hits: int, total: int) -> None:
+        if hits:
+            metrics.incr("nodestore.cache.get", amount=hits, tags={"tier": tier, "result": "hit"})
+        if total > hits:
+            metrics.incr(
+                "nodestore.cache.get", amount=total - hits, tags={"tier": tier, "result": "miss"}
+            )
+
+    @property
+    def local_cache(self) -> LocalNodeCache:
+        # Not stored on the instance, which is thread-local.
+        return local_node_cache
+
     @cached_property
     def cache(self) -> BaseCache | None:
         try:
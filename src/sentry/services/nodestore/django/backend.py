@@ -3,13 +3,14 @@ from __future__ import annotations
 import logging
 import math
 import pickle
+from collections.abc import Mapping
 from datetime import datetime, timedelta
 from typing import Any
 
 from django.utils import timezone
 
 from sentry.db.models.query import create_or_update
-from sentry.services.nodestore.base import NodeStorage
+from sentry.services.nodestore.base import INDEXED_NODE_MAGIC, NodeStorage
 from sentry.utils.strings import compress, decompress
 
 from .models import Node
@@ -27,7 +28,7 @@ class DjangoNodeStorage(NodeStorage):
             return None
 
         try:
-            if value.startswith(b"{"):
+            if value.startswith((b"{", INDEXED_NODE_MAGIC)):
                 return NodeStorage._decode(self, value, subkey=subkey)
 
             if subkey is None:
@@ -55,6 +56,15 @@ class DjangoNodeStorage(NodeStorage):
     def _set_bytes(self, id: str, data: Any, ttl: timedelta | None = None) -> None:
         create_or_update(Node, id=id, values={"data": compress(data), "timestamp": timezone.now()})
 
+    def _set_bytes_multi(self, items: Mapping[str, Any], ttl: timedelta | None = None) -> None:
+        now = timezone.now()
+        Node.objects.bulk_create(
+            [Node(id=id, data=compress(data), timestamp=now) for id, data in items.items()],
+            update_conflicts=True,
+            unique_fields=["id"],
+            update_fields=["data", "timestamp"],
+        )
+
     def cleanup(self, cutoff_timestamp: datetime) -> None:
         from sentry.db.deletion import BulkDeleteQuery
 
@@ -62,6 +72,7 @@ class DjangoNodeStorage(NodeStorage):
         days = math.floor(total_seconds / 86400)
 
         BulkDeleteQuery(model=Node, dtfield="timestamp", days=days).execute()
+        self.local_cache.clear()
         if self.cache:
             self.cache.clear()
 
@@ -1,10 +1,15 @@
 import os
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
 from django.conf import settings
 
 from sentry.services.nodestore.base import NodeStorage
 
+# Most files written at once by `set_bytes_multi`.
+MAX_WRITE_WORKERS = 8
+
 
 class FileSystemNodeStorage(NodeStorage):
     """
@@ -30,6 +35,14 @@ class FileSystemNodeStorage(NodeStorage):
         with open(self.node_path(id), "wb") as file:
             file.write(data)
 
+    def _set_bytes_multi(self, items: Mapping[str, bytes], ttl: timedelta | None = None) -> None:
+        if len(items) <= 1:
+            return super()._set_bytes_multi(items, ttl)
+
+        with ThreadPoolExecutor(max_workers=min(len(items), MAX_WRITE_WORKERS)) as executor:
+            # Consume the results so that the first failed write is raised.
+            list(executor.map(lambda item: self._set_bytes(item[0], item[1], ttl), items.items()))
+
     def delete(self, id: str) -> None:
         os.remove(self.node_path(id))
 
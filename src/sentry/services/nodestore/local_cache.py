@@ -0,0 +1,94 @@
+"""
+A bounded, process-local cache of raw nodestore values, used in front of the shared `nodedata`
+cache. Post-process, rules and notifications tend to load the same recent event node several
+times within seconds on one worker, and this saves both the network round trip and the
+compressed/pickled copy the shared cache keeps.
+
+Values are stored as the encoded bytes read from (or written to) the backend and are only decoded
+on access, so a single entry can serve any subkey. Size is accounted in bytes rather than in number
+of entries since event payloads vary by orders of magnitude.
+
+Entries expire after a short TTL. Deletes issued by this process evict entries immediately, while
+deletes issued by other processes are only picked up once the entry expires.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+
+
+class LocalNodeCache:
+    def __init__(self) -> None:
+        self._entries: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, item_id: str) -> bytes | None:
+        return self.get_many([item_id]).get(item_id)
+
+    def get_many(self, id_list: Iterable[str]) -> dict[str, bytes]:
+        now = time.monotonic()
+        found: dict[str, bytes] = {}
+
+        with self._lock:
+            for item_id in id_list:
+                entry = self._entries.get(item_id)
+                if entry is None:
+                    continue
+
+                data, expires_at = entry
+                if expires_at < now:
+                    self._pop(item_id)
+                    continue
+
+                self._entries.move_to_end(item_id)
+                found[item_id] = data
+
+        return found
+
+    def set_many(self, items: Mapping[str, bytes], max_bytes: int, ttl_seconds: float) -> None:
+        expires_at = time.monotonic() + ttl_seconds
+
+        with self._lock:
+            for item_id, data in items.items():
+                self._pop(item_id)
+                # A single value larger than the whole budget would just evict everything else.
+                if len(data) > max_bytes:
+                    continue
+
+                self._entries[item_id] = (data, expires_at)
+                self._size += len(data)
+
+            while self._size > max_bytes:
+                _, (data, _) = self._entries.popitem(last=False)
+                self._size -= len(data)
+
+    def delete_many(self, id_list: Iterable[str]) -> None:
+        with self._lock:
+            for item_id in id_list:
+                self._pop(item_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _pop(self, item_id: str) -> None:
+        entry = self._entries.pop(item_id, None)
+        if entry is not None:
+            self._size -= len(entry[0])
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Shared by all threads (and nodestore backends) of the process, so that memory is bounded once per
+# process and deletes evict entries for every thread.
+local_node_cache = LocalNodeCache()
@@ -775,6 +775,9 @@ class Referrer(StrEnum):
     SERIALIZERS_GROUPSERIALIZERSNUBA__EXECUTE_GENERIC_SEEN_STATS_QUERY = (
         "serializers.GroupSerializerSnuba._execute_generic_seen_stats_query"
     )
+    SERIALIZERS_GROUPSERIALIZERSNUBA__PREFETCH_SEEN_STATS = (
+        "serializers.GroupSerializerSnuba._prefetch_seen_stats"
+    )
     SESSIONS_CRASH_FREE_BREAKDOWN = "sessions.crash-free-breakdown"
     SESSIONS_GET_ADOPTION = "sessions.get-adoption"
     SESSIONS_GET_PROJECT_SESSIONS_COUNT = "sessions.get_project_sessions_count"
@@ -66,6 +66,7 @@ from __future__ import annotations
 import itertools
 import logging
 import math
+import time
 from collections.abc import Generator, MutableMapping, Sequence
 from typing import Any, NamedTuple
 
@@ -73,6 +74,7 @@ import orjson
 import zstandard
 from django.conf import settings
 from django.utils.functional import cached_property
+from redis.exceptions import NoScriptError
 from sentry_redis_tools.clients import RedisCluster, StrictRedis
 
 from sentry import options
@@ -89,6 +91,10 @@ SegmentKey = bytes
 
 QueueKey = bytes
 
+# Weight of the most recent flush cycle in the moving averages used by the
+# adaptive flush mode.
+ADAPTIVE_FLUSH_SMOOTHING = 0.2
+
 logger = logging.getLogger(__name__)
 
 
@@ -96,6 +102,85 @@ def _segment_key_to_span_id(segment_key: SegmentKey) -> bytes:
     return parse_segment_key(segment_key)[-1]
 
 
+_SPAN_ID_FIELD = b'"span_id":"'
+_SEGMENT_ID_FIELD = b'"segment_id":'
+_IS_SEGMENT_FIELD = b'"is_segment":'
+
+
+def _find_unique(payload: bytes, field: bytes) -> int | None:
+    """
+    Returns the position of `field` in `payload`, -1 if it is missing, or
+    None if it appears more than once.
+    """
+    pos = payload.find(field)
+    if pos != -1 and payload.find(field, pos + 1) != -1:
+        return None
+    return pos
+
+
+def _to_raw_output_span(payload: bytes, segment_span_id: str) -> RawOutputSpan:
+    """
+    Sets `segment_id` and `is_segment` on a serialized span without parsing
+    it, the same way `flush_segments` does for parsed spans.
+
+    This relies on the compact JSON written by Relay. Whenever a field cannot
+    be located unambiguously (e.g. it also appears in span links) or has an
+    unexpected value, the span is parsed and serialized again instead.
+    """
+    span_id_pos = _find_unique(payload, _SPAN_ID_FIELD)
+    segment_id_pos = _find_unique(payload, _SEGMENT_ID_FIELD)
+    is_segment_pos = _find_unique(payload, _IS_SEGMENT_FIELD)
+    if (
+        span_id_pos is None
+        or span_id_pos == -1
+        or segment_id_pos is None
+        or is_segment_pos is None
+        or not payload.endswith(b"}")
+    ):
+        return _parse_output_span(payload, segment_span_id)
+
+    span_id_pos += len(_SPAN_ID_FIELD)
+    span_id = payload[span_id_pos : payload.find(b'"', span_id_pos)].decode("ascii")
+    is_segment = b"true" if span_id == segment_span_id else b"false"
+
+    added_fields = []
+    if segment_id_pos == -1:
+        added_fields.append(b'"segment_id":"%s"' % segment_span_id.encode("ascii"))
+    elif not payload.startswith(b'"', segment_id_pos + len(_SEGMENT_ID_FIELD)) or (
+        payload.startswith(b'""', segment_id_pos + len(_SEGMENT_ID_FIELD))
+    ):
+        # Empty or null segment IDs need to be overwritten.
+        return _parse_output_span(payload, segment_span_id)
+
+    if is_segment_pos == -1:
+        added_fields.append(b'"is_segment":' + is_segment)
+    else:
+        value_pos = is_segment_pos + len(_IS_SEGMENT_FIELD)
+        for value in (b"true", b"false"):
+            if payload.startswith(value, value_pos):
+                payload = payload[:value_pos] + is_segment + payload[value_pos + len(value) :]
+                break
+        else:
+            return _parse_output_span(payload, segment_span_id)
+
+    if added_fields:
+        if payload.rstrip(b" }") != b"{":
+            added_fields.insert(0, b"")
+        payload = payload[:-1] + b",".join(added_fields) + b"}"
+
+    return RawOutputSpan(span_id=span_id, raw_payload=payload)
+
+
+def _parse_output_span(payload: bytes, segment_span_id: str) -> RawOutputSpan:
+    val = orjson.loads(payload)
+
+    if not val.get("segment_id"):
+        val["segment_id"] = segment_span_id
+    val["is_segment"] = segment_span_id == val["span_id"]
+
+    return RawOutputSpan(span_id=val["span_id"], raw_payload=orjson.dumps(val))
+
+
 def parse_segment_key(segment_key: SegmentKey) -> tuple[bytes, bytes, bytes]:
     segment_key_parts = segment_key.split(b":")
 
@@ -145,10 +230,41 @@ class Span(NamedTuple):
 class OutputSpan(NamedTuple):
     payload: dict[str, Any]
 
+    @property
+    def span_id(self) -> str:
+        return self.payload["span_id"]
+
+    @property
+    def raw_payload(self) -> bytes:
+        return orjson.dumps(self.payload)
+
+
+class RawOutputSpan(NamedTuple):
+    """
+    A flushed span which is kept as serialized JSON, so that segments can be
+    produced by concatenating span payloads instead of parsing and
+    re-serializing them. `payload` parses the span on demand.
+    """
+
+    span_id: str
+    raw_payload: bytes
+
+    @property
+    def payload(self) -> dict[str, Any]:
+        return orjson.loads(self.raw_payload)
+
 
 class FlushedSegment(NamedTuple):
     queue_key: QueueKey
-    spans: list[OutputSpan]
+    spans: list[OutputSpan] | list[RawOutputSpan]
+
+    def to_kafka_value(self) -> bytes:
+        """
+        Returns the `{"spans": [...]}` message for this segment, which is what
+        `orjson.dumps({"spans": [span.payload for span in self.spans]})` would
+        return.
+        """
+        return b'{"spans":[' + b",".join(span.raw_payload for span in self.spans) + b"]}"
 
 
 class SpansBuffer:
@@ -161,6 +277,12 @@ class SpansBuffer:
         self._zstd_compressor: zstandard.ZstdCompressor | None = None
         self._zstd_decompressor = zstandard.ZstdDecompressor()
 
+        # State of the adaptive flush mode, see `_get_max_flush_segments`.
+        self._avg_segment_bytes: float | None = None
+        self._avg_segment_spans: float | None = None
+        self._memory_usage_ratio = 0.0
+        self._memory_checked_at: float | None = None
+
     @cached_property
     def client(self) -> RedisCluster[bytes] | StrictRedis[bytes]:
         return get_redis_client()
@@ -193,47 +315,49 @@ class SpansBuffer:
         root_timeout = options.get("spans.buffer.root-timeout")
         max_segment_bytes = options.get("spans.buffer.max-segment-bytes")
 
-        result_meta = []
         is_root_span_count = 0
         min_redirect_depth = float("inf")
         max_redirect_depth = float("-inf")
 
-        with metrics.timer("spans.buffer.process_spans.push_payloads"):
-            trees = self._group_by_parent(spans)
+        trees = self._group_by_parent(spans)
 
-            with self.client.pipeline(transaction=False) as p:
-                for (project_and_trace, parent_span_id), subsegment in trees.items():
-                    set_key = self._get_span_key(project_and_trace, parent_span_id)
-                    prepared = self._prepare_payloads(subsegment)
-                    p.zadd(set_key, prepared)
+        for subsegment in trees.values():
+            is_root_span_count += sum(span.is_segment_span for span in subsegment)
 
-                p.execute()
+        if options.get("spans.buffer.adaptive-mode"):
+            with metrics.timer("spans.buffer.process_spans.insert_spans"):
+                results = self._insert_spans_pipelined(trees, redis_ttl, max_segment_bytes)
+        else:
+            with metrics.timer("spans.buffer.process_spans.push_payloads"):
+                with self.client.pipeline(transaction=False) as p:
+                    for (project_and_trace, parent_span_id), subsegment in trees.items():
+                        set_key = self._get_span_key(project_and_trace, parent_span_id)
+                        prepared = self._prepare_payloads(subsegment)
+                        p.zadd(set_key, prepared)
+
+                    p.execute()
+
+            with metrics.timer("spans.buffer.process_spans.insert_spans"):
+                # Workaround to make `evalsha` work in pipelines. We load ensure the
+                # script is loaded just before calling it below. This calls `SCRIPT
+                # EXISTS` once per batch.
+                add_buffer_sha = self._ensure_script()
+
+                with self.client.pipeline(transaction=False) as p:
+                    for (project_and_trace, parent_span_id), subsegment in trees.items():
+                        self._add_buffer(
+                            p,
+                            add_buffer_sha,
+                            project_and_trace,
+                            parent_span_id,
+                            subsegment,
+                            redis_ttl,
+                            max_segment_bytes,
+                        )
 
-        with metrics.timer("spans.buffer.process_spans.insert_spans"):
-            # Workaround to make `evalsha` work in pipelines. We load ensure the
-            # script is loaded just before calling it below. This calls `SCRIPT
-            # EXISTS` once per batch.
-            add_buffer_sha = self._ensure_script()
+                    results = p.execute()
 
-            with self.client.pipeline(transaction=False) as p:
-                for (project_and_trace, parent_span_id), subsegment in trees.items():
-                    p.execute_command(
-                        "EVALSHA",
-                        add_buffer_sha,
-                        1,
-                        project_and_trace,
-                        len(subsegment),
-                        parent_span_id,
-                        "true" if any(span.is_segment_span for span in subsegment) else "false",
-                        redis_ttl,
-                        max_segment_bytes,
-                        *[span.span_id for span in subsegment],
-                    )
-
-                    is_root_span_count += sum(span.is_segment_span for span in subsegment)
-                    result_meta.append((project_and_trace, parent_span_id))
-
-                results = p.execute()
+        result_meta = list(trees.keys())
 
         with metrics.timer("spans.buffer.process_spans.update_queue"):
             queue_deletes: dict[bytes, set[bytes]] = {}
@@ -288,6 +412,82 @@ class SpansBuffer:
         metrics.gauge("spans.buffer.min_redirect_depth", min_redirect_depth)
         metrics.gauge("spans.buffer.max_redirect_depth", max_redirect_depth)
 
+    def _add_buffer(
+        self,
+        p: Any,
+        add_buffer_sha: str,
+        project_and_trace: str,
+        parent_span_id: str,
+        subsegment: list[Span],
+        redis_ttl: int,
+        max_segment_bytes: int,
+    ) -> None:
+        p.execute_command(
+            "EVALSHA",
+            add_buffer_sha,
+            1,
+            project_and_trace,
+            len(subsegment),
+            parent_span_id,
+            "true" if any(span.is_segment_span for span in subsegment) else "false",
+            redis_ttl,
+            max_segment_bytes,
+            *[span.span_id for span in subsegment],
+        )
+
+    def _insert_spans_pipelined(
+        self,
+        trees: dict[tuple[str, str], list[Span]],
+        redis_ttl: int,
+        max_segment_bytes: int,
+    ) -> list[Any]:
+        """
+        Pushes span payloads and runs `add-buffer.lua` for every subsegment in
+        a single pipeline. Commands for the same trace always go to the same
+        Redis node and keep their relative order, so each payload is written
+        before the script merges it.
+
+        Instead of checking `SCRIPT EXISTS` before every batch, the script is
+        (re)loaded only when Redis reports it missing, and the pipeline is
+        retried. Retrying is safe because the insertion process is
+        idempotent.
+        """
+        prepared = {key: self._prepare_payloads(subsegment) for key, subsegment in trees.items()}
+
+        for attempt in range(2):
+            if self.add_buffer_sha is None:
+                self.add_buffer_sha = self.client.script_load(add_buffer_script.script)
+
+            try:
+                with self.client.pipeline(transaction=False) as p:
+                    for (project_and_trace, parent_span_id), subsegment in trees.items():
+                        set_key = self._get_span_key(project_and_trace, parent_span_id)
+                        p.zadd(set_key, prepared[project_and_trace, parent_span_id])
+                        self._add_buffer(
+                            p,
+                            self.add_buffer_sha,
+                            project_and_trace,
+                            parent_span_id,
+                            subsegment,
+                            redis_ttl,
+                            max_segment_bytes,
+                        )
+
+                    results = p.execute()
+            except NoScriptError:
+                if attempt > 0:
+                    raise
+
+                metrics.incr("spans.buffer.process_spans.script_reload")
+                self.add_buffer_sha = None
+                continue
+
+            # Every subsegment issued a ZADD followed by an EVALSHA, only the
+            # script results are of interest.
+            return results[1::2]
+
+        raise AssertionError("unreachable")
+
     def _ensure_script(self):
         if self.add_buffer_sha is not None:
             if self.client.script_exists(self.add_buffer_sha)[0]:
@@ -393,8 +593,9 @@ class SpansBuffer:
 
         queue_keys = []
         shard_factor = max(1, len(self.assigned_shards))
-        max_flush_segments = options.get("spans.buffer.max-flush-segments")
+        max_flush_segments = self._get_max_flush_segments()
         max_segments_per_shard = math.ceil(max_flush_segments / shard_factor)
+        raw_payloads = options.get("spans.buffer.flush-raw-payloads")
 
         with metrics.timer("spans.buffer.flush_segments.load_segment_ids"):
             with self.client.pipeline(transaction=False) as p:
@@ -413,32 +614,32 @@ class SpansBuffer:
         with metrics.timer("spans.buffer.flush_segments.load_segment_data"):
             segments = self._load_segment_data([k for _, _, k in segment_keys])
 
+        self._record_segment_sizes(segments)
+
         return_segments = {}
         num_has_root_spans = 0
         any_shard_at_limit = False
 
         for shard, queue_key, segment_key in segment_keys:
             segment_span_id = _segment_key_to_span_id(segment_key).decode("ascii")
-            segment = segments.get(segment_key, [])
+            # Popped so that decompressed payloads can be freed as soon as the
+            # segment has been assembled.
+            segment = segments.pop(segment_key, [])
 
             if len(segment) >= max_segments_per_shard:
                 any_shard_at_limit = True
 
-            output_spans = []
-            has_root_span = False
+            output_spans: list[OutputSpan] | list[RawOutputSpan]
             metrics.timing("spans.buffer.flush_segments.num_spans_per_segment", len(segment))
-            for payload in segment:
-                val = orjson.loads(payload)
 
-                if not val.get("segment_id"):
-                    val["segment_id"] = segment_span_id
-
-                is_segment = segment_span_id == val["span_id"]
-                val["is_segment"] = is_segment
-                if is_segment:
-                    has_root_span = True
-
-                output_spans.append(OutputSpan(payload=val))
+            if raw_payloads:
+                output_spans = [
+                    _to_raw_output_span(payload, segment_span_id) for payload in segment
+                ]
+                has_root_span = any(span.span_id == segment_span_id for span in output_spans)
+            else:
+                output_spans = self._parse_output_spans(segment, segment_span_id)
+                has_root_span = any(span.payload["is_segment"] for span in output_spans)
 
             metrics.incr(
                 "spans.buffer.flush_segments.num_segments_per_shard", tags={"shard_i": shard}
@@ -452,6 +653,118 @@ class SpansBuffer:
         self.any_shard_at_limit = any_shard_at_limit
         return return_segments
 
+    def _parse_output_spans(self, segment: list[bytes], segment_span_id: str) -> list[OutputSpan]:
+        output_spans = []
+        for payload in segment:
+            val = orjson.loads(payload)
+
+            if not val.get("segment_id"):
+                val["segment_id"] = segment_span_id
+
+            val["is_segment"] = segment_span_id == val["span_id"]
+            output_spans.append(OutputSpan(payload=val))
+
+        return output_spans
+
+    def _get_max_flush_segments(self) -> int:
+        """
+        Returns how many segments to load per flush cycle.
+
+        By default this is the static `spans.buffer.max-flush-segments`. In
+        adaptive mode, the number of segments is derived from the average size
+        of recently flushed segments, so that a flush cycle loads roughly
+        `spans.buffer.adaptive-flush.max-bytes` at once: large segments are
+        flushed in smaller batches to bound consumer memory, small segments
+        in larger ones to flush more per round trip. When Redis memory usage
+        is high, the byte budget is scaled up to drain Redis faster.
+        """
+        max_flush_segments = options.get("spans.buffer.max-flush-segments")
+        if not options.get("spans.buffer.adaptive-mode"):
+            return max_flush_segments
+
+        self._refresh_memory_usage()
+
+        if self._avg_segment_bytes is None:
+            return max_flush_segments
+
+        max_bytes = options.get("spans.buffer.adaptive-flush.max-bytes")
+        if self._memory_usage_ratio >= options.get(
+            "spans.buffer.adaptive-flush.memory-pressure-ratio"
+        ):
+            max_bytes *= 2
+
+        adaptive_flush_segments = int(max_bytes / max(self._avg_segment_bytes, 1.0))
+        adaptive_flush_segments = max(
+            1,
+            min(
+                adaptive_flush_segments,
+                max_flush_segments * options.get("spans.buffer.adaptive-flush.max-scale"),
+            ),
+        )
+
+        metrics.gauge(
+            "spans.buffer.flush_segments.adaptive_max_flush_segments", adaptive_flush_segments
+        )
+        return adaptive_flush_segments
+
+    def _get_segment_page_size(self) -> int:
+        """
+        Returns the SCAN count used when loading segments. In adaptive mode,
+        this grows to the average number of spans per segment, so that most
+        segments are loaded in a single round trip.
+        """
+        page_size = options.get("spans.buffer.segment-page-size")
+        if not options.get("spans.buffer.adaptive-mode") or self._avg_segment_spans is None:
+            return page_size
+
+        return max(
+            page_size,
+            min(
+                math.ceil(self._avg_segment_spans),
+                page_size * options.get("spans.buffer.adaptive-flush.max-scale"),
+            ),
+        )
+
+    def _record_segment_sizes(self, segments: dict[SegmentKey, list[bytes]]) -> None:
+        if not segments or not options.get("spans.buffer.adaptive-mode"):
+            return
+
+        num_bytes = sum(len(span) for spans in segments.values() for span in spans)
+        num_spans = sum(len(spans) for spans in segments.values())
+
+        avg_segment_bytes = num_bytes / len(segments)
+        avg_segment_spans = num_spans / len(segments)
+
+        if self._avg_segment_bytes is None or self._avg_segment_spans is None:
+            self._avg_segment_bytes = avg_segment_bytes
+            self._avg_segment_spans = avg_segment_spans
+        else:
+            self._avg_segment_bytes += ADAPTIVE_FLUSH_SMOOTHING * (
+                avg_segment_bytes - self._avg_segment_bytes
+            )
+            self._avg_segment_spans += ADAPTIVE_FLUSH_SMOOTHING * (
+                avg_segment_spans - self._avg_segment_spans
+            )
+
+    def _refresh_memory_usage(self) -> None:
+        interval = options.get("spans.buffer.adaptive-flush.memory-check-interval")
+        checked_at = time.monotonic()
+        if self._memory_checked_at is not None and checked_at - self._memory_checked_at < interval:
+            return
+
+        self._memory_checked_at = checked_at
+
+        try:
+            memory_infos = list(self.get_memory_info())
+        except Exception:
+            logger.exception("spans.buffer.memory_info_failed")
+            return
+
+        used = sum(x.used for x in memory_infos)
+        available = sum(x.available for x in memory_infos)
+        self._memory_usage_ratio = used / available if available > 0 else 0.0
+        metrics.gauge("spans.buffer.flush_segments.memory_usage_ratio", self._memory_usage_ratio)
+
     def _load_segment_data(self, segment_keys: list[SegmentKey]) -> dict[SegmentKey, list[bytes]]:
         """
         Loads the segments from Redis, given a list of segment keys. Segments
@@ -461,7 +774,7 @@ class SpansBuffer:
         :return: Dictionary mapping segment keys to lists of span payloads.
         """
 
-        page_size = options.get("spans.buffer.segment-page-size")
+        page_size = self._get_segment_page_size()
         max_segment_bytes = options.get("spans.buffer.max-segment-bytes")
 
         payloads: dict[SegmentKey, list[bytes]] = {key: [] for key in segment_keys}
@@ -527,7 +840,7 @@ class SpansBuffer:
                     for span_batch in itertools.batched(flushed_segment.spans, 100):
                         p.hdel(
                             redirect_map_key,
-                            *[output_span.payload["span_id"] for output_span in span_batch],
+                            *[output_span.span_id for output_span in span_batch],
                         )
 
                 p.execute()
@@ -6,7 +6,6 @@ import time
 from collections.abc import Callable, Mapping
 from functools import partial
 
-import orjson
 import sentry_sdk
 from arroyo import Topic as ArroyoTopic
 from arroyo.backends.abstract import Producer
@@ -290,8 +289,7 @@ class SpanFlusher(ProcessingStrategy[FilteredPayload | int]):
                         if not flushed_segment.spans:
                             continue
 
-                        spans = [span.payload for span in flushed_segment.spans]
-                        kafka_payload = KafkaPayload(None, orjson.dumps({"spans": spans}), [])
+                        kafka_payload = KafkaPayload(None, flushed_segment.to_kafka_value(), [])
                         metrics.timing(
                             "spans.buffer.segment_size_bytes",
                             len(kafka_payload.value),
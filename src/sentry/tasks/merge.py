@@ -40,6 +40,7 @@ def merge_groups(
     **kwargs,
 ):
     # TODO(mattrobenolt): Write tests for all of this
+    from sentry.grouping.ingest.grouphash_cache import invalidate_grouphash_cache
     from sentry.models.activity import Activity
     from sentry.models.environment import Environment
     from sentry.models.eventattachment import EventAttachment
@@ -112,6 +113,9 @@ def merge_groups(
             model_list, group, new_group, logger=logger, transaction_id=transaction_id
         )
 
+        # Grouphashes may have moved to the new group, make sure ingest stops using stale links
+        invalidate_grouphash_cache(group.project_id)
+
         if not has_more:
             # There are no more objects to merge for *this* "from" group, remove it
             # from the list of "from" groups that are being merged, and finish the
@@ -1,9 +1,14 @@
 import logging
 import time
+from collections import defaultdict
+from collections.abc import Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
 
 import sentry_sdk
-from django.db import router, transaction
+from django.db import connections, router, transaction
 
+from sentry import options
 from sentry.models.organization import Organization
 from sentry.relay import projectconfig_cache, projectconfig_debounce_cache
 from sentry.silo.base import SiloMode
@@ -123,7 +128,9 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
     validate_args(organization_id, project_id, public_key)
     configs = {}
 
-    if organization_id:
+    if organization_id and options.get("relay.compute-configs.bulk"):
+        configs = compute_organization_configs_bulk(organization_id)
+    elif organization_id:
         # We want to re-compute all projects in an organization, instead of simply
         # removing the configs and rely on relay requests to lazily re-compute them.  This
         # is done because we do want want to delete project configs in `invalidate_project_config`
@@ -185,6 +192,96 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
     return configs
 
 
+def compute_organization_configs_bulk(organization_id: int) -> dict[str, Mapping[str, Any]]:
+    """Computes the configs of all cached keys of an organization, like :func:`compute_configs`.
+
+    Instead of going through the projects and keys one by one, all projects and keys are loaded
+    at once, the cache is checked for all keys with a single pipelined request and the
+    organization and project options are loaded once up front. Configs are then computed across
+    a pool of threads, one chunk of projects per thread.
+    """
+    from sentry.models.options.organization_option import OrganizationOption
+    from sentry.models.options.project_option import ProjectOption
+    from sentry.models.project import Project
+    from sentry.models.projectkey import ProjectKey
+
+    organization = Organization.objects.filter(id=organization_id).first()
+    if organization is None:
+        return {}
+
+    projects = {
+        project.id: project for project in Project.objects.filter(organization_id=organization_id)
+    }
+    keys = list(ProjectKey.objects.filter(project_id__in=projects.keys()))
+
+    # If we find the config in the cache it means it was active.  As such we want to
+    # recalculate it.  If the config was not there at all, we leave it and avoid the
+    # cost of re-computation.
+    cached_public_keys = projectconfig_cache.backend.exists_many(key.public_key for key in keys)
+
+    keys_by_project: dict[int, list[Any]] = defaultdict(list)
+    for key in keys:
+        if key.public_key in cached_public_keys:
+            keys_by_project[key.project_id].append(key)
+
+    recomputed = sum(len(project_keys) for project_keys in keys_by_project.values())
+    metrics.incr(
+        "relay.projectconfig_cache.invalidation.recompute",
+        amount=recomputed,
+        tags={"action": "recompute", "scope": "organization"},
+    )
+    metrics.incr(
+        "relay.projectconfig_cache.invalidation.recompute",
+        amount=len(keys) - recomputed,
+        tags={"action": "not-cached", "scope": "organization"},
+    )
+    if not keys_by_project:
+        return {}
+
+    for project_id, project_keys in keys_by_project.items():
+        project = projects[project_id]
+        project.set_cached_field_value("organization", organization)
+        for key in project_keys:
+            key.set_cached_field_value("project", project)
+
+    organization_options = OrganizationOption.objects.get_all_values(organization)
+    project_options: dict[int, dict[str, Any]] = {project_id: {} for project_id in keys_by_project}
+    for option in ProjectOption.objects.filter(project_id__in=keys_by_project.keys()):
+        project_options[option.project_id][option.key] = option.value
+
+    def compute_chunk(project_ids: Sequence[int]) -> dict[str, Mapping[str, Any]]:
+        # The option caches are thread local, so each thread needs to be primed on its own.
+        OrganizationOption.objects.populate_local_cache({organization.id: organization_options})
+        ProjectOption.objects.populate_local_cache(
+            {project_id: project_options[project_id] for project_id in project_ids}
+        )
+        return {
+            key.public_key: compute_projectkey_config(key)
+            for project_id in project_ids
+            for key in keys_by_project[project_id]
+        }
+
+    def compute_chunk_in_thread(project_ids: Sequence[int]) -> dict[str, Mapping[str, Any]]:
+        try:
+            return compute_chunk(project_ids)
+        finally:
+            # Don't leave the connections of the worker threads open.
+            connections.close_all()
+
+    project_ids = list(keys_by_project)
+    workers = min(options.get("relay.compute-configs.bulk-workers"), len(project_ids))
+    if workers <= 1:
+        return compute_chunk(project_ids)
+
+    configs: dict[str, Mapping[str, Any]] = {}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=__name__) as pool:
+        for chunk_configs in pool.map(
+            compute_chunk_in_thread, [project_ids[i::workers] for i in range(workers)]
+        ):
+            configs.update(chunk_configs)
+    return configs
+
+
 def compute_projectkey_config(key):
     """Computes a single config for the given :class:`ProjectKey`.
 
@@ -14,6 +14,7 @@ from sentry import analytics, eventstore, features, similarity, tsdb
 from sentry.analytics.events.eventuser_endpoint_request import EventUserEndpointRequest
 from sentry.constants import DEFAULT_LOGGER_NAME, LOG_LEVELS_MAP
 from sentry.culprit import generate_culprit
+from sentry.grouping.ingest.grouphash_cache import invalidate_grouphash_cache
 from sentry.models.activity import Activity
 from sentry.models.environment import Environment
 from sentry.models.eventattachment import EventAttachment
@@ -481,6 +482,8 @@ def lock_hashes(project_id, source_id, fingerprints):
             state=GroupHash.State.LOCKED_IN_MIGRATION
         )
 
+    invalidate_grouphash_cache(project_id)
+
     return [h.hash for h in eligible_hashes]
 
 
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+__all__ = ["benchmark_available"]
+
+
+def benchmark_available() -> bool:
+    """
+    Whether the `benchmark` fixture of pytest-benchmark can be used, which isn't installed in every
+    environment the tests run in.
+    """
+    try:
+        __import__("pytest_benchmark")
+    except ModuleNotFoundError:
+        return False
+    else:
+        return True
@@ -6,10 +6,11 @@ import logging
 import math
 import os
 import re
+import threading
 import time
 from collections import namedtuple
 from collections.abc import Callable, Collection, Mapping, MutableMapping, Sequence
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager
 from copy import deepcopy
 from datetime import datetime, timedelta, timezone
@@ -27,6 +28,7 @@ from snuba_sdk import Column, DeleteQuery, Function, MetricsQuery, Request
 from snuba_sdk.legacy import json_to_snql
 from snuba_sdk.query import SelectableExpression
 
+from sentry import options
 from sentry.api.helpers.error_upsampling import (
     UPSAMPLED_ERROR_AGGREGATION,
     are_any_projects_error_upsampled,
@@ -1143,7 +1145,9 @@ def _apply_cache_and_build_results(
         for query_pos, snuba_request in snuba_requests_list:
             to_query.append((query_pos, snuba_request, None))
 
-    if to_query:
+    if to_query and use_cache and options.get("snuba.query-coalescing.enabled"):
+        results.extend(_coalesced_bulk_snuba_query(to_query))
+    elif to_query:
         query_results = _bulk_snuba_query([item[1] for item in to_query])
         for result, (query_pos, _, opt_cache_key) in zip(query_results, to_query):
             if opt_cache_key:
@@ -1160,6 +1164,144 @@ def _apply_cache_and_build_results(
     return [result[1] for result in results]
 
 
+# Futures of the serialized results of the cached queries currently running in this process, by
+# cache key.
+_inflight_queries: dict[str, Future[str]] = {}
+_inflight_queries_lock = threading.Lock()
+
+
+def _get_stale_cache_key(cache_key: str) -> str:
+    return f"{cache_key}:stale"
+
+
+def _get_lease_cache_key(cache_key: str) -> str:
+    return f"{cache_key}:lease"
+
+
+def _serves_stale_results(snuba_request: SnubaRequest) -> bool:
+    return options.get("snuba.query-coalescing.stale-ttl-seconds") > 0 and any(
+        (snuba_request.referrer or "").startswith(prefix)
+        for prefix in options.get("snuba.query-coalescing.stale-referrer-prefixes")
+    )
+
+
+def _coalesced_bulk_snuba_query(
+    to_query: Sequence[tuple[int, SnubaRequest, str | None]],
+) -> list[tuple[int, Any]]:
+    """
+    Run cache misses, making sure that only one of several concurrent identical requests actually
+    goes to Snuba while the others wait for its result:
+
+    * within the process, by waiting on the future of the request already in flight,
+    * across processes, by taking a short lease in the cache and polling the cache for the result
+      while someone else holds it. Referrers which allow it get a stale result instead of waiting.
+
+    Whenever waiting doesn't produce a result in time, the request is sent to Snuba after all.
+    """
+    lease_seconds = options.get("snuba.query-coalescing.lease-seconds")
+    results: list[tuple[int, Any]] = []
+
+    owned: dict[str, Future[str]] = {}
+    to_follow: list[tuple[int, SnubaRequest, str, Future[str]]] = []
+    with _inflight_queries_lock:
+        for query_pos, snuba_request, cache_key in to_query:
+            assert cache_key is not None
+            future = _inflight_queries.get(cache_key)
+            if future is None:
+                future = owned[cache_key] = _inflight_queries[cache_key] = Future()
+            to_follow.append((query_pos, snuba_request, cache_key, future))
+
+    def run(items: Sequence[tuple[int, SnubaRequest, str]]) -> None:
+        if not items:
+            return
+
+        query_results = _bulk_snuba_query([snuba_request for _, snuba_request, _ in items])
+        for result, (query_pos, snuba_request, cache_key) in zip(query_results, items):
+            serialized = json.dumps(result)
+            cache.set(cache_key, serialized, settings.SENTRY_SNUBA_CACHE_TTL_SECONDS)
+            if _serves_stale_results(snuba_request):
+                cache.set(
+                    _get_stale_cache_key(cache_key),
+                    serialized,
+                    options.get("snuba.query-coalescing.stale-ttl-seconds"),
+                )
+            if cache_key in owned:
+                owned[cache_key].set_result(serialized)
+
+    try:
+        to_run: list[tuple[int, SnubaRequest, str]] = []
+        to_poll: list[tuple[int, SnubaRequest, str]] = []
+        seen_cache_keys = set()
+        for query_pos, snuba_request, cache_key, future in to_follow:
+            # Identical requests within this batch all wait for the first one
+            if cache_key not in owned or cache_key in seen_cache_keys:
+                continue
+            seen_cache_keys.add(cache_key)
+            if cache.add(_get_lease_cache_key(cache_key), 1, lease_seconds):
+                to_run.append((query_pos, snuba_request, cache_key))
+                continue
+
+            stale_result = (
+                cache.get(_get_stale_cache_key(cache_key))
+                if _serves_stale_results(snuba_request)
+                else None
+            )
+            if stale_result is not None:
+                metrics.incr("snuba.query_cache.coalesced", tags={"source": "stale"})
+                future.set_result(stale_result)
+            else:
+                to_poll.append((query_pos, snuba_request, cache_key))
+
+        try:
+            run(to_run)
+        finally:
+            cache.delete_many([_get_lease_cache_key(cache_key) for _, _, cache_key in to_run])
+
+        # Someone else in another process is running these, wait for them to show up in the cache
+        deadline = time.time() + lease_seconds
+        while to_poll and time.time() < deadline:
+            time.sleep(options.get("snuba.query-coalescing.poll-interval-seconds"))
+            cached = cache.get_many([cache_key for _, _, cache_key in to_poll])
+            for _, _, cache_key in to_poll:
+                if cache_key in cached:
+                    metrics.incr("snuba.query_cache.coalesced", tags={"source": "remote"})
+                    owned[cache_key].set_result(cached[cache_key])
+            to_poll = [item for item in to_poll if item[2] not in cached]
+
+        run(to_poll)
+    except Exception as e:
+        for future in owned.values():
+            if not future.done():
+                future.set_exception(e)
+        raise
+    finally:
+        with _inflight_queries_lock:
+            for cache_key in owned:
+                _inflight_queries.pop(cache_key, None)
+
+    # Wait for the requests already in flight in this process last, so that requests waiting on
+    # each other don't block on one another.
+    to_retry: list[tuple[int, SnubaRequest, str | None]] = []
+    for query_pos, snuba_request, cache_key, future in to_follow:
+        try:
+            serialized = future.result(timeout=None if cache_key in owned else lease_seconds)
+        except Exception:
+            to_retry.append((query_pos, snuba_request, None))
+            continue
+
+        if cache_key not in owned:
+            metrics.incr("snuba.query_cache.coalesced", tags={"source": "local"})
+        results.append((query_pos, json.loads(serialized)))
+
+    if to_retry:
+        query_results = _bulk_snuba_query([snuba_request for _, snuba_request, _ in to_retry])
+        results.extend(
+            (query_pos, result) for result, (query_pos, _, _) in zip(query_results, to_retry)
+        )
+
+    return results
+
+
 def _is_rejected_query(body: Any) -> bool:
     return (
         "quota_allowance" in body
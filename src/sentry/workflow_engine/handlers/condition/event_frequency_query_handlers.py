@@ -21,6 +21,7 @@ from sentry.rules.conditions.event_frequency import (
     PERCENT_INTERVALS,
     SNUBA_LIMIT,
     STANDARD_INTERVALS,
+    get_shared_frequency_results,
 )
 from sentry.rules.match import MatchType
 from sentry.tsdb.base import SnubaCondition, TSDBKey, TSDBModel
@@ -134,26 +135,40 @@ class BaseEventFrequencyQueryHandler(ABC):
         group_on_time: bool = False,
         project_ids: list[int] | None = None,
     ) -> dict[int, int]:
-        batch_totals: dict[int, int] = defaultdict(int)
-        group_id = group_ids[0]
         conditions = self.get_extra_snuba_conditions(model, filters) if filters else []
-        for group_chunk in chunked(group_ids, SNUBA_LIMIT):
-            result = self.get_snuba_query_result(
-                tsdb_function=tsdb_function,
-                model=model,
-                keys=[group_id for group_id in group_chunk],
-                group_id=group_id,
-                organization_id=organization_id,
-                start=start,
-                end=end,
-                environment_id=environment_id,
-                referrer_suffix=referrer_suffix,
-                conditions=conditions,
-                group_on_time=group_on_time,
-                project_ids=project_ids,
-            )
-            batch_totals.update(result)
-        return batch_totals
+
+        def query(group_ids: list[int], start: datetime, end: datetime) -> dict[int, int]:
+            batch_totals: dict[int, int] = defaultdict(int)
+            group_id = group_ids[0]
+            for group_chunk in chunked(group_ids, SNUBA_LIMIT):
+                result = self.get_snuba_query_result(
+                    tsdb_function=tsdb_function,
+                    model=model,
+                    keys=[group_id for group_id in group_chunk],
+                    group_id=group_id,
+                    organization_id=organization_id,
+                    start=start,
+                    end=end,
+                    environment_id=environment_id,
+                    referrer_suffix=referrer_suffix,
+                    conditions=conditions,
+                    group_on_time=group_on_time,
+                    project_ids=project_ids,
+                )
+                batch_totals.update(result)
+            return batch_totals
+
+        return get_shared_frequency_results(
+            query,
+            tsdb_function=tsdb_function,
+            model=model,
+            group_ids=group_ids,
+            start=start,
+            end=end,
+            environment_id=environment_id,
+            group_on_time=group_on_time,
+            conditions=conditions,
+        )
 
     def get_group_ids_by_category(
         self,
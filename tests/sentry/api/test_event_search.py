@@ -15,6 +15,7 @@ from sentry.api.event_search import (
     SearchFilter,
     SearchKey,
     SearchValue,
+    _parse_cached_query_tree,
     _RecursiveList,
     default_config,
     flatten,
@@ -24,6 +25,7 @@ from sentry.api.event_search import (
 from sentry.constants import MODULE_ROOT
 from sentry.exceptions import InvalidSearchQuery
 from sentry.search.utils import parse_datetime_string, parse_duration, parse_numeric_value
+from sentry.testutils.helpers.benchmark import benchmark_available
 from sentry.testutils.helpers.datetime import freeze_time
 from sentry.utils import json
 
@@ -520,6 +522,39 @@ class ParseSearchQueryBackendTest(SimpleTestCase):
                 SearchFilter(key=SearchKey(name="random"), operator="=", value=SearchValue("-2w"))
             ]
 
+    def test_parse_tree_cache(self) -> None:
+        _parse_cached_query_tree.cache_clear()
+        now = timezone.now()
+
+        with freeze_time(now):
+            assert parse_search_query("time:-2w") == [
+                SearchFilter(
+                    key=SearchKey(name="time"),
+                    operator=">=",
+                    value=SearchValue(raw_value=now - timedelta(days=14)),
+                )
+            ]
+
+        # The parse tree is reused, but relative dates are still resolved on every call
+        with freeze_time(now + timedelta(days=1)):
+            assert parse_search_query("time:-2w") == [
+                SearchFilter(
+                    key=SearchKey(name="time"),
+                    operator=">=",
+                    value=SearchValue(raw_value=now - timedelta(days=13)),
+                )
+            ]
+        assert _parse_cached_query_tree.cache_info().hits == 1
+
+        # So is the config
+        assert parse_search_query(
+            "foo:bar", config=SearchConfig(key_mappings={"baz": ["foo"]})
+        ) == [SearchFilter(key=SearchKey(name="baz"), operator="=", value=SearchValue("bar"))]
+        assert parse_search_query("foo:bar") == [
+            SearchFilter(key=SearchKey(name="foo"), operator="=", value=SearchValue("bar"))
+        ]
+        assert _parse_cached_query_tree.cache_info().hits == 2
+
     def test_invalid_rel_time_filter(self) -> None:
         with pytest.raises(InvalidSearchQuery) as excinfo:
             parse_search_query(f'time:+{"1" * 9999}d')
@@ -1099,3 +1134,20 @@ def test_handles_special_character_in_tags_and_flags(query, key, value) -> None:
 def test_handles_has_tags_and_flags(query, key) -> None:
     parsed = parse_search_query(query)
     assert parsed == [SearchFilter(SearchKey(key), "!=", SearchValue(""))]
+
+
+@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+def test_benchmark_parse_search_query(benchmark) -> None:
+    queries = []
+    for file in os.listdir(abs_fixtures_path):
+        with open(os.path.join(abs_fixtures_path, file)) as fp:
+            queries.extend(case["query"] for case in json.load(fp) if not case.get("raisesError"))
+
+    def run_parse_search_query() -> None:
+        for query in queries:
+            try:
+                parse_search_query(query)
+            except InvalidSearchQuery:
+                pass
+
+    benchmark(run_parse_search_query)
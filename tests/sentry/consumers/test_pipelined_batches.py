@@ -0,0 +1,154 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+from arroyo.processing.strategies import MessageRejected
+from arroyo.types import Message, Partition, Topic, Value
+
+from sentry.consumers.pipelined_batches import PipelinedBatchStep, PreparedBatch
+
+PARTITION = Partition(Topic("test"), 0)
+
+
+def make_batch(offset: int) -> Message:
+    return Message(Value([], {PARTITION: offset}))
+
+
+def committed_offsets(next_step: mock.Mock) -> list[int]:
+    return [call.args[0].committable[PARTITION] for call in next_step.submit.call_args_list]
+
+
+def poll_until(step: PipelinedBatchStep, predicate, timeout: float = 5.0) -> None:
+    for _ in range(int(timeout / 0.01)):
+        step.poll()
+        if predicate():
+            return
+        time.sleep(0.01)
+    raise AssertionError("condition not met")
+
+
+def test_pipelines_batches_and_preserves_order_per_key() -> None:
+    release_slow = threading.Event()
+    processed: list[tuple[str, int]] = []
+    completed: list[int] = []
+
+    def work(key: str, batch: int) -> None:
+        if (key, batch) == ("a", 1):
+            release_slow.wait(5)
+        processed.append((key, batch))
+
+    batches = {
+        1: PreparedBatch(
+            groups={"a": lambda: work("a", 1), "b": lambda: work("b", 1)},
+            on_done=lambda: completed.append(1),
+        ),
+        2: PreparedBatch(
+            groups={"b": lambda: work("b", 2), "a": lambda: work("a", 2)},
+            on_done=lambda: completed.append(2),
+        ),
+    }
+
+    next_step = mock.Mock()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        step = PipelinedBatchStep(
+            name="test",
+            executor=executor,
+            prepare_batch=lambda message: batches[message.committable[PARTITION]],
+            next_step=next_step,
+            max_pending_batches=5,
+            max_pending_groups=100,
+        )
+        step.submit(make_batch(1))
+        step.submit(make_batch(2))
+
+        # The second batch starts while the slow group of the first one is still running, but the
+        # group with the same key has to wait for it
+        poll_until(step, lambda: ("b", 2) in processed)
+        assert ("a", 1) not in processed
+        assert ("a", 2) not in processed
+        assert committed_offsets(next_step) == []
+
+        release_slow.set()
+        poll_until(step, lambda: len(committed_offsets(next_step)) == 2)
+
+    assert processed.index(("a", 1)) < processed.index(("a", 2))
+    assert processed.index(("b", 1)) < processed.index(("b", 2))
+    assert completed == [1, 2]
+    assert committed_offsets(next_step) == [1, 2]
+
+
+def test_backpressure() -> None:
+    release = threading.Event()
+
+    def work() -> None:
+        release.wait(5)
+
+    next_step = mock.Mock()
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        step = PipelinedBatchStep(
+            name="test",
+            executor=executor,
+            prepare_batch=lambda message: PreparedBatch(groups={"a": work}),
+            next_step=next_step,
+            max_pending_batches=1,
+            max_pending_groups=100,
+        )
+        step.submit(make_batch(1))
+
+        with pytest.raises(MessageRejected):
+            step.submit(make_batch(2))
+
+        release.set()
+        poll_until(step, lambda: committed_offsets(next_step) == [1])
+        step.submit(make_batch(2))
+        step.join(5)
+
+    assert committed_offsets(next_step) == [1, 2]
+
+
+def test_submit_forwards_completed_batches() -> None:
+    next_step = mock.Mock()
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        step = PipelinedBatchStep(
+            name="test",
+            executor=executor,
+            prepare_batch=lambda message: PreparedBatch(groups={"a": lambda: None}),
+            next_step=next_step,
+            max_pending_batches=1,
+            max_pending_groups=100,
+        )
+        step.submit(make_batch(1))
+        # Wait for the group without polling, the way arroyo submits while flushing on shutdown
+        for _ in range(500):
+            if step.pending_groups == 0:
+                break
+            time.sleep(0.01)
+
+        step.submit(make_batch(2))
+        step.join(5)
+
+    assert committed_offsets(next_step) == [1, 2]
+
+
+def test_failing_group_does_not_block_commit() -> None:
+    def fail() -> None:
+        raise ValueError("bad group")
+
+    next_step = mock.Mock()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        step = PipelinedBatchStep(
+            name="test",
+            executor=executor,
+            prepare_batch=lambda message: PreparedBatch(groups={"a": fail, "b": lambda: None}),
+            next_step=next_step,
+            max_pending_batches=5,
+            max_pending_groups=100,
+        )
+        step.submit(make_batch(1))
+        step.join(5)
+
+    assert committed_offsets(next_step) == [1]
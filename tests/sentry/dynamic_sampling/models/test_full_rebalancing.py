@@ -0,0 +1,34 @@
+import pytest
+
+from sentry.dynamic_sampling.models.common import RebalancedItem
+from sentry.dynamic_sampling.models.full_rebalancing import (
+    FullRebalancingInput,
+    FullRebalancingModel,
+    rebalance_counts,
+)
+
+
+def test_rebalance_counts() -> None:
+    rates, used = rebalance_counts([90, 10, 1, 0.5], sample_rate=0.1, intensity=1.0)
+
+    # The smallest classes are fully sampled, the rest share the remaining budget.
+    assert rates == [pytest.approx(0.0480556), pytest.approx(0.4325), 1.0, 1.0]
+    assert used == pytest.approx(101.5 * 0.1)
+
+
+def test_full_rebalancing_model_matches_counts() -> None:
+    classes = [RebalancedItem(id=i, count=1000 / (i + 1)) for i in range(100)]
+    rates, used = rebalance_counts(
+        [element.count for element in classes], sample_rate=0.2, intensity=0.5, min_budget=30.0
+    )
+
+    items, model_used = FullRebalancingModel().run(
+        FullRebalancingInput(classes=classes, sample_rate=0.2, intensity=0.5, min_budget=30.0)
+    )
+
+    # The model returns the classes in the order they have been processed, i.e. from the last.
+    assert items == [
+        RebalancedItem(id=element.id, count=element.count, new_sample_rate=rate)
+        for element, rate in zip(reversed(classes), reversed(rates))
+    ]
+    assert model_used == used
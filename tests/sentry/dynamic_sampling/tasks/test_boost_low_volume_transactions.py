@@ -1,10 +1,15 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
+from typing import Any
+from unittest import mock
 
 from django.utils import timezone
 
 from sentry.dynamic_sampling.tasks.boost_low_volume_transactions import (
     FetchProjectTransactionTotals,
     FetchProjectTransactionVolumes,
+    PagedQuery,
     ProjectIdentity,
     ProjectTransactions,
     ProjectTransactionsTotals,
@@ -280,6 +285,65 @@ def test_transactions_zip() -> None:
     assert actual == expected
 
 
+@mock.patch("sentry.dynamic_sampling.tasks.boost_low_volume_transactions.CHUNK_SIZE", 2)
+def test_paged_query_prefetches_next_page() -> None:
+    pages = {
+        0: [{"row": 0}, {"row": 1}, {"row": 2}],
+        2: [{"row": 2}, {"row": 3}, {"row": 4}],
+        4: [{"row": 4}],
+    }
+    fetched_second_page = threading.Event()
+
+    def fetch_page(offset: int) -> list[dict[str, Any]]:
+        if offset == 2:
+            fetched_second_page.set()
+        return pages[offset]
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        paged_query = PagedQuery(fetch_page, executor)
+
+        rows = paged_query.next_page()
+        # the second page is requested without waiting for the caller
+        assert fetched_second_page.wait(5)
+        while paged_query.has_more_results:
+            rows += paged_query.next_page()
+
+    assert rows == [{"row": i} for i in range(5)]
+    assert paged_query.next_page() == []
+
+
+@mock.patch("sentry.dynamic_sampling.tasks.boost_low_volume_transactions.CHUNK_SIZE", 2)
+def test_fetch_transaction_volumes_project_across_pages() -> None:
+    def row(project_id: int, name: str, count: int) -> dict[str, Any]:
+        return {
+            "org_id": 1,
+            "project_id": project_id,
+            "transaction_name": name,
+            "num_transactions": count,
+        }
+
+    pages = {
+        0: [row(1, "a", 10), row(2, "b", 9), row(2, "c", 8)],
+        2: [row(2, "c", 8), row(2, "d", 7), row(3, "e", 6)],
+        4: [row(3, "e", 6)],
+    }
+
+    with mock.patch.object(
+        FetchProjectTransactionVolumes, "_fetch_page", side_effect=lambda offset: pages[offset]
+    ):
+        actual = [
+            (volumes["project_id"], volumes["transaction_counts"])
+            for volumes in FetchProjectTransactionVolumes([1], True, 10)
+        ]
+
+    # the transactions of project 2 are split across the first two pages
+    assert actual == [
+        (1, [("a", 10.0)]),
+        (2, [("b", 9.0), ("c", 8.0), ("d", 7.0)]),
+        (3, [("e", 6.0)]),
+    ]
+
+
 def test_same_project() -> None:
     p1: ProjectIdentity = {"project_id": 1, "org_id": 2}
     p1bis: ProjectIdentity = {"project_id": 1, "org_id": 2}
@@ -149,6 +149,77 @@ class EventManagerTest(TestCase, SnubaTestCase, EventManagerTestMixin, Performan
 
         assert eventstream_insert.call_count == 2
 
+    @mock.patch("sentry.event_manager.eventstream.backend.insert")
+    def test_save_many(self, eventstream_insert: mock.MagicMock) -> None:
+        managers = [
+            EventManager(make_event(message="foo", release="1.0", fingerprint=["group-1"])),
+            EventManager(make_event(message="bar", release="1.0", fingerprint=["group-1"])),
+            EventManager(make_event(message="baz", fingerprint=["group-2"])),
+        ]
+
+        events = EventManager.save_many(managers, self.project.id)
+
+        assert len(events) == 3
+        assert events[0].group_id == events[1].group_id
+        assert events[0].group_id != events[2].group_id
+        assert events[0].get_tag("sentry:release") == "1.0"
+        assert events[2].get_tag("sentry:release") is None
+        assert Release.objects.filter(version="1.0").count() == 1
+        assert eventstream_insert.call_count == 3
+
+        for event in events:
+            node_id = Event.generate_node_id(self.project.id, event.event_id)
+            assert nodestore.backend.get(node_id)["event_id"] == event.event_id
+
+    def test_save_many_batches_tsdb_increments(self) -> None:
+        managers = [
+            EventManager(make_event(message="foo", environment="prod", fingerprint=["group-1"])),
+            EventManager(make_event(message="bar", environment="prod", fingerprint=["group-1"])),
+            EventManager(make_event(message="baz", environment="dev", fingerprint=["group-1"])),
+        ]
+
+        with mock.patch.object(
+            tsdb.backend, "incr_multi", wraps=tsdb.backend.incr_multi
+        ) as incr_multi:
+            events = EventManager.save_many(managers, self.project.id)
+
+        assert incr_multi.call_count == 2
+        environment_ids = {call.kwargs["environment_id"] for call in incr_multi.call_args_list}
+        assert environment_ids == {
+            Environment.objects.get(name=name, organization_id=self.project.organization_id).id
+            for name in ("prod", "dev")
+        }
+        assert sum(len(call.args[0]) for call in incr_multi.call_args_list) == 6
+        assert len({event.group_id for event in events}) == 1
+
+    def test_save_many_drops_discarded_events(self) -> None:
+        event = EventManager(make_event(message="foo", fingerprint=["a" * 32])).save(
+            self.project.id
+        )
+        group = Group.objects.get(id=event.group_id)
+        tombstone = GroupTombstone.objects.create(
+            project_id=group.project_id,
+            level=group.level,
+            message=group.message,
+            culprit=group.culprit,
+            data=group.data,
+            previous_group_id=group.id,
+        )
+        GroupHash.objects.filter(group=group).update(group=None, group_tombstone_id=tombstone.id)
+
+        managers = [
+            EventManager(make_event(message="foo", fingerprint=["a" * 32])),
+            EventManager(make_event(message="bar", fingerprint=["b" * 32])),
+        ]
+        events = EventManager.save_many(managers, self.project.id)
+
+        assert [e.event_id for e in events] == [managers[1].get_data()["event_id"]]
+
+    def test_save_many_rejects_transactions(self) -> None:
+        manager = EventManager(make_event(type="transaction", transaction="/dogs/"))
+        with pytest.raises(ValueError):
+            EventManager.save_many([manager], self.project.id)
+
     def test_materialze_metadata_simple(self) -> None:
         manager = EventManager(make_event(transaction="/dogs/are/great/"))
         event = manager.save(self.project.id)
@@ -59,6 +59,25 @@ register_grouping_config(
     initial_context={"normalize_message": False},
 )
 
+# Messages as commonly seen in events, for parameterization tests and benchmarks.
+REAL_WORLD_MESSAGES = [
+    "Something went wrong",
+    "Connection reset by peer",
+    "Object reference not set to an instance of an object",
+    "TypeError: Cannot read properties of undefined (reading 'map')",
+    "Failed to fetch user 8123 from https://api.example.com/v1/users/8123?expand=true",
+    "Timeout after 3000ms waiting for 10.2.14.7:6379",
+    'duplicate key value violates unique constraint "sentry_grouphash_project_id_hash"',
+    "Request 7c1811ed-e98f-4c9c-a9f9-58c757ff494f failed with status=503 retry=false",
+    "Job deadbeefdeadbeefdeadbeefdeadbeefdeadbeef exceeded 2.5s budget on worker-12",
+    "ValueError: invalid literal for int() with base 10: 'abc'",
+    "User john.doe@example.com not authorized for org_id=123 at 2024-02-20T22:16:36Z",
+    "Unexpected token ٣ in JSON at position ٤",
+    "abcdefabcdefabcdefabcdefabcdefab",
+    "Invalid timestamp datetime datetime(x) in payload",
+    "Invalid timestamp datetime_datetime(x) in payload",
+]
+
 
 class GroupingInput:
     def __init__(self, inputs_dir: str, filename: str):
@@ -3,10 +3,14 @@ from typing import Any
 
 import pytest
 
+from sentry.grouping.parameterization import Parameterizer
 from sentry.grouping.strategies.configurations import GROUPING_CONFIG_CLASSES
+from sentry.grouping.strategies.message import REGEX_PATTERN_KEYS
+from sentry.testutils.helpers.benchmark import benchmark_available
 from tests.sentry.grouping import (
     GROUPING_INPUTS_DIR,
     NO_MSG_PARAM_CONFIG,
+    REAL_WORLD_MESSAGES,
     GroupingInput,
     get_grouping_inputs,
 )
@@ -14,15 +18,6 @@ from tests.sentry.grouping import (
 GROUPING_INPUTS = get_grouping_inputs(GROUPING_INPUTS_DIR)
 
 
-def benchmark_available() -> bool:
-    try:
-        __import__("pytest_benchmark")
-    except ModuleNotFoundError:
-        return False
-    else:
-        return True
-
-
 @pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
 @pytest.mark.parametrize(
     "config_name",
@@ -46,3 +41,15 @@ def run_configuration(grouping_input: GroupingInput, config_name: str) -> None:
     event.project = None  # type: ignore[assignment]
 
     event.get_hashes()
+
+
+@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+@pytest.mark.parametrize("experimental", [False, True], ids=["default", "experimental"])
+def test_benchmark_parameterization(experimental: bool, benchmark: ModuleType) -> None:
+    def run_parameterization() -> None:
+        for message in REAL_WORLD_MESSAGES:
+            Parameterizer(
+                regex_pattern_keys=REGEX_PATTERN_KEYS, experimental=experimental
+            ).parameterize_all(message)
+
+    benchmark(run_parameterization)
@@ -692,6 +692,26 @@ class EnhancementsTest(TestCase):
         # Rules didn't have to be split again because they were cached in split form
         assert split_rules_spy.call_count == 1
 
+    def test_reuses_enhancements_decoded_from_same_base64_string(self) -> None:
+        base64_string = Enhancements.from_rules_text(
+            "function:playFetch +app +group", version=3
+        ).base64_string
+
+        with patch(
+            "sentry.grouping.enhancer.Enhancements._get_config_from_base64_bytes",
+            wraps=Enhancements._get_config_from_base64_bytes,
+        ) as decode_spy:
+            enhancements = Enhancements.from_base64_string(base64_string)
+            decode_count = decode_spy.call_count
+
+            assert Enhancements.from_base64_string(base64_string) is enhancements
+            assert Enhancements.from_base64_string(base64_string.encode("ascii")) is enhancements
+            # Loading it again didn't require decoding anything
+            assert decode_spy.call_count == decode_count
+
+        other_base64_string = Enhancements.from_rules_text("function:playFetch -app").base64_string
+        assert Enhancements.from_base64_string(other_base64_string) is not enhancements
+
     def test_uses_default_enhancements_when_loading_string_with_invalid_version(self) -> None:
         enhancements = Enhancements.from_rules_text("function:playFetch +app")
         assert len(enhancements.rules) == 1
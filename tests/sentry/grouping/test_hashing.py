@@ -3,12 +3,21 @@ from __future__ import annotations
 from time import time
 from unittest.mock import MagicMock, patch
 
+from django.core.cache import cache
+
 from sentry.conf.server import DEFAULT_GROUPING_CONFIG
 from sentry.grouping.api import GroupingConfig
+from sentry.grouping.ingest.grouphash_cache import (
+    _get_generation_key,
+    get_grouphash_cache_generation,
+    grouphash_cache,
+    invalidate_grouphash_cache,
+)
 from sentry.grouping.ingest.hashing import (
     _calculate_event_grouping,
     _calculate_primary_hashes_and_variants,
     _calculate_secondary_hashes,
+    bulk_get_grouphashes,
     get_or_create_grouphashes,
 )
 from sentry.grouping.variants import BaseVariant
@@ -236,3 +245,97 @@ class SecondaryGroupingTest(TestCase):
         # We used the known primary config, but skipped the unknown secondary one
         assert mock_calculate_primary_hashes.call_count == 1
         assert mock_calculate_secondary_hashes.call_count == 0
+
+
+@override_options({"grouping.grouphash_cache.enabled": True})
+class GroupHashCacheTest(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        grouphash_cache.clear()
+
+    def tearDown(self) -> None:
+        grouphash_cache.clear()
+        super().tearDown()
+
+    def test_bulk_get_grouphashes(self) -> None:
+        event = save_new_event({"message": "Dogs are great!"}, self.project)
+        grouphash = GroupHash.objects.get(project=self.project, hash=event.get_primary_hash())
+
+        grouphashes = bulk_get_grouphashes(self.project, [grouphash.hash, "not-a-real-hash"])
+
+        assert list(grouphashes) == [grouphash.hash]
+        assert grouphashes[grouphash.hash].id == grouphash.id
+        assert grouphashes[grouphash.hash].group_id == event.group_id
+
+    def test_serves_hot_hashes_from_cache(self) -> None:
+        event = save_new_event({"message": "Dogs are great!"}, self.project)
+        hash_value = event.get_primary_hash()
+
+        # The first lookup warms the cache, the second shouldn't need the database at all
+        bulk_get_grouphashes(self.project, [hash_value])
+        with self.assertNumQueries(0):
+            grouphashes = bulk_get_grouphashes(self.project, [hash_value])
+
+        assert grouphashes[hash_value].group_id == event.group_id
+
+    def test_events_still_group_together_with_cache(self) -> None:
+        event = save_new_event({"message": "Dogs are great!"}, self.project)
+        event2 = save_new_event({"message": "Dogs are great!"}, self.project)
+        event3 = save_new_event({"message": "Dogs are great!"}, self.project)
+
+        assert event.group_id == event2.group_id == event3.group_id
+        assert len(grouphash_cache) == 1
+
+    def test_invalidation(self) -> None:
+        event = save_new_event({"message": "Dogs are great!"}, self.project)
+        hash_value = event.get_primary_hash()
+        bulk_get_grouphashes(self.project, [hash_value])
+
+        new_group = self.create_group(project=self.project)
+        GroupHash.objects.filter(project=self.project, hash=hash_value).update(group=new_group)
+        invalidate_grouphash_cache(self.project.id)
+
+        grouphashes = bulk_get_grouphashes(self.project, [hash_value])
+        assert grouphashes[hash_value].group_id == new_group.id
+
+    def test_evicted_generation_does_not_revive_entries(self) -> None:
+        event = save_new_event({"message": "Dogs are great!"}, self.project)
+        hash_value = event.get_primary_hash()
+        bulk_get_grouphashes(self.project, [hash_value])
+
+        new_group = self.create_group(project=self.project)
+        GroupHash.objects.filter(project=self.project, hash=hash_value).update(group=new_group)
+        invalidate_grouphash_cache(self.project.id)
+        # The token is evicted from the shared cache before the next lookup
+        cache.delete(_get_generation_key(self.project.id))
+
+        grouphashes = bulk_get_grouphashes(self.project, [hash_value])
+        assert grouphashes[hash_value].group_id == new_group.id
+
+    def test_does_not_cache_tombstoned_hashes(self) -> None:
+        event = save_new_event({"message": "Dogs are great!"}, self.project)
+        hash_value = event.get_primary_hash()
+        GroupHash.objects.filter(project=self.project, hash=hash_value).update(
+            group=None, group_tombstone_id=1
+        )
+
+        bulk_get_grouphashes(self.project, [hash_value])
+
+        assert len(grouphash_cache) == 0
+
+    @override_options({"grouping.grouphash_cache.max_size": 2})
+    def test_evicts_least_recently_used(self) -> None:
+        hashes = [
+            save_new_event(
+                {"message": "Dogs are great!", "fingerprint": [str(i)]}, self.project
+            ).get_primary_hash()
+            for i in range(3)
+        ]
+        for hash_value in hashes:
+            bulk_get_grouphashes(self.project, [hash_value])
+
+        generation = get_grouphash_cache_generation(self.project.id)
+        assert generation is not None
+        assert len(grouphash_cache) == 2
+        assert grouphash_cache.get_many(self.project.id, hashes[:1], generation) == {}
+        assert list(grouphash_cache.get_many(self.project.id, hashes[1:], generation)) == hashes[1:]
@@ -1,7 +1,11 @@
+import re
+from unittest import mock
+
 import pytest
 
 from sentry.grouping.parameterization import Parameterizer
 from sentry.grouping.strategies.message import REGEX_PATTERN_KEYS
+from tests.sentry.grouping import REAL_WORLD_MESSAGES
 
 
 @pytest.fixture
@@ -177,3 +181,55 @@ def test_too_aggressive_parameterize(
     name: str, input: str, expected: str, parameterizer: Parameterizer
 ) -> None:
     assert expected == parameterizer.parameterize_all(input), f"Case {name} Failed"
+
+
+def _reference_parameterize(parameterizer: Parameterizer, content: str) -> str:
+    """Parameterize without any of the fast paths, the way the parameterizer originally worked."""
+
+    def _handle_regex_match(match: re.Match[str]) -> str:
+        for key, value in match.groupdict().items():
+            if value is not None:
+                return f"<{key}>"
+        return ""
+
+    return parameterizer._parameterization_regex.sub(_handle_regex_match, content)
+
+
+@pytest.mark.parametrize(
+    "content",
+    [case[1] for case in standard_cases] + REAL_WORLD_MESSAGES,
+)
+def test_fast_paths_produce_identical_output(content: str, parameterizer: Parameterizer) -> None:
+    for variant in [content, f"prefix {content}", f"{content} suffix", f"x{content}x"]:
+        assert parameterizer.parameterize_all(variant) == _reference_parameterize(
+            parameterizer, variant
+        )
+
+
+def test_skips_content_which_cannot_match(parameterizer: Parameterizer) -> None:
+    with mock.patch.object(parameterizer, "_parameterization_regex") as regex:
+        assert parameterizer.parameterize_all("Something went wrong") == "Something went wrong"
+        assert regex.sub.call_count == 0
+
+        parameterizer.parameterize_all("Something went wrong 3 times")
+        assert regex.sub.call_count == 1
+
+
+def test_parameterizes_datetime_repr_without_digits(parameterizer: Parameterizer) -> None:
+    # The `.` in `datetime.datetime(...)` matches any character
+    assert (
+        parameterizer.parameterize_all("Invalid timestamp datetime datetime(x) in payload")
+        == "Invalid timestamp <date> in payload"
+    )
+
+
+def test_counts_matches(parameterizer: Parameterizer) -> None:
+    parameterizer.parameterize_all("User 12 at 10.0.0.1 and user 13 at 10.0.0.2")
+    assert parameterizer.matches_counter == {"int": 2, "ip": 2}
+
+
+def test_shares_compiled_regex() -> None:
+    assert (
+        Parameterizer(regex_pattern_keys=REGEX_PATTERN_KEYS)._parameterization_regex
+        is Parameterizer(regex_pattern_keys=REGEX_PATTERN_KEYS)._parameterization_regex
+    )
@@ -20,6 +20,8 @@ from sentry.issues.occurrence_consumer import (
     InvalidEventPayloadError,
     _get_kwargs,
     _process_message,
+    is_rate_limited,
+    leased_rate_limiter,
     process_occurrence_group,
 )
 from sentry.issues.producer import _prepare_status_change_message
@@ -299,6 +301,26 @@ class IssueOccurrenceProcessMessageTest(IssueOccurrenceTestBase):
         occurrence = result[0]
         assert occurrence is not None
 
+    def test_rate_limit_leased(self) -> None:
+        fingerprint = uuid.uuid4().hex
+        with (
+            self.options(
+                {
+                    "issues.occurrence-consumer.rate-limit.enabled": True,
+                    "issues.occurrence-consumer.rate-limit.leased": True,
+                }
+            ),
+            mock.patch.object(
+                leased_rate_limiter,
+                "check_within_quotas",
+                wraps=leased_rate_limiter.check_within_quotas,
+            ) as check_within_quotas,
+        ):
+            assert not is_rate_limited(self.project.id, fingerprint)
+            # served from the quota leased by the first call
+            assert not is_rate_limited(self.project.id, fingerprint)
+        assert check_within_quotas.call_count == 1
+
     def test_occurrence_rate_limit_quota(self) -> None:
         rate_limit_quota = Quota(**options.get("issues.occurrence-consumer.rate-limit.quota"))
         assert rate_limit_quota.window_seconds == 3600
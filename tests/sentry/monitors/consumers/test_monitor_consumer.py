@@ -8,7 +8,7 @@ from unittest import mock
 import msgpack
 from arroyo.backends.kafka import KafkaPayload
 from arroyo.processing.strategies import ProcessingStrategy
-from arroyo.types import BrokerValue, Message, Partition, Topic
+from arroyo.types import BrokerValue, Message, Partition, Topic, Value
 from django.conf import settings
 from django.test.utils import override_settings
 from rest_framework.exceptions import ErrorDetail
@@ -19,7 +19,11 @@ from sentry.constants import ObjectStatus
 from sentry.db.models import BoundedPositiveIntegerField
 from sentry.models.environment import Environment
 from sentry.monitors.constants import TIMEOUT, PermitCheckInStatus
-from sentry.monitors.consumers.monitor_consumer import StoreMonitorCheckInStrategyFactory
+from sentry.monitors.consumers.monitor_consumer import (
+    StoreMonitorCheckInStrategyFactory,
+    preload_monitors,
+    prepare_batch,
+)
 from sentry.monitors.models import (
     CheckInStatus,
     Monitor,
@@ -251,6 +255,86 @@ class MonitorConsumerTest(TestCase):
         # The last group is monitor_2 but with a diff environment
         assert group_3[0].payload.get("environment") == "test"
 
+    @override_options({"crons.consumer.preload-monitors": True})
+    def test_parallel_preload_monitors(self) -> None:
+        consumer = self.create_consumer(
+            {"mode": "batched-parallel", "max_batch_size": 4, "max_workers": 1}
+        )
+
+        monitor_1 = self._create_monitor(slug="my-monitor-1")
+        monitor_2 = self._create_monitor(slug="my-monitor-2")
+
+        with mock.patch(
+            "sentry.monitors.consumers.monitor_consumer.Monitor.objects.get",
+            side_effect=AssertionError("monitor should be preloaded"),
+        ):
+            self.send_checkin(monitor_1.slug, consumer=consumer, status="in_progress")
+            guid_1 = self.guid
+            self.send_checkin(monitor_1.slug, guid=guid_1, consumer=consumer)
+            self.send_checkin(monitor_2.slug, consumer=consumer)
+            guid_2 = self.guid
+            self.send_checkin(monitor_2.slug, environment="test", consumer=consumer)
+            guid_3 = self.guid
+
+            # Send one more check-in to cause the batch to be processed
+            self.send_checkin(monitor_1.slug, consumer=consumer)
+
+        checkin_1 = MonitorCheckIn.objects.get(guid=guid_1)
+        assert checkin_1.monitor_id == monitor_1.id
+        assert checkin_1.status == CheckInStatus.OK
+        assert MonitorCheckIn.objects.get(guid=guid_2).monitor_id == monitor_2.id
+        checkin_3 = MonitorCheckIn.objects.get(guid=guid_3)
+        assert checkin_3.monitor_id == monitor_2.id
+        assert checkin_3.monitor_environment.get_environment().name == "test"
+
+    @override_options({"crons.consumer.preload-monitors": True})
+    def test_pipelined_batch_loads_monitors_per_group(self) -> None:
+        monitor = self._create_monitor(slug="my-monitor")
+        wrapper: CheckIn = {
+            "message_type": "check_in",
+            "start_time": datetime.now().timestamp(),
+            "project_id": self.project.id,
+            "payload": json.dumps(
+                {"monitor_slug": monitor.slug, "status": "ok", "check_in_id": uuid.uuid4().hex}
+            ).encode(),
+            "sdk": "test/1.0",
+            "retention_days": 90,
+        }
+        message = Message(
+            Value(
+                [
+                    BrokerValue(
+                        KafkaPayload(b"fake-key", msgpack.packb(wrapper), []),
+                        self.partition,
+                        1,
+                        datetime.now(),
+                    )
+                ],
+                {self.partition: 2},
+            )
+        )
+
+        with mock.patch(
+            "sentry.monitors.consumers.monitor_consumer.preload_monitors",
+            wraps=preload_monitors,
+        ) as preload:
+            prepared = prepare_batch(message, pipelined=True)
+            assert preload.call_count == 0
+
+            # The previous batch disables the monitor after this batch has been prepared
+            monitor.update(status=ObjectStatus.DISABLED)
+
+            with mock.patch(
+                "sentry.monitors.consumers.monitor_consumer.handle_processing_errors"
+            ) as handle_processing_errors:
+                for group in prepared.groups.values():
+                    group()
+
+        assert preload.call_count == 1
+        assert not MonitorCheckIn.objects.filter(monitor=monitor).exists()
+        [error] = handle_processing_errors.call_args.args[1].processing_errors
+        assert error["type"] == ProcessingErrorType.MONITOR_DISABLED
+
     def test_passing(self) -> None:
         monitor = self._create_monitor(slug="my-monitor")
         self.send_checkin(monitor.slug)
@@ -1,7 +1,10 @@
+from unittest import mock
+
 import pytest
 
 from sentry.ratelimits.sliding_windows import (
     GrantedQuota,
+    LeasedSlidingWindowRateLimiter,
     Quota,
     RedisSlidingWindowRateLimiter,
     RequestedQuota,
@@ -71,3 +74,59 @@ def test_basic(limiter) -> None:
         )
 
         assert resp == [GrantedQuota(prefix="foo", granted=0, reached_quotas=quotas)]
+
+
+def test_leased_limiter_enforces_quota() -> None:
+    limiter = LeasedSlidingWindowRateLimiter(lease_fraction=0.3)
+    quotas = [Quota(window_seconds=10, granularity_seconds=10, limit=10)]
+
+    for _ in range(10):
+        resp = limiter.check_and_use_quotas(
+            [RequestedQuota(prefix="foo", requested=1, quotas=quotas)], timestamp=TIMESTAMP_OFFSET
+        )
+        assert resp == [GrantedQuota(prefix="foo", granted=1, reached_quotas=[])]
+
+    resp = limiter.check_and_use_quotas(
+        [RequestedQuota(prefix="foo", requested=1, quotas=quotas)], timestamp=TIMESTAMP_OFFSET
+    )
+    assert resp == [GrantedQuota(prefix="foo", granted=0, reached_quotas=quotas)]
+
+
+def test_leased_limiter_serves_from_lease() -> None:
+    limiter = LeasedSlidingWindowRateLimiter(lease_fraction=0.5)
+    quotas = [Quota(window_seconds=10, granularity_seconds=10, limit=100)]
+    requests = [RequestedQuota(prefix="foo", requested=1, quotas=quotas)]
+
+    with mock.patch.object(
+        limiter, "check_within_quotas", wraps=limiter.check_within_quotas
+    ) as check_within_quotas:
+        for _ in range(5):
+            resp = limiter.check_and_use_quotas(requests, timestamp=TIMESTAMP_OFFSET)
+            assert resp == [GrantedQuota(prefix="foo", granted=1, reached_quotas=[])]
+
+        # The first lease is a single unit, the second one covers the rest of the granule at the
+        # rate the first one was used.
+        assert check_within_quotas.call_count == 2
+
+        # Leases end with the granule they were acquired in.
+        limiter.check_and_use_quotas(requests, timestamp=TIMESTAMP_OFFSET + 10)
+        assert check_within_quotas.call_count == 3
+
+    # All quota which was leased counts as used in Redis.
+    _, grants = RedisSlidingWindowRateLimiter().check_within_quotas(
+        [RequestedQuota(prefix="foo", requested=100, quotas=quotas)], TIMESTAMP_OFFSET
+    )
+    assert grants == [GrantedQuota(prefix="foo", granted=89, reached_quotas=quotas)]
+
+
+def test_leased_limiter_low_rate() -> None:
+    limiter = LeasedSlidingWindowRateLimiter(lease_fraction=0.1)
+    quotas = [Quota(window_seconds=600, granularity_seconds=60, limit=100)]
+    requests = [RequestedQuota(prefix="foo", requested=1, quotas=quotas)]
+
+    # A prefix used every few seconds doesn't lose much quota to expired leases.
+    granted = sum(
+        limiter.check_and_use_quotas(requests, timestamp=120 + timestamp)[0].granted
+        for timestamp in range(0, 600, 3)
+    )
+    assert 95 <= granted <= 100
@@ -16,6 +16,7 @@ from sentry.models.dashboard_widget import (
 from sentry.models.environment import Environment
 from sentry.models.project import Project
 from sentry.models.transaction_threshold import ProjectTransactionThreshold, TransactionMetric
+from sentry.relay.config import metric_extraction
 from sentry.relay.config.metric_extraction import (
     _set_bulk_cached_query_chunk,
     get_current_widget_specs,
@@ -929,6 +930,39 @@ def test_get_metric_extraction_config_uses_cache_for_widgets(
         assert mock_set_cache_chunk_spy.call_count == 6
 
 
+@django_db_all
+def test_get_metric_extraction_config_uses_derived_specs_cache(default_project: Project) -> None:
+    with (
+        Feature({ON_DEMAND_METRICS: True, ON_DEMAND_METRICS_WIDGETS: True}),
+        override_options({"on_demand_metrics.derived_specs_cache.ttl": 3600}),
+        mock.patch.object(
+            metric_extraction,
+            "_convert_aggregate_and_query_to_metrics_uncached",
+            wraps=metric_extraction._convert_aggregate_and_query_to_metrics_uncached,
+        ) as convert_spy,
+    ):
+        create_alert("count()", "transaction.duration:>=1000", default_project)
+        widget_query, _, _ = create_widget(
+            ["count()"], "transaction.duration:>=1000", default_project
+        )
+
+        config = get_metric_extraction_config(default_project)
+        assert config
+        assert convert_spy.call_count == 2
+
+        assert get_metric_extraction_config(default_project) == config
+        assert convert_spy.call_count == 2
+
+        # Changing a query only converts that query again
+        widget_query.conditions = "transaction.duration:>=2000"
+        widget_query.save()
+
+        updated_config = get_metric_extraction_config(default_project)
+        assert updated_config
+        assert updated_config != config
+        assert convert_spy.call_count == 3
+
+
 @django_db_all
 @pytest.mark.parametrize(
     "widget_type", [DashboardWidgetTypes.DISCOVER, DashboardWidgetTypes.TRANSACTION_LIKE]
@@ -1,8 +1,12 @@
+import hashlib
 from unittest import mock
 
+import zstandard
+
 from sentry.relay.projectconfig_cache import redis
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.pytest.fixtures import django_db_all
-from sentry.utils import metrics
+from sentry.utils import json, metrics
 
 
 def test_delete_count() -> None:
@@ -54,3 +58,30 @@ def test_write_delete() -> None:
     cache.delete_many([dsn])
     assert cache.get(dsn) is None
     assert cache.get_rev(dsn) is None
+
+
+@django_db_all
+def test_shared_sections() -> None:
+    cache = redis.RedisProjectConfigCache()
+
+    shared = {"profiles": [{"name": f"profile-{i}", "weight": i} for i in range(100)]}
+    value1 = {"rev": "rev1", "config": {"performanceScore": shared, "filterSettings": {}}}
+    value2 = {"rev": "rev2", "config": {"performanceScore": shared, "features": ["a"]}}
+
+    with override_options({"relay.projectconfig-cache.shared-sections": ["performanceScore"]}):
+        cache.set_many({"dsn1": value1, "dsn2": value2})
+
+    raw = cache.cluster_read.get("relayconfig:dsn1")
+    assert raw.startswith(redis.SHARED_FORMAT_PREFIX)
+    assert b"profile-1" not in zstandard.decompress(raw[len(redis.SHARED_FORMAT_PREFIX) :])
+
+    # Reading doesn't depend on the option
+    assert cache.get("dsn1") == value1
+    assert cache.get("dsn2") == value2
+    assert cache.get_rev("dsn1") == "rev1"
+
+    # Configs whose sections have expired are treated as missing
+    digest = hashlib.sha1(json.dumps(shared).encode()).hexdigest()
+    fresh_cache = redis.RedisProjectConfigCache()
+    fresh_cache.cluster.delete(f"relayconfig-section:{digest}")
+    assert fresh_cache.get("dsn1") is None
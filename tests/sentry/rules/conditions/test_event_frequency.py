@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+from sentry import tsdb
+from sentry.rules.conditions.event_frequency import get_shared_frequency_results
+from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers.options import override_options
+from sentry.tsdb.base import TSDBModel
+
+START = datetime(2025, 1, 1, 12, 0, 10, tzinfo=timezone.utc)
+END = START + timedelta(hours=1)
+
+
+class GetSharedFrequencyResultsTest(TestCase):
+    def get_results(self, query: MagicMock, group_ids: list[int], offset: timedelta, **kwargs):
+        return get_shared_frequency_results(
+            query,
+            tsdb_function=tsdb.backend.get_sums,
+            model=TSDBModel.group,
+            group_ids=group_ids,
+            start=START + offset,
+            end=END + offset,
+            environment_id=None,
+            **kwargs,
+        )
+
+    def test_disabled(self) -> None:
+        query = MagicMock(return_value={1: 5})
+
+        assert self.get_results(query, [1], timedelta()) == {1: 5}
+        assert self.get_results(query, [1], timedelta()) == {1: 5}
+        assert query.call_count == 2
+        query.assert_called_with([1], START, END)
+
+    @override_options({"delayed_processing.shared_frequency_queries.ttl_seconds": 60})
+    def test_shares_results_within_minute(self) -> None:
+        query = MagicMock(side_effect=lambda group_ids, start, end: {g: g * 10 for g in group_ids})
+
+        assert self.get_results(query, [1, 2], timedelta()) == {1: 10, 2: 20}
+        query.assert_called_once_with([1, 2], START.replace(second=0), END.replace(second=0))
+
+        # Another engine querying a few seconds later only queries the missing group.
+        assert self.get_results(query, [2, 3], timedelta(seconds=5)) == {2: 20, 3: 30}
+        assert query.call_count == 2
+        query.assert_called_with([3], START.replace(second=0), END.replace(second=0))
+
+    @override_options({"delayed_processing.shared_frequency_queries.ttl_seconds": 60})
+    def test_different_queries_are_not_shared(self) -> None:
+        query = MagicMock(return_value={1: 10})
+
+        self.get_results(query, [1], timedelta())
+        self.get_results(query, [1], timedelta(minutes=1))
+        self.get_results(query, [1], timedelta(), conditions=[("tags[foo]", "=", "bar")])
+        self.get_results(query, [1], timedelta(), group_on_time=True)
+
+        assert query.call_count == 4
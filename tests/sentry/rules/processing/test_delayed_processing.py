@@ -617,6 +617,39 @@ class GetRulesToFireTest(TestCase):
         result = get_rules_to_fire({}, defaultdict(list), defaultdict(set), self.project.id)
         assert len(result) == 0
 
+    def test_unique_queries_generated_once_per_condition(self) -> None:
+        self.mock_passes_comparison.return_value = False
+
+        get_rules_to_fire(
+            self.condition_group_results,
+            self.rules_to_slow_conditions,
+            self.rules_to_groups,
+            self.project.id,
+        )
+
+        expected_queries = generate_unique_queries(
+            TEST_RULE_SLOW_CONDITION, self.rule1.environment_id
+        )
+        assert self.mock_passes_comparison.call_count == 2
+        for call in self.mock_passes_comparison.call_args_list:
+            assert call.kwargs["unique_queries"] == expected_queries
+
+    def test_comparison_all_stops_at_first_failure(self) -> None:
+        self.rule1.data["action_match"] = "all"
+        self.rules_to_slow_conditions[self.rule1].append(TEST_RULE_SLOW_CONDITION)
+        self.mock_passes_comparison.return_value = False
+
+        result = get_rules_to_fire(
+            self.condition_group_results,
+            self.rules_to_slow_conditions,
+            self.rules_to_groups,
+            self.project.id,
+        )
+
+        assert self.rule1 not in result
+        # One check per group, the second condition is never evaluated.
+        assert self.mock_passes_comparison.call_count == 2
+
     @patch("sentry.rules.processing.delayed_processing.passes_comparison", return_value=True)
     def test_multiple_rules_and_groups(self, mock_passes: MagicMock) -> None:
         rule2 = self.create_project_rule(
@@ -904,6 +937,35 @@ class ApplyDelayedTest(ProcessDelayedAlertConditionsTestBase):
         assert (rule5.id, group5.id) in rule_fire_histories
         self.assert_buffer_cleared(project_id=self.project.id)
 
+    @override_options({"delayed_processing.shared_frequency_queries.ttl_seconds": 60})
+    def test_apply_delayed_shares_frequency_queries(self) -> None:
+        """
+        Test that two rules with the same count query, evaluated for the same
+        group in separate runs, only query TSDB once.
+        """
+        rule5 = self.create_project_rule(
+            project=self.project,
+            condition_data=[self.event_frequency_condition],
+            environment_id=self.environment.id,
+        )
+
+        with patch.object(
+            EventFrequencyCondition,
+            "get_snuba_query_result",
+            autospec=True,
+            side_effect=EventFrequencyCondition.get_snuba_query_result,
+        ) as query_spy:
+            self.push_to_hash(self.project.id, self.rule1.id, self.group1.id, self.event1.event_id)
+            apply_delayed(self.project.id)
+            self.push_to_hash(self.project.id, rule5.id, self.group1.id, self.event1.event_id)
+            apply_delayed(self.project.id)
+
+        assert query_spy.call_count == 1
+        rule_fire_histories = RuleFireHistory.objects.filter(
+            rule__in=[self.rule1, rule5], group=self.group1, project=self.project
+        ).values_list("rule", flat=True)
+        assert set(rule_fire_histories) == {self.rule1.id, rule5.id}
+
     def test_apply_delayed_same_condition_diff_interval(self) -> None:
         """
         Test that two rules with the same condition and value but a
@@ -4,8 +4,10 @@ Testsuite of backend-independent nodestore tests. Add your backend to the
 """
 
 from collections.abc import Callable, Generator
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import nullcontext
 from typing import ContextManager
+from unittest import mock
 
 import pytest
 
@@ -115,3 +117,99 @@ def test_set_subkeys(ns: NodeStorage) -> None:
     ns.delete("node_1")
     assert ns.get("node_1") is None
     assert ns.get("node_1", subkey="other") is None
+
+
+@override_options({"nodestore.set-subkeys.enable-set-cache-item": False})
+def test_set_subkeys_multi(ns: NodeStorage) -> None:
+    ns.set_subkeys_multi(
+        {
+            "node_1": {None: {"foo": "a"}, "other": {"foo": "b"}},
+            "node_2": {None: {"foo": "c"}},
+        }
+    )
+    ns.set_multi({"node_3": {"foo": "d"}})
+
+    assert ns.get_multi(["node_1", "node_2", "node_3"]) == {
+        "node_1": {"foo": "a"},
+        "node_2": {"foo": "c"},
+        "node_3": {"foo": "d"},
+    }
+    assert ns.get("node_1", subkey="other") == {"foo": "b"}
+
+    # Existing nodes are overwritten
+    ns.set_subkeys_multi({"node_1": {None: {"foo": "e"}}})
+    assert ns.get("node_1") == {"foo": "e"}
+    assert ns.get("node_1", subkey="other") is None
+
+
+@pytest.mark.parametrize("zstd_level", [0, 3])
+@override_options({"nodestore.set-subkeys.enable-set-cache-item": False})
+def test_set_subkeys_indexed_format(ns: NodeStorage, zstd_level: int) -> None:
+    with override_options(
+        {"nodestore.indexed-format.write": True, "nodestore.indexed-format.zstd-level": zstd_level}
+    ):
+        ns.set_subkeys("node_1", {None: {"foo": "a"}, "other": {"foo": "b"}})
+
+    ns.set_subkeys("node_2", {None: {"foo": "c"}, "other": {"foo": "d"}})
+
+    # Both formats are readable regardless of which one is currently written.
+    for indexed_write in (True, False):
+        with override_options({"nodestore.indexed-format.write": indexed_write}):
+            assert ns.get("node_1") == {"foo": "a"}
+            assert ns.get("node_1", subkey="other") == {"foo": "b"}
+            assert ns.get("node_1", subkey="missing") is None
+            assert ns.get_multi(["node_1", "node_2"], subkey="other") == {
+                "node_1": {"foo": "b"},
+                "node_2": {"foo": "d"},
+            }
+
+
+@override_options(
+    {
+        "nodestore.set-subkeys.enable-set-cache-item": False,
+        "nodestore.local-cache.enabled": True,
+    }
+)
+def test_local_cache(ns: NodeStorage) -> None:
+    ns.local_cache.clear()
+    ns.set_subkeys("node_1", {None: {"foo": "a"}, "other": {"foo": "b"}})
+    ns.set("node_2", {"foo": "c"})
+
+    # Reads are served from the local cache, for any subkey
+    with (
+        mock.patch.object(ns, "_get_bytes", side_effect=AssertionError),
+        mock.patch.object(ns, "_get_bytes_multi", side_effect=AssertionError),
+    ):
+        assert ns.get("node_1") == {"foo": "a"}
+        assert ns.get("node_1", subkey="other") == {"foo": "b"}
+        assert ns.get_multi(["node_1", "node_2"]) == {
+            "node_1": {"foo": "a"},
+            "node_2": {"foo": "c"},
+        }
+
+    ns.delete("node_1")
+    assert ns.get("node_1") is None
+    assert ns.get_multi(["node_1", "node_2"]) == {"node_1": None, "node_2": {"foo": "c"}}
+
+
+@override_options({"nodestore.local-cache.enabled": True})
+def test_local_cache_shared_between_threads(ns: NodeStorage) -> None:
+    ns.local_cache.clear()
+    ns.set("node_1", {"foo": "a"})
+    ns.set("node_2", {"foo": "b"})
+
+    def delete_and_read() -> dict[str, bytes]:
+        ns.delete("node_1")
+        return ns.local_cache.get_many(["node_2"])
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # Entries written by one thread are visible to others
+        assert executor.submit(delete_and_read).result().keys() == {"node_2"}
+
+    # and deletes in other threads evict them for this thread as well
+    assert ns.local_cache.get_many(["node_1", "node_2"]).keys() == {"node_2"}
+    with (
+        mock.patch.object(ns, "_get_bytes", return_value=None),
+        mock.patch.object(ns, "_get_bytes_multi", return_value={}),
+    ):
+        assert ns.get("node_1") is None
@@ -0,0 +1,47 @@
+from unittest import mock
+
+from sentry.services.nodestore.local_cache import LocalNodeCache
+
+
+def test_get_set() -> None:
+    cache = LocalNodeCache()
+    cache.set_many({"a": b"1", "b": b"22"}, max_bytes=100, ttl_seconds=10)
+
+    assert cache.get("a") == b"1"
+    assert cache.get_many(["a", "b", "c"]) == {"a": b"1", "b": b"22"}
+    assert cache.size == 3
+
+    cache.set_many({"a": b"333"}, max_bytes=100, ttl_seconds=10)
+    assert cache.get("a") == b"333"
+    assert cache.size == 5
+
+    cache.delete_many(["a", "c"])
+    assert cache.get("a") is None
+    assert cache.size == 2
+
+
+def test_evicts_least_recently_used_by_size() -> None:
+    cache = LocalNodeCache()
+    cache.set_many({"a": b"1111", "b": b"2222"}, max_bytes=10, ttl_seconds=10)
+    # Touch `a` so that `b` is the least recently used entry
+    assert cache.get("a") == b"1111"
+
+    cache.set_many({"c": b"3333"}, max_bytes=10, ttl_seconds=10)
+    assert cache.get_many(["a", "b", "c"]) == {"a": b"1111", "c": b"3333"}
+    assert cache.size == 8
+
+    # Values larger than the whole budget are not cached
+    cache.set_many({"d": b"x" * 11}, max_bytes=10, ttl_seconds=10)
+    assert cache.get("d") is None
+    assert len(cache) == 2
+
+
+def test_expiry() -> None:
+    cache = LocalNodeCache()
+    with mock.patch("time.monotonic", return_value=100.0):
+        cache.set_many({"a": b"1"}, max_bytes=10, ttl_seconds=5)
+        assert cache.get("a") == b"1"
+
+    with mock.patch("time.monotonic", return_value=106.0):
+        assert cache.get("a") is None
+    assert cache.size == 0
@@ -778,3 +778,102 @@ def test_preassigned_disconnected_segment(buffer: SpansBuffer) -> None:
     assert list(buffer.get_memory_info())
 
     assert_clean(buffer.client)
+
+
+def test_adaptive_mode(buffer: SpansBuffer) -> None:
+    spans = [
+        Span(
+            payload=_payload("b" * 16),
+            trace_id="a" * 32,
+            span_id="b" * 16,
+            parent_span_id="a" * 16,
+            project_id=1,
+            segment_id=None,
+            end_timestamp_precise=1700000000.0,
+        ),
+        Span(
+            payload=_payload("a" * 16),
+            trace_id="a" * 32,
+            span_id="a" * 16,
+            parent_span_id=None,
+            project_id=1,
+            segment_id=None,
+            is_segment_span=True,
+            end_timestamp_precise=1700000001.0,
+        ),
+    ]
+
+    with override_options({"spans.buffer.adaptive-mode": True}):
+        process_spans(spans[:1], buffer, now=0)
+
+        # The script is reloaded when Redis no longer knows about it.
+        buffer.client.script_flush()
+        process_spans(spans[1:], buffer, now=0)
+
+        assert_ttls(buffer.client)
+
+        assert buffer.flush_segments(now=5) == {}
+        rv = buffer.flush_segments(now=11)
+        _normalize_output(rv)
+        assert rv == {
+            _segment_id(1, "a" * 32, "a" * 16): FlushedSegment(
+                queue_key=mock.ANY,
+                spans=[
+                    _output_segment(b"a" * 16, b"a" * 16, True),
+                    _output_segment(b"b" * 16, b"a" * 16, False),
+                ],
+            )
+        }
+        buffer.done_flush_segments(rv)
+        assert_clean(buffer.client)
+
+        # Flush sizes are derived from the observed segment sizes, and stay
+        # within the bounds of the static options.
+        assert buffer._avg_segment_spans == 2
+        assert buffer._get_segment_page_size() == 100
+        with override_options({"spans.buffer.adaptive-flush.max-bytes": 1}):
+            assert buffer._get_max_flush_segments() == 1
+        with override_options({"spans.buffer.adaptive-flush.max-bytes": 2**40}):
+            assert buffer._get_max_flush_segments() == 500 * 4
+
+
+def test_flush_raw_payloads(buffer: SpansBuffer) -> None:
+    payloads = [
+        orjson.dumps({"span_id": "a" * 16, "is_segment": False}),
+        orjson.dumps({"span_id": "b" * 16, "segment_id": None, "data": {}}),
+        orjson.dumps({"span_id": "c" * 16, "segment_id": "a" * 16}),
+        orjson.dumps({"span_id": "d" * 16, "links": [{"span_id": "e" * 16}]}),
+    ]
+    spans = [
+        Span(
+            payload=payload,
+            trace_id="a" * 32,
+            span_id=orjson.loads(payload)["span_id"],
+            parent_span_id=None if i == 0 else "a" * 16,
+            project_id=1,
+            segment_id=None,
+            is_segment_span=i == 0,
+            end_timestamp_precise=1700000000.0,
+        )
+        for i, payload in enumerate(payloads)
+    ]
+
+    process_spans(spans, buffer, now=0)
+    parsed = buffer.flush_segments(now=11)
+    with override_options({"spans.buffer.flush-raw-payloads": True}):
+        raw = buffer.flush_segments(now=11)
+
+    segment_key = _segment_id(1, "a" * 32, "a" * 16)
+    assert list(raw) == list(parsed) == [segment_key]
+    assert orjson.loads(raw[segment_key].to_kafka_value()) == orjson.loads(
+        parsed[segment_key].to_kafka_value()
+    )
+    assert sorted(span.span_id for span in raw[segment_key].spans) == [
+        "a" * 16,
+        "b" * 16,
+        "c" * 16,
+        "d" * 16,
+    ]
+
+    buffer.done_flush_segments(raw)
+    assert_clean(buffer.client)
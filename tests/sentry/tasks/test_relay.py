@@ -85,6 +85,7 @@ def redis_cache():
         mock.patch("sentry.relay.projectconfig_cache.set_many", cache.set_many),
         mock.patch("sentry.relay.projectconfig_cache.delete_many", cache.delete_many),
         mock.patch("sentry.relay.projectconfig_cache.get", cache.get),
+        mock.patch("sentry.relay.projectconfig_cache.exists_many", cache.exists_many),
     ):
         yield cache
 
@@ -454,6 +455,54 @@ class TestInvalidationTask:
             assert new_cfg is not None
             assert new_cfg != cfg
 
+    @override_options({"relay.compute-configs.bulk": True, "relay.compute-configs.bulk-workers": 2})
+    def test_invalidate_org_bulk(
+        self,
+        factories,
+        default_project,
+        default_organization,
+        default_projectkey,
+        redis_cache,
+        task_runner,
+        django_cache,
+    ):
+        other_project = factories.create_project(organization=default_organization)
+        other_projectkey = factories.create_project_key(project=other_project)
+        ProjectOption.objects.set_value(
+            other_project,
+            "sentry:relay_pii_config",
+            '{"applications": {"$string": ["@creditcard:mask"]}}',
+        )
+        uncached_project = factories.create_project(organization=default_organization)
+        uncached_projectkey = factories.create_project_key(project=uncached_project)
+
+        cfg = {"dummy-key": "val"}
+        redis_cache.delete_many([uncached_projectkey.public_key])
+        redis_cache.set_many({default_projectkey.public_key: cfg, other_projectkey.public_key: cfg})
+        assert redis_cache.exists_many(
+            [
+                default_projectkey.public_key,
+                other_projectkey.public_key,
+                uncached_projectkey.public_key,
+            ]
+        ) == {default_projectkey.public_key, other_projectkey.public_key}
+
+        with task_runner():
+            invalidate_project_config(organization_id=default_organization.id, trigger="test")
+
+        for project, projectkey in (
+            (default_project, default_projectkey),
+            (other_project, other_projectkey),
+        ):
+            new_cfg = redis_cache.get(projectkey.public_key)
+            assert new_cfg["projectId"] == project.id
+            assert new_cfg["disabled"] is False
+
+        assert redis_cache.get(other_projectkey.public_key)["config"]["piiConfig"] == {
+            "applications": {"$string": ["@creditcard:mask"]}
+        }
+        assert redis_cache.get(uncached_projectkey.public_key) is None
+
     @mock.patch(
         "sentry.tasks.relay._schedule_invalidate_project_config",
         wraps=_schedule_invalidate_project_config,
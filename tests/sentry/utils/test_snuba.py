@@ -1,8 +1,12 @@
+import threading
+import time
 import unittest
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from unittest import mock
 
 import pytest
+from django.core.cache import cache
 from django.utils import timezone
 from snuba_sdk import Column, Condition, Entity, Function, Op, Query, Request
 from urllib3 import HTTPConnectionPool
@@ -14,6 +18,7 @@ from sentry.models.project import Project
 from sentry.models.release import Release
 from sentry.snuba.dataset import Dataset
 from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers import override_options
 from sentry.utils import json
 from sentry.utils.snuba import (
     ROUND_UP,
@@ -22,8 +27,10 @@ from sentry.utils.snuba import (
     SnubaQueryParams,
     SnubaRequest,
     UnqualifiedQueryError,
+    _apply_cache_and_build_results,
     _bulk_snuba_query,
     _prepare_query_params,
+    get_cache_key,
     get_json_type,
     get_query_params_to_update_for_projects,
     get_snuba_column_name,
@@ -566,3 +573,98 @@ class SnubaQueryRateLimitTest(TestCase):
         assert (
             str(exc_info.value) == "Query on could not be run due to allocation policies, info: ..."
         )
+
+
+@override_options({"snuba.query-coalescing.enabled": True})
+class QueryCoalescingTest(TestCase):
+    def setUp(self) -> None:
+        self.request = Request(
+            dataset="events",
+            app_id="test",
+            query=Query(
+                match=Entity("events"),
+                select=[Function("count", parameters=[], alias="count")],
+                where=[
+                    Condition(Column("project_id"), Op.EQ, self.project.id),
+                    Condition(Column("timestamp"), Op.GTE, datetime(2025, 1, 1)),
+                    Condition(Column("timestamp"), Op.LT, datetime(2025, 1, 2)),
+                ],
+            ),
+        )
+        self.cache_key = get_cache_key(self.request)
+
+    def snuba_request(self, referrer: str = "test_referrer") -> SnubaRequest:
+        return SnubaRequest(
+            request=self.request, referrer=referrer, forward=lambda x: x, reverse=lambda x: x
+        )
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_coalesces_within_process(self, mock_bulk_snuba_query) -> None:
+        following = threading.Event()
+
+        class TrackingFuture(Future):
+            def result(self, timeout=None):
+                # Only requests following another one wait with a timeout
+                if timeout is not None:
+                    following.set()
+                return super().result(timeout)
+
+        def bulk_snuba_query(snuba_requests):
+            assert following.wait(timeout=5)
+            return [{"data": [{"count": 1}]} for _ in snuba_requests]
+
+        mock_bulk_snuba_query.side_effect = bulk_snuba_query
+
+        with (
+            mock.patch("sentry.utils.snuba.Future", TrackingFuture),
+            ThreadPoolExecutor(max_workers=2) as executor,
+        ):
+            leader = executor.submit(
+                _apply_cache_and_build_results, [self.snuba_request()], use_cache=True
+            )
+            while not mock_bulk_snuba_query.called:
+                time.sleep(0.01)
+            follower = executor.submit(
+                _apply_cache_and_build_results, [self.snuba_request()], use_cache=True
+            )
+
+            assert leader.result() == [{"data": [{"count": 1}]}]
+            assert follower.result() == [{"data": [{"count": 1}]}]
+
+        assert mock_bulk_snuba_query.call_count == 1
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_waits_for_other_process(self, mock_bulk_snuba_query) -> None:
+        cache.add(f"{self.cache_key}:lease", 1, 10)
+        timer = threading.Timer(
+            0.2, lambda: cache.set(self.cache_key, json.dumps({"data": [{"count": 2}]}), 10)
+        )
+        timer.start()
+        try:
+            with override_options({"snuba.query-coalescing.poll-interval-seconds": 0.05}):
+                result = _apply_cache_and_build_results([self.snuba_request()], use_cache=True)
+        finally:
+            timer.cancel()
+
+        assert result == [{"data": [{"count": 2}]}]
+        assert not mock_bulk_snuba_query.called
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_serves_stale_result(self, mock_bulk_snuba_query) -> None:
+        mock_bulk_snuba_query.return_value = [{"data": [{"count": 3}]}]
+        snuba_request = self.snuba_request(referrer="api.dashboards.tablewidget")
+
+        with override_options({"snuba.query-coalescing.stale-ttl-seconds": 60}):
+            assert _apply_cache_and_build_results([snuba_request], use_cache=True) == [
+                {"data": [{"count": 3}]}
+            ]
+            cache.delete(self.cache_key)
+
+            # Another process is refreshing the result
+            cache.add(f"{self.cache_key}:lease", 1, 10)
+            mock_bulk_snuba_query.return_value = [{"data": [{"count": 4}]}]
+            assert _apply_cache_and_build_results([snuba_request], use_cache=True) == [
+                {"data": [{"count": 3}]}
+            ]
+
+        assert mock_bulk_snuba_query.call_count == 1
@@ -27,6 +27,7 @@ from sentry.testutils.silo import assume_test_silo_mode
 from sentry.types.group import PriorityLevel
 from sentry.users.models.user_option import UserOption
 from sentry.utils.samples import load_data
+from sentry.utils.snuba import aliased_query, bulk_raw_query
 from tests.sentry.issues.test_utils import SearchIssueTestMixin
 
 
@@ -583,3 +584,57 @@ class ProfilingGroupSerializerSnubaTest(
         assert result["lastSeen"] == (timestamp + timedelta(minutes=5))
         assert result["firstSeen"] == timestamp
         assert result["count"] == str(times + 1)
+
+    def test_prefetch_seen_stats(self) -> None:
+        proj = self.create_project()
+        timestamp = before_now(hours=1).replace(second=0, microsecond=0)
+
+        error_event = self.store_event(
+            data={
+                "fingerprint": ["error-group"],
+                "timestamp": timestamp.isoformat(),
+                "user": {"id": 1},
+            },
+            project_id=proj.id,
+        )
+        _, _, group_info = self.store_search_issue(
+            proj.id, 2, [f"{ProfileFileIOGroupType.type_id}-group1"], None, timestamp
+        )
+        assert group_info is not None
+        groups = [error_event.group, group_info.group]
+
+        def serialize_groups():
+            return serialize(
+                groups,
+                serializer=GroupSerializerSnuba(
+                    start=timestamp - timedelta(days=1), end=timestamp + timedelta(days=1)
+                ),
+            )
+
+        expected = serialize_groups()
+
+        with (
+            self.options(
+                {
+                    "issues.group-serializer.prefetch-seen-stats": True,
+                    "issues.group-attrs-cache.ttl-seconds": 60,
+                }
+            ),
+            mock.patch(
+                "sentry.api.serializers.models.group.bulk_raw_query",
+                side_effect=bulk_raw_query,
+            ) as bulk_query,
+            mock.patch(
+                "sentry.api.serializers.models.group.aliased_query",
+                side_effect=aliased_query,
+            ) as single_query,
+        ):
+            # Both categories are fetched with a single request
+            assert serialize_groups() == expected
+            assert bulk_query.call_count == 1
+            assert len(bulk_query.call_args[0][0]) == 2
+            assert single_query.call_count == 0
+
+            # And then served from the cache
+            assert serialize_groups() == expected
+            assert bulk_query.call_count == 1
@@ -27,7 +27,7 @@ from sentry.models.grouphistory import GroupHistoryStatus, record_group_history
 from sentry.models.groupowner import GroupOwner
 from sentry.models.groupsubscription import GroupSubscription
 from sentry.search.snuba.backend import EventsDatasetSnubaSearchBackend, SnubaSearchBackendBase
-from sentry.search.snuba.executors import TrendsSortWeights
+from sentry.search.snuba.executors import PostgresSnubaQueryExecutor, TrendsSortWeights
 from sentry.seer.autofix.constants import FixabilityScoreThresholds
 from sentry.snuba.dataset import Dataset
 from sentry.snuba.referrer import Referrer
@@ -816,6 +816,27 @@ class EventsSnubaSearchTestCases(EventsDatasetTestSetup):
         assert list(results) == []
         assert results.hits == 2
 
+    def test_hits_cache(self) -> None:
+        with self.options({"snuba.search.hits-cache-ttl-seconds": 60}):
+            results = self.make_query(sort_by="date", limit=1, count_hits=True)
+            results = self.make_query(sort_by="date", limit=1, cursor=results.next, count_hits=True)
+            hits = results.hits
+            assert hits
+
+            with mock.patch.object(
+                PostgresSnubaQueryExecutor,
+                "snuba_search",
+                autospec=True,
+                side_effect=PostgresSnubaQueryExecutor.snuba_search,
+            ) as snuba_search:
+                results = self.make_query(
+                    sort_by="date", limit=1, cursor=results.prev, count_hits=True
+                )
+            assert results.hits == hits
+            # The hit count is served from the cache, only the results are queried
+            assert snuba_search.call_count == 1
+            assert not snuba_search.call_args.kwargs.get("get_sample")
+
     def test_age_filter(self) -> None:
         results = self.make_query(
             search_filter_query="firstSeen:>=%s" % date_to_query_format(self.group2.first_seen)
@@ -1922,6 +1943,40 @@ class EventsSnubaSearchTestCases(EventsDatasetTestSetup):
         finally:
             options.set("snuba.search.max-pre-snuba-candidates", prev_max_pre)
 
+    def test_post_filtering_keyset_pagination(self) -> None:
+        # too many candidates, skip pre-filter, requires >1 postfilter queries, which are fetched
+        # by keyset instead of offset
+        with self.options(
+            {
+                "snuba.search.max-pre-snuba-candidates": 1,
+                "snuba.search.keyset-pagination.enabled": True,
+            }
+        ):
+            for sort_by in ("date", "freq", "new", "user"):
+                results = self.make_query(sort_by=sort_by, limit=1)
+                assert len(results) == 1
+                next_results = self.make_query(sort_by=sort_by, limit=1, cursor=results.next)
+                assert set(results) | set(next_results) == {self.group1, self.group2}
+
+            results = self.make_query(search_filter_query="foo", limit=1)
+            assert set(results) == {self.group1}
+
+    def test_post_filtering_keyset_pagination_falls_back_to_offset(self) -> None:
+        # every chunk has more groups tied on its last score than allowed, so the search continues
+        # by offset
+        with self.options(
+            {
+                "snuba.search.max-pre-snuba-candidates": 1,
+                "snuba.search.keyset-pagination.enabled": True,
+                "snuba.search.keyset-pagination.max-seen-groups": 0,
+            }
+        ):
+            for sort_by in ("date", "freq", "new", "user"):
+                results = self.make_query(sort_by=sort_by, limit=1)
+                assert len(results) == 1
+                next_results = self.make_query(sort_by=sort_by, limit=1, cursor=results.next)
+                assert set(results) | set(next_results) == {self.group1, self.group2}
+
     def test_optimizer_enabled(self) -> None:
         prev_optimizer_enabled = options.get("snuba.search.pre-snuba-candidates-optimizer")
         options.set("snuba.search.pre-snuba-candidates-optimizer", True)